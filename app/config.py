@@ -9,84 +9,456 @@ Responsabilidades:
     - Definir parámetros generales de la aplicación, tales como el nombre, la versión y el modo de depuración (DEBUG).
     - Configurar la conexión a la base de datos MongoDB a partir de variables de entorno, construyendo la URI de conexión.
     - Establecer la configuración para la autenticación JWT, incluyendo la carga de claves RSA (archivos PEM), algoritmo y tiempo de expiración del token.
-    - Configurar la zona horaria de la aplicación utilizando la librería 'pytz'.
+    - Configurar la zona horaria de la aplicación utilizando 'zoneinfo'.
 
 Estructura:
-    - Se obtienen los valores de configuración mediante 'os.getenv', proporcionando valores por defecto cuando no se encuentran definidos.
-    - La conexión a MongoDB se configura mediante una URI que integra usuario, contraseña, host, puerto y nombre de base de datos.
-    - Las claves RSA (privada y pública) se cargan desde archivos PEM ubicados en el directorio superior a 'app'.
-    - La zona horaria se establece a partir de la variable de entorno 'TIME_ZONE', con un valor por defecto de "America/Bogota".
+    - La configuración es un objeto tipado e inmutable (`Settings`) construido por `get_settings()` la primera vez
+      que se necesita y cacheado a partir de ese momento. Importar este módulo no lee el '.env', ni archivos, ni
+      construye zonas horarias.
+    - Por compatibilidad, los valores siguen disponibles como atributos del módulo en mayúsculas
+      (por ejemplo, 'config.MONGO_URI' o 'config.PRIVATE_KEY'), resueltos de forma perezosa mediante `__getattr__`.
+    - Las claves RSA (privada y pública) se leen desde archivos PEM solo en su primer uso y se cachean; por defecto
+      se ubican en el directorio superior a 'app' (configurable con 'PRIVATE_KEY_PATH' y 'PUBLIC_KEY_PATH').
 
 Notas:
     - Es esencial contar con un archivo '.env' en la raíz del proyecto que contenga las variables necesarias.
-    - Si las claves RSA no se encuentran en las rutas especificadas, se lanzará un error en tiempo de ejecución, evitando la continuación de la aplicación sin la configuración de seguridad adecuada.
+    - Si las claves RSA no se encuentran en las rutas especificadas, se lanzará un error en tiempo de ejecución la primera
+      vez que se utilicen (al firmar o verificar un JWT), por lo que las pruebas y herramientas que no las necesitan
+      pueden importar la aplicación sin ellas.
+    - Para recargar la configuración (por ejemplo, en pruebas) se puede invocar `get_settings.cache_clear()`.
 """
 
 import os
-import pytz
-from dotenv import load_dotenv
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from pathlib import Path
 from bson import ObjectId
 
-# Cargar variables de entorno desde un archivo '.env' ubicado en la raíz del proyecto.
-env_path = Path('.') / '.env'
-load_dotenv(dotenv_path=env_path)
+_APP_DIR = os.path.dirname(__file__)
 
-# ---------------------------------
-# Configuración General
-# ---------------------------------
-APP_NAME = os.getenv("APP_NAME", "My FastAPI App")
-APP_VERSION = os.getenv("APP_VERSION", "0.1")
-# DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+def _env_str(name: str, default: str) -> str:
+    return os.getenv(name, default)
 
-# ---------------------------------
-# Configuración de la Base de Datos (MongoDB)
-# ---------------------------------
-MONGO_HOST = os.getenv("MONGO_HOST", "mongo")
-MONGO_PORT = int(os.getenv("MONGO_PORT", 27017))
-MONGO_USER = os.getenv("MONGO_INITDB_ROOT_USERNAME", "admin")
-MONGO_PASSWORD = os.getenv("MONGO_INITDB_ROOT_PASSWORD", "password")
-MONGO_DB = os.getenv("MONGO_INITDB_DATABASE", "mydatabase")
-MONGO_URI = f"mongodb://{MONGO_USER}:{MONGO_PASSWORD}@{MONGO_HOST}:{MONGO_PORT}/{MONGO_DB}?authSource=admin"
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
 
-# ---------------------------------
-# Configuración JWT y Claves PEM
-# ---------------------------------
-# Definir las rutas de las claves PEM, ubicadas en el directorio superior a 'app'.
-PRIVATE_KEY_PATH = os.path.join(os.path.dirname(__file__), "../private.pem")
-PUBLIC_KEY_PATH = os.path.join(os.path.dirname(__file__), "../public.pem")
-
-# Cargar el contenido de las claves PEM.
-try:
-    with open(PRIVATE_KEY_PATH, "r") as private_file:
-        PRIVATE_KEY = private_file.read()
-    with open(PUBLIC_KEY_PATH, "r") as public_file:
-        PUBLIC_KEY = public_file.read()
-except FileNotFoundError:
-    raise RuntimeError("Las claves RSA no se encontraron. Asegúrate de generar 'private.pem' y 'public.pem'.")
-
-JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "RS256")
-JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
 
-# ---------------------------------
-# Configuración de Zona Horaria
-# ---------------------------------
-TIME_ZONE = pytz.timezone(os.getenv("TIME_ZONE", "America/Bogota"))
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() == "true"
+
+def _env_list(name: str, default: str) -> list:
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Configuración tipada de la aplicación.
+
+    Los atributos se corresponden con las variables de entorno del mismo nombre en mayúsculas,
+    salvo donde se indica lo contrario (por ejemplo, las credenciales de MongoDB).
+    """
+
+    # ---------------------------------
+    # Configuración General
+    # ---------------------------------
+    app_name: str = "My FastAPI App"
+    app_version: str = "0.1"
+
+    # ---------------------------------
+    # Configuración del Servidor ('python -m app.server')
+    # ---------------------------------
+    # "production" (gunicorn + workers uvicorn) o "development" (uvicorn con recarga automática).
+    server_mode: str = "production"
+    server_host: str = "0.0.0.0"
+    server_port: int = 8182
+    # Número de workers; 0 = calcular a partir de las CPUs disponibles para el proceso/contenedor.
+    web_concurrency: int = 0
+    # Reciclar cada worker tras N solicitudes (+ un desfase aleatorio) para acotar fugas de memoria.
+    server_max_requests: int = 10000
+    server_max_requests_jitter: int = 1000
+    # Segundos para terminar las solicitudes en curso tras SIGTERM antes de forzar la salida.
+    server_graceful_timeout: int = 30
+    server_keepalive: int = 5
+
+    # ---------------------------------
+    # Configuración de Logging
+    # ---------------------------------
+    log_level: str = "INFO"
+    # Registros en formato JSON (una línea por registro); en False se usa un formato de texto legible.
+    log_json: bool = True
+    # Fracción de registros DEBUG que se conservan (1 = todos).
+    log_debug_sample_rate: float = 0.01
+    # Capacidad de la cola de logging; al llenarse, los registros se descartan en lugar de bloquear.
+    log_queue_max_size: int = 10000
+
+    # ---------------------------------
+    # Configuración de la Base de Datos (MongoDB)
+    # ---------------------------------
+    mongo_host: str = "mongo"
+    mongo_port: int = 27017
+    mongo_user: str = "admin"
+    mongo_password: str = "password"
+    mongo_db: str = "mydatabase"
+    # Preferencia de lectura de las operaciones que toleran datos algo antiguos (perfil y listados): primary,
+    # primaryPreferred, secondary, secondaryPreferred o nearest. Antigüedad máxima en segundos (mínimo de MongoDB: 90).
+    mongo_stale_read_preference: str = "secondaryPreferred"
+    mongo_profile_max_staleness_seconds: int = 90
+    mongo_listing_max_staleness_seconds: int = 120
+
+    # ---------------------------------
+    # Configuración JWT y Claves PEM
+    # ---------------------------------
+    private_key_path: str = os.path.join(_APP_DIR, "../private.pem")
+    public_key_path: str = os.path.join(_APP_DIR, "../public.pem")
+    jwt_algorithm: str = "RS256"
+    jwt_access_token_expire_minutes: int = 30
+
+    # ---------------------------------
+    # Configuración de Contraseñas Filtradas
+    # ---------------------------------
+    # Archivo de SHA-1 ordenados ('python -m app.utils.breached_passwords build ...'); vacío = sin verificación.
+    breached_passwords_path: str = ""
+
+    # ---------------------------------
+    # Configuración de Validación por Lotes
+    # ---------------------------------
+    # Número máximo de filas aceptadas por 'POST /users/validate'.
+    user_validate_batch_max_rows: int = 10000
+    # Filas validadas (y verificadas contra MongoDB) por bloque mientras se lee el cuerpo.
+    user_validate_batch_chunk_size: int = 1000
+
+    # ---------------------------------
+    # Configuración de Compresión de Respuestas
+    # ---------------------------------
+    compression_enabled: bool = True
+    # Tamaño mínimo (bytes) a partir del cual se comprime una respuesta.
+    compression_min_size: int = 1024
+    # Orden de preferencia del servidor cuando el cliente acepta varias codificaciones con el mismo peso.
+    compression_encodings: list = field(default_factory=lambda: ["zstd", "br", "gzip"])
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+
+    # ---------------------------------
+    # Configuración de ETags y Lecturas de Usuarios
+    # ---------------------------------
+    # Tiempo de vida (segundos) de los sellos de versión cacheados por usuario.
+    user_version_cache_ttl_seconds: float = 30
+    user_version_cache_max_entries: int = 10000
+    # Tamaño máximo de página en el listado de usuarios.
+    user_list_max_limit: int = 200
+    # Número máximo de IDs aceptados por 'POST /users/batch'.
+    user_batch_max_ids: int = 5000
+
+    # ---------------------------------
+    # Configuración de Métricas (Prometheus)
+    # ---------------------------------
+    metrics_enabled: bool = True
+    # Límites (segundos) de los buckets del histograma de latencia.
+    metrics_latency_buckets: list = field(default_factory=lambda: [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10])
+    # Medir las etapas de cada solicitud (histograma por etapa) y emitir la cabecera 'Server-Timing'.
+    server_timing_enabled: bool = True
+    # IPs o redes CIDR (separadas por comas) que reciben la cabecera 'Server-Timing'; también la recibe quien envíe
+    # un 'X-Admin-Token' válido. Vacío = ningún cliente por IP (los tiempos por etapa permiten enumerar cuentas).
+    server_timing_trusted_networks: list = field(default_factory=list)
+    # Intervalo (segundos) de muestreo de los gauges del pool de hilos.
+    metrics_sample_interval_seconds: float = 5
+
+    # ---------------------------------
+    # Configuración del Perfilador por Muestreo (desactivado por defecto)
+    # ---------------------------------
+    # Token de administración requerido en 'X-Admin-Token'; si está vacío, el perfilado por HTTP queda desactivado.
+    profiler_admin_token: str = ""
+    profiler_interval_seconds: float = 0.005
+    profiler_max_seconds: float = 60
+    # Perfilado por señal (SIGUSR2): duración y directorio donde se guardan los perfiles.
+    profiler_signal_enabled: bool = False
+    profiler_signal_seconds: float = 10
+    profiler_output_dir: str = "/tmp/user-service-profiles"
+
+    # ---------------------------------
+    # Configuración de Health Checks (liveness/readiness)
+    # ---------------------------------
+    health_probe_interval_seconds: float = 5
+    health_mongo_timeout_seconds: float = 2
+    # Antigüedad máxima del último resultado antes de considerar el worker no listo.
+    health_stale_after_seconds: float = 30
+    # Número máximo de tareas esperando un hilo libre antes de declarar el worker saturado.
+    health_max_executor_queue: int = 100
+
+    # ---------------------------------
+    # Configuración de Limitación de Tasa (registro y login)
+    # ---------------------------------
+    rate_limit_enabled: bool = True
+    # "memory" (por worker) o "mongo" (compartido entre réplicas, colección 'rate_limits').
+    rate_limit_backend: str = "memory"
+    rate_limit_shards: int = 64
+    # Intervalo (segundos) en el que se recorren todas las particiones para expirar entradas inactivas.
+    rate_limit_expiry_interval_seconds: float = 60
+    # Reglas "<solicitudes>/<segundos>" por IP, por cuenta (email/username) y globales; "off" desactiva la regla.
+    rate_limit_register_per_ip: str = "10/60"
+    rate_limit_register_per_account: str = "3/300"
+    rate_limit_register_global: str = "50/1"
+    rate_limit_login_per_ip: str = "30/60"
+    rate_limit_login_per_account: str = "10/300"
+    rate_limit_login_global: str = "100/1"
+    rate_limit_availability_per_ip: str = "120/60"
+    rate_limit_availability_global: str = "1000/1"
+
+    # ---------------------------------
+    # Configuración de Claves de Idempotencia ('Idempotency-Key' en el registro)
+    # ---------------------------------
+    idempotency_enabled: bool = True
+    # Tiempo de vida (segundos) de las respuestas guardadas en MongoDB (colección 'idempotency_keys').
+    idempotency_ttl_seconds: int = 86400
+    # Segundos tras los cuales otro worker puede tomar una clave reclamada que no se completó.
+    idempotency_pending_timeout_seconds: int = 30
+    idempotency_cache_max_entries: int = 10000
+    idempotency_key_max_length: int = 255
+    # Clave HMAC de la huella del cuerpo (que incluye la contraseña); vacía = derivada de la clave privada del JWT.
+    idempotency_fingerprint_secret: str = ""
+
+    # ---------------------------------
+    # Configuración de la Cola de Trabajos en Segundo Plano (outbox en MongoDB)
+    # ---------------------------------
+    jobs_enabled: bool = True
+    # Trabajos ejecutados simultáneamente por worker.
+    job_concurrency: int = 8
+    # Intentos antes de mover un trabajo a 'job_dead_letter'.
+    job_max_attempts: int = 5
+    # Backoff exponencial entre reintentos: base * 2^(intento - 1), acotado por el máximo (con jitter).
+    job_backoff_base_seconds: float = 2
+    job_backoff_max_seconds: float = 300
+    # Intervalo de sondeo del outbox cuando no hay trabajos locales (reintentos y trabajos de otros workers).
+    job_poll_interval_seconds: float = 1
+    # Tiempo máximo de ejecución de un trabajo; pasado este tiempo, otro worker puede reclamarlo.
+    job_lease_seconds: float = 60
+    # Espera máxima por los trabajos en ejecución al apagar el worker.
+    job_shutdown_timeout_seconds: float = 10
+    # Barrido de usuarios sin su trabajo 'user.registered' (se omiten los creados hace menos del margen).
+    job_registration_sweep_interval_seconds: float = 300
+    job_registration_sweep_grace_seconds: float = 120
+
+    # ---------------------------------
+    # Configuración del Registro de Auditoría (colección limitada 'audit_log')
+    # ---------------------------------
+    audit_enabled: bool = True
+    # Eventos máximos en memoria; al llenarse se descartan los más antiguos.
+    audit_buffer_capacity: int = 10000
+    # Eventos por escritura ('insert_many') y tiempo máximo entre escrituras.
+    audit_batch_size: int = 500
+    audit_flush_interval_seconds: float = 1
+    # Tamaño de la colección limitada (bytes).
+    audit_capped_size_bytes: int = 512 * 1024 * 1024
+
+    # ---------------------------------
+    # Configuración del Seguimiento de Actividad ('last_login' / 'last_activity_at')
+    # ---------------------------------
+    activity_tracking_enabled: bool = True
+    # Intervalo (segundos) entre escrituras por lotes; la marca guardada puede retrasarse hasta este tiempo.
+    activity_flush_interval_seconds: float = 10
+    # Usuarios pendientes a partir de los cuales se adelanta la escritura.
+    activity_max_pending: int = 50000
+
+    # ---------------------------------
+    # Configuración de Disponibilidad de Usuario/Email ('GET /auth/availability', filtros de Bloom)
+    # ---------------------------------
+    availability_enabled: bool = True
+    # Capacidad mínima y tasa de falsos positivos de cada filtro (~1,2 bytes por usuario al 1 %).
+    availability_filter_capacity: int = 1_000_000
+    availability_filter_error_rate: float = 0.01
+    # Intervalo (segundos) para incorporar los usuarios creados por otros workers o réplicas.
+    availability_refresh_interval_seconds: float = 30
+    # Documentos por lote al recorrer la colección.
+    availability_scan_batch_size: int = 5000
+
+    # ---------------------------------
+    # Configuración de Zona Horaria
+    # ---------------------------------
+    time_zone_name: str = "America/Bogota"
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Construye la configuración a partir de las variables de entorno (y del archivo '.env').
+        """
+        from dotenv import load_dotenv
+
+        # Cargar variables de entorno desde un archivo '.env' ubicado en la raíz del proyecto.
+        load_dotenv(dotenv_path=Path('.') / '.env')
+
+        return cls(
+            app_name=_env_str("APP_NAME", cls.app_name),
+            app_version=_env_str("APP_VERSION", cls.app_version),
+            server_mode=_env_str("SERVER_MODE", cls.server_mode).lower(),
+            server_host=_env_str("SERVER_HOST", cls.server_host),
+            server_port=_env_int("SERVER_PORT", cls.server_port),
+            web_concurrency=_env_int("WEB_CONCURRENCY", cls.web_concurrency),
+            server_max_requests=_env_int("SERVER_MAX_REQUESTS", cls.server_max_requests),
+            server_max_requests_jitter=_env_int("SERVER_MAX_REQUESTS_JITTER", cls.server_max_requests_jitter),
+            server_graceful_timeout=_env_int("SERVER_GRACEFUL_TIMEOUT", cls.server_graceful_timeout),
+            server_keepalive=_env_int("SERVER_KEEPALIVE", cls.server_keepalive),
+            log_level=_env_str("LOG_LEVEL", cls.log_level).upper(),
+            log_json=_env_bool("LOG_JSON", cls.log_json),
+            log_debug_sample_rate=_env_float("LOG_DEBUG_SAMPLE_RATE", cls.log_debug_sample_rate),
+            log_queue_max_size=_env_int("LOG_QUEUE_MAX_SIZE", cls.log_queue_max_size),
+            mongo_host=_env_str("MONGO_HOST", cls.mongo_host),
+            mongo_port=_env_int("MONGO_PORT", cls.mongo_port),
+            mongo_user=_env_str("MONGO_INITDB_ROOT_USERNAME", cls.mongo_user),
+            mongo_password=_env_str("MONGO_INITDB_ROOT_PASSWORD", cls.mongo_password),
+            mongo_db=_env_str("MONGO_INITDB_DATABASE", cls.mongo_db),
+            mongo_stale_read_preference=_env_str("MONGO_STALE_READ_PREFERENCE", cls.mongo_stale_read_preference),
+            mongo_profile_max_staleness_seconds=_env_int("MONGO_PROFILE_MAX_STALENESS_SECONDS", cls.mongo_profile_max_staleness_seconds),
+            mongo_listing_max_staleness_seconds=_env_int("MONGO_LISTING_MAX_STALENESS_SECONDS", cls.mongo_listing_max_staleness_seconds),
+            private_key_path=_env_str("PRIVATE_KEY_PATH", cls.private_key_path),
+            public_key_path=_env_str("PUBLIC_KEY_PATH", cls.public_key_path),
+            jwt_algorithm=_env_str("JWT_ALGORITHM", cls.jwt_algorithm),
+            jwt_access_token_expire_minutes=_env_int("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", cls.jwt_access_token_expire_minutes),
+            breached_passwords_path=_env_str("BREACHED_PASSWORDS_PATH", cls.breached_passwords_path),
+            user_validate_batch_max_rows=_env_int("USER_VALIDATE_BATCH_MAX_ROWS", cls.user_validate_batch_max_rows),
+            user_validate_batch_chunk_size=_env_int("USER_VALIDATE_BATCH_CHUNK_SIZE", cls.user_validate_batch_chunk_size),
+            compression_enabled=_env_bool("COMPRESSION_ENABLED", cls.compression_enabled),
+            compression_min_size=_env_int("COMPRESSION_MIN_SIZE", cls.compression_min_size),
+            compression_encodings=_env_list("COMPRESSION_ENCODINGS", "zstd,br,gzip"),
+            compression_gzip_level=_env_int("COMPRESSION_GZIP_LEVEL", cls.compression_gzip_level),
+            compression_brotli_quality=_env_int("COMPRESSION_BROTLI_QUALITY", cls.compression_brotli_quality),
+            compression_zstd_level=_env_int("COMPRESSION_ZSTD_LEVEL", cls.compression_zstd_level),
+            user_version_cache_ttl_seconds=_env_float("USER_VERSION_CACHE_TTL_SECONDS", cls.user_version_cache_ttl_seconds),
+            user_version_cache_max_entries=_env_int("USER_VERSION_CACHE_MAX_ENTRIES", cls.user_version_cache_max_entries),
+            user_list_max_limit=_env_int("USER_LIST_MAX_LIMIT", cls.user_list_max_limit),
+            user_batch_max_ids=_env_int("USER_BATCH_MAX_IDS", cls.user_batch_max_ids),
+            metrics_enabled=_env_bool("METRICS_ENABLED", cls.metrics_enabled),
+            metrics_latency_buckets=[float(b) for b in _env_list(
+                "METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10"
+            )],
+            server_timing_enabled=_env_bool("SERVER_TIMING_ENABLED", cls.server_timing_enabled),
+            server_timing_trusted_networks=_env_list("SERVER_TIMING_TRUSTED_NETWORKS", ""),
+            metrics_sample_interval_seconds=_env_float("METRICS_SAMPLE_INTERVAL_SECONDS", cls.metrics_sample_interval_seconds),
+            profiler_admin_token=_env_str("PROFILER_ADMIN_TOKEN", cls.profiler_admin_token),
+            profiler_interval_seconds=_env_float("PROFILER_INTERVAL_SECONDS", cls.profiler_interval_seconds),
+            profiler_max_seconds=_env_float("PROFILER_MAX_SECONDS", cls.profiler_max_seconds),
+            profiler_signal_enabled=_env_bool("PROFILER_SIGNAL_ENABLED", cls.profiler_signal_enabled),
+            profiler_signal_seconds=_env_float("PROFILER_SIGNAL_SECONDS", cls.profiler_signal_seconds),
+            profiler_output_dir=_env_str("PROFILER_OUTPUT_DIR", cls.profiler_output_dir),
+            health_probe_interval_seconds=_env_float("HEALTH_PROBE_INTERVAL_SECONDS", cls.health_probe_interval_seconds),
+            health_mongo_timeout_seconds=_env_float("HEALTH_MONGO_TIMEOUT_SECONDS", cls.health_mongo_timeout_seconds),
+            health_stale_after_seconds=_env_float("HEALTH_STALE_AFTER_SECONDS", cls.health_stale_after_seconds),
+            health_max_executor_queue=_env_int("HEALTH_MAX_EXECUTOR_QUEUE", cls.health_max_executor_queue),
+            rate_limit_enabled=_env_bool("RATE_LIMIT_ENABLED", cls.rate_limit_enabled),
+            rate_limit_backend=_env_str("RATE_LIMIT_BACKEND", cls.rate_limit_backend).lower(),
+            rate_limit_shards=_env_int("RATE_LIMIT_SHARDS", cls.rate_limit_shards),
+            rate_limit_expiry_interval_seconds=_env_float("RATE_LIMIT_EXPIRY_INTERVAL_SECONDS", cls.rate_limit_expiry_interval_seconds),
+            rate_limit_register_per_ip=_env_str("RATE_LIMIT_REGISTER_PER_IP", cls.rate_limit_register_per_ip),
+            rate_limit_register_per_account=_env_str("RATE_LIMIT_REGISTER_PER_ACCOUNT", cls.rate_limit_register_per_account),
+            rate_limit_register_global=_env_str("RATE_LIMIT_REGISTER_GLOBAL", cls.rate_limit_register_global),
+            rate_limit_login_per_ip=_env_str("RATE_LIMIT_LOGIN_PER_IP", cls.rate_limit_login_per_ip),
+            rate_limit_login_per_account=_env_str("RATE_LIMIT_LOGIN_PER_ACCOUNT", cls.rate_limit_login_per_account),
+            rate_limit_login_global=_env_str("RATE_LIMIT_LOGIN_GLOBAL", cls.rate_limit_login_global),
+            rate_limit_availability_per_ip=_env_str("RATE_LIMIT_AVAILABILITY_PER_IP", cls.rate_limit_availability_per_ip),
+            rate_limit_availability_global=_env_str("RATE_LIMIT_AVAILABILITY_GLOBAL", cls.rate_limit_availability_global),
+            idempotency_enabled=_env_bool("IDEMPOTENCY_ENABLED", cls.idempotency_enabled),
+            idempotency_ttl_seconds=_env_int("IDEMPOTENCY_TTL_SECONDS", cls.idempotency_ttl_seconds),
+            idempotency_pending_timeout_seconds=_env_int("IDEMPOTENCY_PENDING_TIMEOUT_SECONDS", cls.idempotency_pending_timeout_seconds),
+            idempotency_cache_max_entries=_env_int("IDEMPOTENCY_CACHE_MAX_ENTRIES", cls.idempotency_cache_max_entries),
+            idempotency_key_max_length=_env_int("IDEMPOTENCY_KEY_MAX_LENGTH", cls.idempotency_key_max_length),
+            idempotency_fingerprint_secret=_env_str("IDEMPOTENCY_FINGERPRINT_SECRET", cls.idempotency_fingerprint_secret),
+            jobs_enabled=_env_bool("JOBS_ENABLED", cls.jobs_enabled),
+            job_concurrency=_env_int("JOB_CONCURRENCY", cls.job_concurrency),
+            job_max_attempts=_env_int("JOB_MAX_ATTEMPTS", cls.job_max_attempts),
+            job_backoff_base_seconds=_env_float("JOB_BACKOFF_BASE_SECONDS", cls.job_backoff_base_seconds),
+            job_backoff_max_seconds=_env_float("JOB_BACKOFF_MAX_SECONDS", cls.job_backoff_max_seconds),
+            job_poll_interval_seconds=_env_float("JOB_POLL_INTERVAL_SECONDS", cls.job_poll_interval_seconds),
+            job_lease_seconds=_env_float("JOB_LEASE_SECONDS", cls.job_lease_seconds),
+            job_shutdown_timeout_seconds=_env_float("JOB_SHUTDOWN_TIMEOUT_SECONDS", cls.job_shutdown_timeout_seconds),
+            job_registration_sweep_interval_seconds=_env_float("JOB_REGISTRATION_SWEEP_INTERVAL_SECONDS", cls.job_registration_sweep_interval_seconds),
+            job_registration_sweep_grace_seconds=_env_float("JOB_REGISTRATION_SWEEP_GRACE_SECONDS", cls.job_registration_sweep_grace_seconds),
+            audit_enabled=_env_bool("AUDIT_ENABLED", cls.audit_enabled),
+            audit_buffer_capacity=_env_int("AUDIT_BUFFER_CAPACITY", cls.audit_buffer_capacity),
+            audit_batch_size=_env_int("AUDIT_BATCH_SIZE", cls.audit_batch_size),
+            audit_flush_interval_seconds=_env_float("AUDIT_FLUSH_INTERVAL_SECONDS", cls.audit_flush_interval_seconds),
+            audit_capped_size_bytes=_env_int("AUDIT_CAPPED_SIZE_BYTES", cls.audit_capped_size_bytes),
+            activity_tracking_enabled=_env_bool("ACTIVITY_TRACKING_ENABLED", cls.activity_tracking_enabled),
+            activity_flush_interval_seconds=_env_float("ACTIVITY_FLUSH_INTERVAL_SECONDS", cls.activity_flush_interval_seconds),
+            activity_max_pending=_env_int("ACTIVITY_MAX_PENDING", cls.activity_max_pending),
+            availability_enabled=_env_bool("AVAILABILITY_ENABLED", cls.availability_enabled),
+            availability_filter_capacity=_env_int("AVAILABILITY_FILTER_CAPACITY", cls.availability_filter_capacity),
+            availability_filter_error_rate=_env_float("AVAILABILITY_FILTER_ERROR_RATE", cls.availability_filter_error_rate),
+            availability_refresh_interval_seconds=_env_float(
+                "AVAILABILITY_REFRESH_INTERVAL_SECONDS", cls.availability_refresh_interval_seconds
+            ),
+            availability_scan_batch_size=_env_int("AVAILABILITY_SCAN_BATCH_SIZE", cls.availability_scan_batch_size),
+            time_zone_name=_env_str("TIME_ZONE", cls.time_zone_name),
+        )
+
+    @cached_property
+    def mongo_uri(self) -> str:
+        return f"mongodb://{self.mongo_user}:{self.mongo_password}@{self.mongo_host}:{self.mongo_port}/{self.mongo_db}?authSource=admin"
+
+    @cached_property
+    def private_key(self) -> str:
+        """Contenido de la clave privada PEM, leído en el primer uso."""
+        return _read_key(self.private_key_path)
+
+    @cached_property
+    def public_key(self) -> str:
+        """Contenido de la clave pública PEM, leído en el primer uso."""
+        return _read_key(self.public_key_path)
+
+    @cached_property
+    def time_zone(self):
+        """Zona horaria de la aplicación ('zoneinfo.ZoneInfo')."""
+        from zoneinfo import ZoneInfo
+
+        return ZoneInfo(self.time_zone_name)
+
+def _read_key(path: str) -> str:
+    try:
+        with open(path, "r") as key_file:
+            return key_file.read()
+    except FileNotFoundError:
+        raise RuntimeError("Las claves RSA no se encontraron. Asegúrate de generar 'private.pem' y 'public.pem'.")
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Retorna la configuración de la aplicación, construyéndola en la primera llamada.
+    """
+    return Settings.from_env()
+
+def __getattr__(name: str):
+    """
+    Resuelve de forma perezosa los atributos en mayúsculas del módulo (p. ej. 'config.MONGO_URI')
+    a partir de `get_settings()`.
+    """
+    if name.isupper():
+        settings = get_settings()
+        attribute = name.lower()
+        if hasattr(settings, attribute):
+            return getattr(settings, attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ---------------------------------
 # Configuración de la clase que se encarga de validar que el tipo de dato sea un ObjectId
 # ---------------------------------
 class PyObjectId(ObjectId):
     @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
-        
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        # Pydantic v2: valida con `validate` y serializa a 'str' en modo JSON.
+        from pydantic_core import core_schema
+
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(str, when_used="json")
+        )
+
     @classmethod
     def validate(cls, v):
         if not ObjectId.is_valid(v):
             raise ValueError("Invalid ObjectId")
         return ObjectId(v)
-    
+
     @classmethod
-    def __modify_schema__(cls, field_schema):
-        field_schema.update(type="string")
+    def __get_pydantic_json_schema__(cls, core_schema, handler):
+        return {"type": "string"}
@@ -0,0 +1,143 @@
+"""
+Seguimiento coalescido de la actividad de los usuarios ('last_login' y 'last_activity_at').
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/activity.py'. 'app/core/auth.py' registra la actividad en cada uso
+      válido de un token y el login registra 'last_login'; el ciclo de vida de la aplicación ('app/main.py')
+      ejecuta `activity_tracker.run()` y `flush()` al apagar el worker.
+
+Responsabilidades:
+    - Acumular en memoria la última marca de tiempo por usuario y campo (solo se conserva la más reciente), en
+      lugar de un 'update_one' por solicitud.
+    - Escribir periódicamente todas las marcas pendientes con un único 'bulk_write' no ordenado, usando '$max'
+      para que una marca más antigua (por ejemplo, de otro worker) nunca sobrescriba una más reciente.
+
+Notas:
+    - Las marcas de actividad no modifican 'updated_at', por lo que no invalidan el ETag del usuario; por eso
+      'user_service' las excluye de las representaciones con ETag ('USER_PUBLIC_PROJECTION' y 'fields').
+    - El registro es seguro entre hilos: las dependencias síncronas (como `validate_jwt`) se ejecutan en el
+      pool de hilos.
+    - Si hay más de 'ACTIVITY_MAX_PENDING' usuarios pendientes se adelanta la escritura.
+    - Si el 'bulk_write' falla, el lote se reincorpora a las marcas pendientes (conservando la más reciente por
+      campo) y se reintenta en la siguiente escritura; como se usa '$max', repetir las operaciones ya aplicadas
+      no tiene efecto.
+"""
+
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from bson import ObjectId
+from pymongo import UpdateOne
+from app import config
+from app.db.mongodb import CONSISTENCY_DEFAULT, get_collection
+
+logger = logging.getLogger(__name__)
+
+FIELD_LAST_LOGIN = "last_login"
+FIELD_LAST_ACTIVITY = "last_activity_at"
+
+class ActivityTracker:
+    """
+    Búfer de marcas de actividad por usuario con escritura periódica por lotes.
+
+    Args:
+        collection: Colección de Motor de los usuarios.
+        flush_interval (float): Segundos entre escrituras.
+        max_pending (int): Usuarios pendientes a partir de los cuales se adelanta la escritura.
+        enabled (bool): Si es False, las marcas se ignoran.
+    """
+
+    def __init__(self, collection, flush_interval: float, max_pending: int, enabled: bool = True):
+        self.collection = collection
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.enabled = enabled
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._flush_requested = asyncio.Event()
+
+    def _record(self, user_id, field: str):
+        if not self.enabled or not user_id:
+            return
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            fields = self._pending.get(user_id)
+            if fields is None:
+                fields = self._pending[user_id] = {}
+            fields[field] = now
+            pending = len(self._pending)
+        if pending >= self.max_pending and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._flush_requested.set)
+
+    def record_login(self, user_id):
+        """
+        Registra un inicio de sesión (actualiza 'last_login' y 'last_activity_at').
+        """
+        self._record(user_id, FIELD_LAST_LOGIN)
+        self._record(user_id, FIELD_LAST_ACTIVITY)
+
+    def record_activity(self, user_id):
+        """
+        Registra el uso de un token válido ('last_activity_at').
+        """
+        self._record(user_id, FIELD_LAST_ACTIVITY)
+
+    async def flush(self) -> int:
+        """
+        Escribe todas las marcas pendientes en un único 'bulk_write'. Retorna el número de usuarios actualizados.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        operations = [
+            UpdateOne({"_id": ObjectId(user_id)}, {"$max": fields})
+            for user_id, fields in pending.items()
+            if ObjectId.is_valid(user_id)
+        ]
+        if not operations:
+            return 0
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except Exception:
+            logger.exception("Error al escribir la actividad de los usuarios", extra={"users": len(operations)})
+            self._restore(pending)
+            return 0
+        return len(operations)
+
+    def _restore(self, failed: dict):
+        """
+        Reincorpora un lote no escrito a las marcas pendientes, conservando la marca más reciente por campo.
+        """
+        with self._lock:
+            for user_id, fields in failed.items():
+                if not ObjectId.is_valid(user_id):
+                    continue
+                current = self._pending.get(user_id)
+                if current is None:
+                    self._pending[user_id] = fields
+                    continue
+                for field, stamp in fields.items():
+                    if field not in current or stamp > current[field]:
+                        current[field] = stamp
+
+    async def run(self):
+        """
+        Tarea en segundo plano: escribe las marcas cada `flush_interval` segundos (o antes si hay demasiadas).
+        """
+        self._loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+# Seguimiento de actividad compartido por la aplicación.
+activity_tracker = ActivityTracker(
+    get_collection("user", CONSISTENCY_DEFAULT),
+    flush_interval=config.ACTIVITY_FLUSH_INTERVAL_SECONDS,
+    max_pending=config.ACTIVITY_MAX_PENDING,
+    enabled=config.ACTIVITY_TRACKING_ENABLED
+)
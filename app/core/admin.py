@@ -0,0 +1,31 @@
+"""
+Protección de endpoints administrativos mediante un token compartido.
+
+Los endpoints de diagnóstico (por ejemplo, el perfilador) no dependen de los usuarios de la aplicación:
+se protegen con el token definido en 'PROFILER_ADMIN_TOKEN', enviado en el encabezado 'X-Admin-Token'.
+Si el token no está configurado, los endpoints responden 404 como si no existieran.
+"""
+
+import hmac
+from fastapi import Header, HTTPException
+from app import config
+
+def is_valid_admin_token(token: str) -> bool:
+    """
+    Compara el token recibido con 'PROFILER_ADMIN_TOKEN' en tiempo constante.
+    """
+    if not config.PROFILER_ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), config.PROFILER_ADMIN_TOKEN.encode("utf-8"))
+
+def require_admin_token(x_admin_token: str = Header(None)):
+    """
+    Dependencia de FastAPI que exige un 'X-Admin-Token' válido.
+
+    Raises:
+        HTTPException: 404 si no hay token configurado; 403 si el token es inválido.
+    """
+    if not config.PROFILER_ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_valid_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Token de administración inválido")
@@ -0,0 +1,144 @@
+"""
+Registro de Auditoría con escritura por lotes.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/audit.py'. Las rutas y servicios registran eventos con
+      `audit_log.emit(...)`; el ciclo de vida de la aplicación ('app/main.py') ejecuta `audit_log.run()`.
+
+Responsabilidades:
+    - Acumular los eventos en un búfer circular en memoria: `emit` es síncrono, O(1) y nunca espera a la base
+      de datos.
+    - Escribirlos con 'insert_many' (no ordenado) en lotes, cuando el búfer alcanza 'AUDIT_BATCH_SIZE' eventos o
+      cada 'AUDIT_FLUSH_INTERVAL_SECONDS', en la colección limitada (capped) 'audit_log'.
+    - Acotar la memoria: con el búfer lleno (por ejemplo, si la base de datos se retrasa) se descartan los eventos
+      más antiguos, y los descartes se cuentan en la métrica 'audit_events_dropped_total'.
+
+Notas:
+    - Cada evento incluye la acción, el actor, el objetivo, detalles opcionales, la fecha (UTC) y el ID de la
+      solicitud ('X-Request-ID').
+    - La colección limitada conserva el orden de inserción y descarta automáticamente los documentos más
+      antiguos al alcanzar 'AUDIT_CAPPED_SIZE_BYTES'.
+    - Al apagar el worker se escriben los eventos pendientes.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from pymongo.errors import CollectionInvalid
+from app import config
+from app.core import metrics
+from app.core.request_context import get_request_id
+from app.db.mongodb import CONSISTENCY_DEFAULT, get_collection
+
+logger = logging.getLogger(__name__)
+
+# Acciones auditadas.
+ACTION_REGISTER = "auth.register"
+# Reservada para el inicio de sesión; se emitirá cuando 'POST /auth/login' autentique realmente.
+ACTION_LOGIN = "auth.login"
+ACTION_ROLE_CHANGE = "user.role_change"
+ACTION_PERMISSION_CHANGE = "permission.change"
+
+class AuditLog:
+    """
+    Escritor de eventos de auditoría por lotes.
+
+    Args:
+        collection: Colección de Motor (limitada) donde se escriben los eventos.
+        capacity (int): Máximo de eventos en memoria.
+        batch_size (int): Eventos por 'insert_many'.
+        flush_interval (float): Segundos máximos entre escrituras.
+        enabled (bool): Si es False, `emit` no hace nada.
+    """
+
+    def __init__(self, collection, capacity: int, batch_size: int, flush_interval: float, enabled: bool = True):
+        self.enabled = enabled
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = deque(maxlen=capacity)
+        self._batch_ready = asyncio.Event()
+
+    def emit(self, action: str, actor_id=None, target_id=None, **details):
+        """
+        Registra un evento de auditoría (sin E/S). Si el búfer está lleno se descarta el evento más antiguo.
+        """
+        if not self.enabled:
+            return
+        if len(self._buffer) == self._buffer.maxlen:
+            metrics.AUDIT_EVENTS_DROPPED.labels("buffer_full").inc()
+        self._buffer.append({
+            "action": action,
+            "actor_id": str(actor_id) if actor_id is not None else None,
+            "target_id": str(target_id) if target_id is not None else None,
+            "details": details,
+            "request_id": get_request_id(),
+            "ts": datetime.now(timezone.utc),
+        })
+        if len(self._buffer) >= self.batch_size:
+            self._batch_ready.set()
+
+    async def ensure_collection(self):
+        try:
+            await self.collection.database.create_collection(
+                self.collection.name, capped=True, size=config.AUDIT_CAPPED_SIZE_BYTES
+            )
+        except CollectionInvalid:
+            # La colección ya existe.
+            pass
+
+    async def flush(self) -> int:
+        """
+        Escribe hasta `batch_size` eventos del búfer. Retorna el número de eventos escritos.
+        """
+        count = min(self.batch_size, len(self._buffer))
+        if count == 0:
+            return 0
+        batch = [self._buffer.popleft() for _ in range(count)]
+        try:
+            await self.collection.insert_many(batch, ordered=False)
+        except Exception:
+            metrics.AUDIT_EVENTS_DROPPED.labels("write_error").inc(count)
+            logger.exception("Error al escribir eventos de auditoría", extra={"events": count})
+            return 0
+        metrics.AUDIT_EVENTS_WRITTEN.inc(count)
+        return count
+
+    async def flush_all(self):
+        """
+        Escribe todos los eventos pendientes (al apagar el worker).
+        """
+        while self._buffer:
+            if await self.flush() == 0:
+                break
+        metrics.AUDIT_BUFFER_SIZE.set(len(self._buffer))
+
+    async def run(self):
+        """
+        Tarea en segundo plano: escribe un lote cuando se llena o al vencer el intervalo.
+        """
+        try:
+            await self.ensure_collection()
+        except Exception:
+            logger.exception("No se pudo crear la colección de auditoría")
+
+        while True:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            # Vaciar mientras haya lotes completos; un lote parcial se escribe al vencer el intervalo.
+            while await self.flush() == self.batch_size and len(self._buffer) >= self.batch_size:
+                pass
+            metrics.AUDIT_BUFFER_SIZE.set(len(self._buffer))
+
+# Registro de auditoría compartido por la aplicación.
+audit_log = AuditLog(
+    get_collection("audit_log", CONSISTENCY_DEFAULT),
+    capacity=config.AUDIT_BUFFER_CAPACITY,
+    batch_size=config.AUDIT_BATCH_SIZE,
+    flush_interval=config.AUDIT_FLUSH_INTERVAL_SECONDS,
+    enabled=config.AUDIT_ENABLED
+)
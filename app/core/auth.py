@@ -28,6 +28,7 @@ Estructura:
         • verify_jwt(token: str): Verifica y decodifica un token JWT, retornando el payload decodificado si el token es válido.
         • validate_jwt(token: str = Security(oauth2_scheme)): Valida el token JWT obtenido del header "Authorization",
           lanzando excepciones HTTP 401 si el token es inválido o ha expirado.
+        • require_role(*roles): Dependencia que, además, exige uno de los roles indicados (HTTP 403 si no).
 
 Notas:
     - Es fundamental que las claves RSA (PRIVATE_KEY y PUBLIC_KEY) se hayan configurado correctamente en 'app/config.py'.
@@ -39,15 +40,18 @@ Notas:
 import jwt
 from datetime import datetime, timedelta
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import HTTPException, Security
+from fastapi import Depends, HTTPException, Security
 from jwt import ExpiredSignatureError, InvalidTokenError
+from app.core import server_timing
+from app.core.activity import activity_tracker
 
-# Importar configuraciones desde config.py
-from app.config import PRIVATE_KEY, PUBLIC_KEY, JWT_ALGORITHM, JWT_ACCESS_TOKEN_EXPIRE_MINUTES, TIME_ZONE
+# Importar configuraciones desde config.py (las claves se leen en su primer uso, no al importar).
+from app.config import get_settings
 
 # Esquema de seguridad para extraer el token del header "Authorization"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+@server_timing.timed(server_timing.STAGE_JWT)
 def create_jwt(data: dict, expires_delta: timedelta = None):
     """
     Genera un token JWT firmado con RS256 que contiene la información proporcionada.
@@ -66,14 +70,16 @@ def create_jwt(data: dict, expires_delta: timedelta = None):
         str: Token JWT generado, firmado con la clave privada (PRIVATE_KEY) y utilizando el algoritmo especificado
              en JWT_ALGORITHM.
     """
+    settings = get_settings()
     to_encode = data.copy()
-    expire = datetime.now(TIME_ZONE) + (expires_delta or timedelta(minutes=JWT_ACCESS_TOKEN_EXPIRE_MINUTES))
+    expire = datetime.now(settings.time_zone) + (expires_delta or timedelta(minutes=settings.jwt_access_token_expire_minutes))
     to_encode.update({"exp": expire})  # Agrega la fecha de expiración al payload
 
     # Firmar y codificar el token con la clave privada
-    token = jwt.encode(to_encode, PRIVATE_KEY, algorithm=JWT_ALGORITHM)
+    token = jwt.encode(to_encode, settings.private_key, algorithm=settings.jwt_algorithm)
     return token
 
+@server_timing.timed(server_timing.STAGE_JWT)
 def verify_jwt(token: str):
     """
     Verifica y decodifica un token JWT utilizando la clave pública.
@@ -93,13 +99,15 @@ def verify_jwt(token: str):
         HTTPException: Con código 401 y detalle "Token inválido" si el token no es válido.
     """
     try:
-        decoded_token = jwt.decode(token, PUBLIC_KEY, algorithms=[JWT_ALGORITHM])
+        settings = get_settings()
+        decoded_token = jwt.decode(token, settings.public_key, algorithms=[settings.jwt_algorithm])
         return decoded_token
     except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expirado")
     except InvalidTokenError:
         raise HTTPException(status_code=401, detail="Token inválido")
 
+@server_timing.timed(server_timing.STAGE_JWT)
 def validate_jwt(token: str = Security(oauth2_scheme)):
     """
     Valida un token JWT obtenido del encabezado "Authorization".
@@ -121,9 +129,35 @@ def validate_jwt(token: str = Security(oauth2_scheme)):
         HTTPException: Con código 401 y detalle "Token inválido" si el token no es válido.
     """
     try:
-        payload = jwt.decode(token, PUBLIC_KEY, algorithms=[JWT_ALGORITHM])
+        settings = get_settings()
+        payload = jwt.decode(token, settings.public_key, algorithms=[settings.jwt_algorithm])
+        # Marca de actividad en memoria; se escribe por lotes en segundo plano ('app/core/activity.py').
+        activity_tracker.record_activity(payload.get("user_id"))
         return payload  # Retorna el payload con los datos del usuario contenido en el token
     except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expirado")
     except InvalidTokenError:
         raise HTTPException(status_code=401, detail="Token inválido")
+
+def require_role(*roles):
+    """
+    Crea una dependencia de FastAPI que valida el JWT y exige que su 'user_role' sea uno de `roles`.
+
+    Args:
+        *roles (UserRole | str): Roles autorizados.
+
+    Returns:
+        Callable: Dependencia que retorna el payload del token.
+
+    Raises:
+        HTTPException: 401 si el token es inválido o ha expirado; 403 si el rol no está autorizado.
+    """
+    allowed = frozenset(getattr(role, "value", role) for role in roles)
+
+    def dependency(payload: dict = Depends(validate_jwt)):
+        if payload.get("user_role") not in allowed:
+            raise HTTPException(status_code=403, detail="Permisos insuficientes")
+        return payload
+
+    return dependency
+
@@ -0,0 +1,163 @@
+"""
+Índice de disponibilidad de nombres de usuario y correos electrónicos ('GET /auth/availability').
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/availability.py'. 'user_service' lo consulta para responder la
+      disponibilidad y lo actualiza al crear usuarios; el ciclo de vida de la aplicación ('app/main.py') ejecuta
+      `availability_index.run()` en cada worker.
+
+Responsabilidades:
+    - Construir al iniciar, recorriendo la colección 'user' como cursor (solo 'username' y 'email'), un filtro de
+      Bloom por campo, sin bloquear el arranque del worker.
+    - Responder "disponible" sin consultar MongoDB cuando el filtro indica que el valor definitivamente no existe;
+      solo ante un posible acierto (valor registrado o falso positivo) se confirma con una consulta puntual.
+    - Mantener los filtros al día: los usuarios creados por este worker se agregan al insertarse, y los creados
+      por otros workers o réplicas se incorporan cada 'AVAILABILITY_REFRESH_INTERVAL_SECONDS' leyendo solo los
+      documentos recientes (por '_id').
+
+Notas:
+    - La respuesta es orientativa: durante el intervalo de actualización un valor recién registrado en otro worker
+      puede aparecer como disponible. El registro sigue verificando duplicados contra la base de datos, y los
+      índices únicos de 'username' y 'email' ('user_service.ensure_indexes') cubren los registros concurrentes.
+    - Mientras los filtros se construyen (o si 'AVAILABILITY_ENABLED' es False) todas las consultas van a MongoDB.
+    - Los filtros no admiten eliminaciones; como los usuarios se eliminan de forma lógica ('is_deleted'), sus
+      valores siguen registrados y esto no cambia la respuesta. Si se supera la capacidad, se reconstruyen.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from app import config
+from app.core import metrics, server_timing
+from app.db.mongodb import CONSISTENCY_LISTING, CONSISTENCY_STRONG, get_collection
+from app.utils.bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("username", "email")
+
+# Margen sobre el último recorrido para no perder inserciones de otros procesos (relojes desfasados y
+# secundarios atrasados hasta su presupuesto de antigüedad).
+_CLOCK_SKEW_SECONDS = 60
+
+class AvailabilityIndex:
+    """
+    Filtros de Bloom de los valores ya registrados, con confirmación en MongoDB ante posibles aciertos.
+
+    Args:
+        capacity (int): Capacidad mínima de cada filtro (se usa el doble de los documentos si es mayor).
+        error_rate (float): Tasa de falsos positivos de los filtros.
+        refresh_interval (float): Segundos entre lecturas de los usuarios creados por otros procesos.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, refresh_interval: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self._filters = None
+        self._building = None
+        self._scanned_until = None
+
+    @property
+    def ready(self) -> bool:
+        return self._filters is not None
+
+    def _add_document(self, filters: dict, document: dict):
+        for field in FIELDS:
+            value = document.get(field)
+            # Solo se cuentan valores nuevos, para que los recorridos solapados no saturen el filtro.
+            if value and value not in filters[field]:
+                filters[field].add(value)
+
+    def add(self, document: dict):
+        """
+        Agrega los valores de un usuario recién creado (también al filtro en construcción, si lo hay).
+        """
+        for filters in (self._filters, self._building):
+            if filters is not None:
+                self._add_document(filters, document)
+
+    async def _scan(self, filters: dict, query: dict):
+        cursor = get_collection("user", CONSISTENCY_LISTING).find(
+            query, {field: 1 for field in FIELDS}, batch_size=config.AVAILABILITY_SCAN_BATCH_SIZE
+        )
+        async for document in cursor:
+            self._add_document(filters, document)
+
+    async def build(self):
+        """
+        Construye los filtros recorriendo toda la colección y los reemplaza de forma atómica.
+        """
+        started = datetime.now(timezone.utc)
+        expected = await get_collection("user", CONSISTENCY_LISTING).estimated_document_count()
+        capacity = max(self.capacity, expected * 2)
+        self._building = {field: BloomFilter(capacity, self.error_rate) for field in FIELDS}
+        try:
+            await self._scan(self._building, {})
+            self._filters, self._scanned_until = self._building, started
+        finally:
+            self._building = None
+        logger.info(
+            "Filtros de disponibilidad construidos",
+            extra={"users": self._filters["email"].count, "bytes": sum(f.memory_bytes for f in self._filters.values())}
+        )
+
+    async def refresh(self):
+        """
+        Incorpora los usuarios creados desde el último recorrido (en cualquier proceso).
+        """
+        if any(bloom_filter.saturated for bloom_filter in self._filters.values()):
+            await self.build()
+            return
+        started = datetime.now(timezone.utc)
+        margin = timedelta(seconds=config.MONGO_LISTING_MAX_STALENESS_SECONDS + _CLOCK_SKEW_SECONDS)
+        await self._scan(self._filters, {"_id": {"$gte": ObjectId.from_datetime(self._scanned_until - margin)}})
+        self._scanned_until = started
+
+    async def is_taken(self, field: str, value: str) -> bool:
+        """
+        Indica si `value` ya está registrado en `field` ("username" o "email").
+        """
+        filters = self._filters
+        if filters is not None and value not in filters[field]:
+            metrics.AVAILABILITY_CHECKS.labels(field, "filtered").inc()
+            return False
+
+        with server_timing.stage(server_timing.STAGE_DB):
+            existing = await get_collection("user", CONSISTENCY_STRONG).find_one({field: value}, {"_id": 1})
+        if filters is None:
+            result = "unfiltered"
+        else:
+            result = "taken" if existing else "false_positive"
+        metrics.AVAILABILITY_CHECKS.labels(field, result).inc()
+        return existing is not None
+
+    async def run(self):
+        """
+        Tarea en segundo plano: construye los filtros (reintentando ante errores) y los actualiza periódicamente.
+        """
+        while not self.ready:
+            try:
+                await self.build()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("No se pudieron construir los filtros de disponibilidad")
+                await asyncio.sleep(self.refresh_interval)
+
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("No se pudieron actualizar los filtros de disponibilidad")
+
+# Índice compartido por la aplicación.
+availability_index = AvailabilityIndex(
+    capacity=config.AVAILABILITY_FILTER_CAPACITY,
+    error_rate=config.AVAILABILITY_FILTER_ERROR_RATE,
+    refresh_interval=config.AVAILABILITY_REFRESH_INTERVAL_SECONDS
+)
@@ -0,0 +1,91 @@
+"""
+Estado de salud y preparación (readiness) del worker, actualizado por un prober en segundo plano.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/health.py'. El prober se inicia en el ciclo de vida de la aplicación
+      ('app/main.py') y el estado se expone en '/readyz' ('app/routers/main_routes.py').
+
+Responsabilidades:
+    - Verificar periódicamente la conexión a MongoDB (comando 'ping' con tiempo límite), la disponibilidad de las
+      claves RSA y la saturación del pool de hilos.
+    - Mantener el último resultado en memoria para que cada sondeo de Kubernetes se responda sin E/S.
+    - Considerar "no listo" un estado obsoleto (si el prober dejó de actualizarlo).
+
+Notas:
+    - '/healthz' (liveness) no consulta este estado: solo confirma que el proceso atiende solicitudes.
+"""
+
+import asyncio
+import logging
+import time
+from anyio import to_thread
+from app import config
+from app.db import mongodb
+
+logger = logging.getLogger(__name__)
+
+# Último estado calculado por el prober. Antes de la primera verificación el worker no está listo.
+readiness_state = {"ready": False, "checks": {}, "checked_at": None}
+
+async def check_mongo() -> dict:
+    try:
+        result = await asyncio.wait_for(mongodb.db.command("ping"), timeout=config.HEALTH_MONGO_TIMEOUT_SECONDS)
+        return {"ok": result.get("ok") == 1.0}
+    except Exception as e:
+        return {"ok": False, "error": type(e).__name__}
+
+def check_keys() -> dict:
+    try:
+        return {"ok": bool(config.PRIVATE_KEY) and bool(config.PUBLIC_KEY)}
+    except Exception as e:
+        return {"ok": False, "error": type(e).__name__}
+
+def check_executor() -> dict:
+    statistics = to_thread.current_default_thread_limiter().statistics()
+    return {
+        "ok": statistics.tasks_waiting <= config.HEALTH_MAX_EXECUTOR_QUEUE,
+        "busy": statistics.borrowed_tokens,
+        "waiting": statistics.tasks_waiting
+    }
+
+async def probe_once() -> dict:
+    """
+    Ejecuta todas las verificaciones y actualiza `readiness_state`.
+    """
+    checks = {
+        "mongo": await check_mongo(),
+        "keys": check_keys(),
+        "executor": check_executor()
+    }
+    ready = all(check["ok"] for check in checks.values())
+    if ready != readiness_state["ready"]:
+        logger.info("Cambio de estado de readiness", extra={"ready": ready, "checks": checks})
+    readiness_state.update(ready=ready, checks=checks, checked_at=time.monotonic())
+    return readiness_state
+
+async def run_prober(interval: float = None):
+    """
+    Tarea en segundo plano que actualiza el estado cada `interval` segundos.
+    """
+    interval = interval or config.HEALTH_PROBE_INTERVAL_SECONDS
+    while True:
+        try:
+            await probe_once()
+        except Exception:
+            logger.exception("Error en el prober de readiness")
+        await asyncio.sleep(interval)
+
+def get_readiness() -> tuple:
+    """
+    Retorna (listo, estado) a partir del último resultado, sin E/S.
+
+    Un resultado más antiguo que 'HEALTH_STALE_AFTER_SECONDS' se considera no listo.
+    """
+    checked_at = readiness_state["checked_at"]
+    if checked_at is None:
+        return False, {"ready": False, "reason": "sin verificar"}
+    age = time.monotonic() - checked_at
+    if age > config.HEALTH_STALE_AFTER_SECONDS:
+        return False, {"ready": False, "reason": "estado obsoleto", "age_seconds": round(age, 3)}
+    ready = readiness_state["ready"]
+    return ready, {"ready": ready, "checks": readiness_state["checks"], "age_seconds": round(age, 3)}
@@ -0,0 +1,312 @@
+"""
+Soporte de claves de idempotencia ('Idempotency-Key') para endpoints de creación.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/idempotency.py' y lo utiliza 'POST /auth/register'.
+
+Responsabilidades:
+    - Reclamar cada clave en la colección 'idempotency_keys' de MongoDB antes de ejecutar la operación: se inserta
+      un documento pendiente con la clave como '_id' y solo el worker cuya inserción tiene éxito ejecuta la
+      operación. Los demás workers esperan (consultando el documento) hasta que se complete.
+    - Guardar la respuesta final (código de estado y cuerpo ya serializado) en ese documento (con índice TTL) y en
+      un LRU en memoria del worker que la produjo o la leyó de MongoDB.
+    - Coalescer solicitudes concurrentes con la misma clave dentro del proceso: la primera resuelve la clave en una
+      tarea independiente y las demás esperan su resultado, sin repetir validación, consulta de duplicados ni bcrypt.
+    - Rechazar la reutilización de una clave con un cuerpo distinto (huella HMAC-SHA256 del cuerpo, con una clave
+      del servidor: el cuerpo del registro incluye la contraseña en texto plano, y un hash sin clave guardado en
+      MongoDB permitiría probar contraseñas a la velocidad de SHA-256, sin pasar por bcrypt).
+
+Notas:
+    - Solo se guardan respuestas con código < 500; ante un error del servidor se libera la clave y el cliente
+      puede reintentar.
+    - Un reclamo pendiente vence a los 'IDEMPOTENCY_PENDING_TIMEOUT_SECONDS' (por ejemplo, si el worker que lo
+      tomó terminó abruptamente); a partir de entonces otro worker puede tomarlo y ejecutar la operación.
+    - Las respuestas reproducidas incluyen la cabecera 'Idempotent-Replayed: true'. El endpoint puede
+      transformar el cuerpo reproducido (el registro emite un token de acceso nuevo, ya que el guardado puede
+      haber vencido).
+    - Si MongoDB no está disponible, el almacenamiento compartido se omite (se registra el error) y se conserva
+      el comportamiento en memoria.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from fastapi import Response
+from pymongo.errors import DuplicateKeyError
+from app import config
+from app.db.mongodb import CONSISTENCY_DEFAULT, get_collection
+from app.utils.responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+STATE_PENDING = "pending"
+STATE_COMPLETED = "completed"
+
+# Espera entre consultas mientras otro worker completa la operación (con retroceso exponencial).
+_POLL_INITIAL_SECONDS = 0.05
+_POLL_MAX_SECONDS = 0.5
+
+# Resultado de `_claim` cuando MongoDB no responde.
+_UNAVAILABLE = object()
+
+class IdempotencyStore:
+    """
+    Almacén de respuestas por clave de idempotencia con reclamo en MongoDB y coalescencia de solicitudes en curso.
+
+    Args:
+        collection: Colección de Motor para el almacenamiento compartido (None para usar solo memoria).
+        max_entries (int): Tamaño máximo del LRU en memoria.
+        ttl_seconds (int): Tiempo de vida de las respuestas guardadas (en MongoDB y en memoria).
+        pending_timeout (float): Segundos tras los cuales un reclamo pendiente puede tomarlo otro worker.
+    """
+
+    def __init__(self, collection=None, max_entries: int = 10000, ttl_seconds: int = 86400, pending_timeout: float = 30):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.pending_timeout = pending_timeout
+        self._completed = OrderedDict()
+        self._in_flight = {}
+
+    async def ensure_indexes(self):
+        """
+        Crea el índice TTL que elimina las respuestas vencidas.
+        """
+        if self.collection is None:
+            return
+        try:
+            await self.collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+        except Exception:
+            logger.exception("No se pudo crear el índice TTL de 'idempotency_keys'")
+
+    def _remember(self, key: str, record: dict):
+        self._completed[key] = (time.monotonic() + self.ttl_seconds, record)
+        self._completed.move_to_end(key)
+        if len(self._completed) > self.max_entries:
+            self._completed.popitem(last=False)
+
+    def _cached(self, key: str):
+        entry = self._completed.get(key)
+        if entry is None:
+            return None
+        expires, record = entry
+        if expires <= time.monotonic():
+            del self._completed[key]
+            return None
+        self._completed.move_to_end(key)
+        return record
+
+    async def _claim(self, key: str, fingerprint: str):
+        """
+        Intenta reclamar la clave. Retorna el identificador del reclamo, None si otro proceso ya la tiene, o
+        `_UNAVAILABLE` si MongoDB no responde.
+        """
+        owner = uuid.uuid4().hex
+        now = datetime.now(timezone.utc)
+        try:
+            await self.collection.insert_one({
+                "_id": key,
+                "state": STATE_PENDING,
+                "fingerprint": fingerprint,
+                "owner": owner,
+                "lease_expires_at": now + timedelta(seconds=self.pending_timeout),
+                "created_at": now
+            })
+            return owner
+        except DuplicateKeyError:
+            return None
+        except Exception:
+            logger.exception("Error al reclamar la clave de idempotencia")
+            return _UNAVAILABLE
+
+    async def _take_over(self, key: str):
+        """
+        Toma un reclamo pendiente cuyo plazo venció. Retorna el nuevo identificador del reclamo o None.
+        """
+        owner = uuid.uuid4().hex
+        now = datetime.now(timezone.utc)
+        document = await self.collection.find_one_and_update(
+            {"_id": key, "state": STATE_PENDING, "lease_expires_at": {"$lt": now}},
+            {"$set": {"owner": owner, "lease_expires_at": now + timedelta(seconds=self.pending_timeout)}}
+        )
+        return owner if document is not None else None
+
+    async def _wait(self, key: str, fingerprint: str):
+        """
+        Espera a que el worker que reclamó la clave la complete. Retorna `(record, None)` con la respuesta guardada,
+        o `(None, owner)` si este proceso termina reclamando la clave (liberada o con el plazo vencido). Si MongoDB
+        deja de responder al reclamar, retorna `(None, None)`: la operación se ejecuta sin almacenamiento compartido.
+        """
+        delay = _POLL_INITIAL_SECONDS
+        while True:
+            document = await self.collection.find_one({"_id": key})
+            if document is None:
+                # El reclamo se liberó (error del servidor) o venció: se intenta reclamar de nuevo.
+                owner = await self._claim(key, fingerprint)
+                if owner is _UNAVAILABLE:
+                    return None, None
+                if owner is not None:
+                    return None, owner
+                # Otro proceso lo reclamó primero: esperar antes de volver a consultar.
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _POLL_MAX_SECONDS)
+                continue
+            if document["fingerprint"] != fingerprint:
+                return {"fingerprint": document["fingerprint"]}, None
+            if document["state"] == STATE_COMPLETED:
+                record = {
+                    "fingerprint": document["fingerprint"],
+                    "status_code": document["status_code"],
+                    "body": bytes(document["body"])
+                }
+                self._remember(key, record)
+                return record, None
+            owner = await self._take_over(key)
+            if owner is not None:
+                return None, owner
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _POLL_MAX_SECONDS)
+
+    async def _execute(self, key: str, fingerprint: str, operation, owner):
+        try:
+            response = await operation()
+        except BaseException:
+            await self._release(key, owner)
+            raise
+        record = {"fingerprint": fingerprint, "status_code": response.status_code, "body": bytes(response.body)}
+        if response.status_code >= 500:
+            await self._release(key, owner)
+            return record
+        if owner is not None:
+            try:
+                result = await self.collection.update_one(
+                    {"_id": key, "owner": owner},
+                    {"$set": {"state": STATE_COMPLETED, "status_code": record["status_code"], "body": record["body"]}}
+                )
+            except Exception:
+                logger.exception("Error al guardar la clave de idempotencia")
+            else:
+                if result.matched_count == 0:
+                    # Otro worker tomó el reclamo vencido: su respuesta es la que queda guardada.
+                    logger.warning("El reclamo de la clave de idempotencia venció antes de completarse")
+                    return record
+        self._remember(key, record)
+        return record
+
+    async def _release(self, key: str, owner):
+        if owner is None:
+            return
+        try:
+            await self.collection.delete_one({"_id": key, "owner": owner, "state": STATE_PENDING})
+        except Exception:
+            logger.exception("Error al liberar la clave de idempotencia")
+
+    async def _resolve(self, key: str, fingerprint: str, operation):
+        """
+        Resuelve la clave en todo el clúster. Retorna `(record, executed)`, donde `executed` indica si la operación
+        se ejecutó en esta llamada.
+        """
+        if self.collection is None:
+            return await self._execute(key, fingerprint, operation, None), True
+
+        owner = await self._claim(key, fingerprint)
+        if owner is _UNAVAILABLE:
+            return await self._execute(key, fingerprint, operation, None), True
+        if owner is None:
+            try:
+                record, owner = await self._wait(key, fingerprint)
+            except Exception:
+                logger.exception("Error al consultar la clave de idempotencia")
+                return await self._execute(key, fingerprint, operation, None), True
+            if record is not None:
+                return record, False
+        return await self._execute(key, fingerprint, operation, owner), True
+
+    async def is_known(self, key: str) -> bool:
+        """
+        Indica si la clave ya se reclamó o completó (en este proceso o en MongoDB): la solicitud se resolverá
+        reproduciendo o esperando una respuesta, sin volver a ejecutar la operación.
+        """
+        if key in self._in_flight or self._cached(key) is not None:
+            return True
+        if self.collection is None:
+            return False
+        try:
+            return await self.collection.find_one({"_id": key}, {"_id": 1}) is not None
+        except Exception:
+            logger.exception("Error al consultar la clave de idempotencia")
+            return False
+
+    async def run(self, key: str, fingerprint: str, operation, on_replay=None) -> Response:
+        """
+        Ejecuta `operation` una sola vez por clave y retorna su respuesta (o la respuesta guardada).
+
+        Args:
+            key (str): Valor de la cabecera 'Idempotency-Key'.
+            fingerprint (str): Huella del cuerpo de la solicitud.
+            operation: Función asíncrona sin argumentos que retorna una respuesta con `status_code` y `body`.
+            on_replay: Función opcional que recibe el registro guardado (`status_code` y `body`) y retorna el
+                cuerpo a enviar cuando la respuesta se reproduce.
+
+        Returns:
+            Response: La respuesta original, o una respuesta 422 si la clave se reutilizó con otro cuerpo.
+        """
+        replayed = True
+        record = self._cached(key)
+        if record is None:
+            task = self._in_flight.get(key)
+            if task is None:
+                # La resolución corre en su propia tarea para que la cancelación de una solicitud (por ejemplo,
+                # un cliente que se desconecta) no afecte a las demás que esperan el mismo resultado.
+                task = asyncio.ensure_future(self._resolve(key, fingerprint, operation))
+                self._in_flight[key] = task
+                task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+                record, executed = await asyncio.shield(task)
+                replayed = not executed
+            else:
+                record, _ = await asyncio.shield(task)
+
+        if record["fingerprint"] != fingerprint:
+            return FastJSONResponse(
+                status_code=422,
+                content={"error": f"La cabecera '{IDEMPOTENCY_HEADER}' ya se utilizó con una solicitud diferente."}
+            )
+
+        body = record["body"]
+        headers = None
+        if replayed:
+            headers = {REPLAYED_HEADER: "true"}
+            if on_replay is not None:
+                body = on_replay(record)
+        return Response(
+            content=body,
+            status_code=record["status_code"],
+            media_type="application/json",
+            headers=headers
+        )
+
+@lru_cache(maxsize=1)
+def _fingerprint_key() -> bytes:
+    secret = config.IDEMPOTENCY_FINGERPRINT_SECRET or config.PRIVATE_KEY
+    # Con la clave privada se usa un derivado con etiqueta propia, no el PEM directamente.
+    return hashlib.sha256(b"idempotency-fingerprint:" + secret.encode("utf-8")).digest()
+
+def request_fingerprint(body: bytes) -> str:
+    return hmac.new(_fingerprint_key(), body, hashlib.sha256).hexdigest()
+
+# Almacén compartido por la aplicación.
+store = IdempotencyStore(
+    collection=get_collection("idempotency_keys", CONSISTENCY_DEFAULT),
+    max_entries=config.IDEMPOTENCY_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.IDEMPOTENCY_TTL_SECONDS,
+    pending_timeout=config.IDEMPOTENCY_PENDING_TIMEOUT_SECONDS
+)
@@ -0,0 +1,225 @@
+"""
+Cola de trabajos en segundo plano con outbox persistente en MongoDB.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/jobs.py'. Los servicios registran manejadores con
+      `job_queue.handler("<tipo>")` y encolan trabajos con `await job_queue.enqueue("<tipo>", payload)`;
+      el ciclo de vida de la aplicación ('app/main.py') ejecuta `job_queue.run()` en cada worker.
+
+Responsabilidades:
+    - Persistir cada trabajo en la colección 'job_outbox' antes de retornar, para que no se pierda si el
+      worker termina, y despertar de inmediato al consumidor local.
+    - Reclamar trabajos de forma atómica ('find_one_and_update'), de modo que varios workers o réplicas pueden
+      consumir el mismo outbox sin ejecutar un trabajo dos veces a la vez. Un trabajo reclamado tiene un
+      arrendamiento ('locked_until'); si el worker muere, otro lo reclama al vencer.
+    - Limitar la concurrencia por worker ('JOB_CONCURRENCY') y el tiempo de cada ejecución ('JOB_LEASE_SECONDS').
+    - Reintentar los trabajos fallidos con backoff exponencial con jitter, y moverlos a la colección
+      'job_dead_letter' al agotar 'JOB_MAX_ATTEMPTS' (o si no existe un manejador para su tipo). Los intentos se
+      cuentan al reclamar, de modo que un trabajo que bloquea o termina su worker (y se reclama al vencer el
+      arrendamiento) también agota sus intentos.
+
+Notas:
+    - La entrega es "al menos una vez": los manejadores deben ser idempotentes.
+    - Los trabajos completados se eliminan del outbox.
+"""
+
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from pymongo import ReturnDocument
+from app import config
+from app.db.mongodb import CONSISTENCY_DEFAULT, get_collection
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+
+class JobQueue:
+    """
+    Cola de trabajos respaldada por un outbox en MongoDB.
+
+    Args:
+        outbox: Colección de Motor con los trabajos pendientes.
+        dead_letter: Colección de Motor para los trabajos descartados.
+    """
+
+    def __init__(self, outbox, dead_letter):
+        self.outbox = outbox
+        self.dead_letter = dead_letter
+        self.handlers = {}
+        self._wakeups = asyncio.Queue()
+        self._in_flight = set()
+
+    def handler(self, job_type: str):
+        """
+        Decorador para registrar el manejador asíncrono `handler(payload)` de un tipo de trabajo.
+        """
+        def decorator(function):
+            self.handlers[job_type] = function
+            return function
+
+        return decorator
+
+    async def ensure_indexes(self):
+        await self.outbox.create_index([("status", 1), ("run_at", 1)])
+        await self.outbox.create_index([("status", 1), ("locked_until", 1)])
+
+    async def enqueue(self, job_type: str, payload: dict):
+        """
+        Guarda un trabajo en el outbox y despierta al consumidor local.
+
+        Returns:
+            ObjectId: ID del trabajo.
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.outbox.insert_one({
+            "type": job_type,
+            "payload": payload,
+            "status": STATUS_PENDING,
+            "attempts": 0,
+            "run_at": now,
+            "created_at": now,
+        })
+        self._wakeups.put_nowait(result.inserted_id)
+        return result.inserted_id
+
+    async def _claim(self, job_id=None):
+        """
+        Reclama un trabajo (el indicado, o el siguiente vencido) marcándolo como en ejecución y contando el intento.
+        """
+        now = datetime.now(timezone.utc)
+        due = {"$or": [
+            {"status": STATUS_PENDING, "run_at": {"$lte": now}},
+            {"status": STATUS_RUNNING, "locked_until": {"$lt": now}},
+        ]}
+        query = {"_id": job_id, **due} if job_id is not None else due
+        return await self.outbox.find_one_and_update(
+            query,
+            {"$set": {"status": STATUS_RUNNING, "locked_until": now + timedelta(seconds=config.JOB_LEASE_SECONDS)},
+             "$inc": {"attempts": 1}},
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(config.JOB_BACKOFF_MAX_SECONDS, config.JOB_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _process(self, job: dict):
+        try:
+            await self._execute(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Error al actualizar el outbox: el trabajo se reclamará de nuevo al vencer su arrendamiento.
+            logger.exception("Error al actualizar el estado del trabajo", extra={"job_id": str(job["_id"])})
+
+    async def _execute(self, job: dict):
+        if job["attempts"] > config.JOB_MAX_ATTEMPTS:
+            # Los intentos anteriores no terminaron (el arrendamiento venció): no volver a ejecutarlo.
+            await self._dead_letter(job, job["attempts"] - 1, "LeaseExpired: el trabajo no terminó en su arrendamiento")
+            return
+        handler = self.handlers.get(job["type"])
+        try:
+            if handler is None:
+                raise LookupError(f"No hay un manejador registrado para '{job['type']}'")
+            await asyncio.wait_for(handler(job["payload"]), timeout=config.JOB_LEASE_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            await self._fail(job, error, retry=handler is not None)
+            return
+        await self.outbox.delete_one({"_id": job["_id"]})
+
+    async def _fail(self, job: dict, error: Exception, retry: bool):
+        attempts = job["attempts"]
+        last_error = f"{type(error).__name__}: {error}"
+
+        if retry and attempts < config.JOB_MAX_ATTEMPTS:
+            run_at = datetime.now(timezone.utc) + timedelta(seconds=self._backoff(attempts))
+            await self.outbox.update_one(
+                {"_id": job["_id"]},
+                {"$set": {"status": STATUS_PENDING, "run_at": run_at, "last_error": last_error},
+                 "$unset": {"locked_until": ""}}
+            )
+            logger.warning(
+                "Trabajo fallido; se reintentará",
+                extra={"job_id": str(job["_id"]), "job_type": job["type"], "attempts": attempts, "error": last_error}
+            )
+            return
+
+        await self._dead_letter(job, attempts, last_error)
+
+    async def _dead_letter(self, job: dict, attempts: int, last_error: str):
+        await self.dead_letter.insert_one({
+            **{key: value for key, value in job.items() if key not in ("status", "locked_until")},
+            "attempts": attempts,
+            "last_error": last_error,
+            "failed_at": datetime.now(timezone.utc),
+        })
+        await self.outbox.delete_one({"_id": job["_id"]})
+        logger.error(
+            "Trabajo movido a la cola de descartados",
+            extra={"job_id": str(job["_id"]), "job_type": job["type"], "attempts": attempts, "error": last_error}
+        )
+
+    async def run(self):
+        """
+        Consume trabajos indefinidamente, con a lo sumo `JOB_CONCURRENCY` ejecuciones simultáneas.
+        """
+        try:
+            await self.ensure_indexes()
+        except Exception:
+            logger.exception("No se pudieron crear los índices de 'job_outbox'")
+
+        slots = asyncio.Semaphore(config.JOB_CONCURRENCY)
+        backlog = True
+        while True:
+            await slots.acquire()
+            try:
+                if backlog:
+                    job_id = self._wakeups.get_nowait() if not self._wakeups.empty() else None
+                else:
+                    try:
+                        job_id = await asyncio.wait_for(self._wakeups.get(), config.JOB_POLL_INTERVAL_SECONDS)
+                    except asyncio.TimeoutError:
+                        job_id = None
+                job = await self._claim(job_id)
+                if job is None and job_id is not None:
+                    # Otro worker lo reclamó primero; buscar cualquier otro trabajo vencido.
+                    job = await self._claim()
+                backlog = job is not None
+            except asyncio.CancelledError:
+                slots.release()
+                raise
+            except Exception:
+                logger.exception("Error al reclamar trabajos del outbox")
+                slots.release()
+                backlog = False
+                await asyncio.sleep(config.JOB_POLL_INTERVAL_SECONDS)
+                continue
+
+            if job is None:
+                slots.release()
+                continue
+
+            task = asyncio.create_task(self._process(job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def shutdown(self, timeout: float = None):
+        """
+        Espera (hasta `timeout` segundos) a los trabajos en ejecución; los no terminados se reclamarán al vencer
+        su arrendamiento.
+        """
+        if self._in_flight:
+            await asyncio.wait(self._in_flight, timeout=timeout or config.JOB_SHUTDOWN_TIMEOUT_SECONDS)
+
+# Cola compartida por la aplicación.
+job_queue = JobQueue(
+    get_collection("job_outbox", CONSISTENCY_DEFAULT),
+    get_collection("job_dead_letter", CONSISTENCY_DEFAULT)
+)
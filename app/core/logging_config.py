@@ -0,0 +1,168 @@
+"""
+Subsistema de logging estructurado y no bloqueante.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/logging_config.py' y se inicializa desde 'app/main.py' con `setup_logging()`.
+
+Responsabilidades:
+    - Emitir registros en formato JSON (una línea por registro) con marca de tiempo, nivel, logger, mensaje,
+      ID de la solicitud ('app.core.request_context') y los campos adicionales pasados en `extra`.
+    - Desacoplar la escritura del event loop: los registros se encolan ('QueueHandler') y un hilo en segundo
+      plano ('QueueListener') hace el formateo JSON y la E/S. Si la cola se llena, los registros se descartan
+      (y se cuentan) en lugar de bloquear la solicitud.
+    - Muestrear los eventos DEBUG de alto volumen ('LOG_DEBUG_SAMPLE_RATE') antes de encolarlos.
+
+Uso:
+    >>> import logging
+    >>> logger = logging.getLogger(__name__)
+    >>> logger.info("Usuario registrado", extra={"user_id": user_id})
+"""
+
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+import orjson
+from app import config
+from app.core.request_context import get_request_id
+
+# Atributos estándar de 'LogRecord'; el resto se considera campo adicional (`extra`).
+_STANDARD_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_listener = None
+_queue_handler = None
+_stream_handler = None
+_fork_hook_registered = False
+
+class RequestIdFilter(logging.Filter):
+    """
+    Agrega el ID de la solicitud en curso al registro. Se ejecuta en el hilo que emite el log,
+    donde la variable de contexto tiene el valor correcto.
+    """
+
+    def filter(self, record):
+        record.request_id = get_request_id()
+        return True
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Conserva solo una fracción (`rate`) de los registros DEBUG; los demás niveles pasan siempre.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatea cada registro como un objeto JSON en una sola línea.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode("utf-8")
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    'QueueHandler' que nunca bloquea: si la cola está llena, descarta el registro y lo contabiliza en `dropped`.
+    """
+
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+    def prepare(self, record):
+        # Conservar 'exc_info' como texto y fusionar 'args' en el mensaje antes de cruzar de hilo.
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+def setup_logging():
+    """
+    Configura el logger raíz con el pipeline no bloqueante y arranca el hilo de escritura.
+
+    Es idempotente: llamadas sucesivas no agregan handlers adicionales. Tras `shutdown_logging` vuelve a instalar
+    el pipeline (por ejemplo, en un segundo ciclo de vida de la aplicación dentro del mismo proceso).
+    """
+    global _listener, _queue_handler, _stream_handler, _fork_hook_registered
+    if _listener is not None:
+        return
+
+    log_queue = queue.Queue(maxsize=config.LOG_QUEUE_MAX_SIZE)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if config.LOG_JSON:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"))
+
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(DebugSamplingFilter(config.LOG_DEBUG_SAMPLE_RATE))
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.setLevel(config.LOG_LEVEL)
+    root.addHandler(queue_handler)
+
+    _queue_handler = queue_handler
+    _stream_handler = stream_handler
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    # Los hilos no sobreviven a 'fork': con la aplicación precargada en gunicorn cada worker necesita su
+    # propia cola y su propio hilo de escritura.
+    if not _fork_hook_registered:
+        os.register_at_fork(after_in_child=_restart_after_fork)
+        _fork_hook_registered = True
+
+def _restart_after_fork():
+    global _listener
+    if _listener is None:
+        return
+    log_queue = queue.Queue(maxsize=config.LOG_QUEUE_MAX_SIZE)
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, _stream_handler, respect_handler_level=True)
+    _listener.start()
+
+def shutdown_logging():
+    """
+    Retira el handler de la cola del logger raíz y detiene el hilo de escritura tras vaciarla (se invoca al
+    apagar la aplicación). Los registros posteriores ya no se encolan sin consumidor; `setup_logging` puede
+    volver a instalar el pipeline.
+    """
+    global _listener, _queue_handler, _stream_handler
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    _listener = None
+    _queue_handler = None
+    _stream_handler = None
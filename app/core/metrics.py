@@ -0,0 +1,196 @@
+"""
+Módulo de Métricas Prometheus.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/metrics.py' y centraliza la definición de las métricas de la aplicación.
+
+Responsabilidades:
+    - Definir histogramas de latencia y contadores de solicitudes/errores por plantilla de ruta y método HTTP.
+    - Definir gauges de solicitudes en curso, uso del pool de conexiones de MongoDB y saturación del
+      pool de hilos (executor) donde se ejecutan las rutas síncronas.
+    - Definir contadores del registro de auditoría (eventos escritos y descartados).
+    - Renderizar las métricas en el formato de texto de Prometheus para el endpoint '/metrics'.
+
+Multiproceso:
+    - Cuando se ejecutan varios workers de uvicorn, se debe definir la variable de entorno
+      'PROMETHEUS_MULTIPROC_DIR' (un directorio vacío y escribible) antes de iniciar los procesos.
+      'prometheus_client' almacena entonces los valores en archivos mmap por proceso y `render_metrics`
+      los agrega mediante 'MultiProcessCollector', de modo que cualquier worker que atienda '/metrics'
+      reporta el total.
+    - Al finalizar un worker debe invocarse `mark_process_dead(pid)` para descartar sus gauges "live".
+
+Notas:
+    - Registrar una observación cuesta unos pocos microsegundos (un incremento por contador y una búsqueda
+      de bucket en el histograma); las etiquetas usan la plantilla de ruta (p. ej. '/users/{id}') para
+      acotar la cardinalidad.
+"""
+
+import asyncio
+import os
+from anyio import to_thread
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from pymongo import monitoring
+from app import config
+
+# Modo multiproceso activo si 'prometheus_client' encontró el directorio compartido.
+MULTIPROCESS_ENABLED = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# Los buckets se fijan al crear los histogramas, por lo que importar este módulo construye la configuración.
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de las solicitudes HTTP en segundos.",
+    ["method", "route"],
+    buckets=config.METRICS_LATENCY_BUCKETS
+)
+STAGE_DURATION = Histogram(
+    "http_request_stage_duration_seconds",
+    "Duración de las etapas de una solicitud (validación, base de datos, hashing, JWT) en segundos.",
+    ["stage"],
+    buckets=config.METRICS_LATENCY_BUCKETS
+)
+REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "Total de solicitudes HTTP procesadas.",
+    ["method", "route", "status"]
+)
+REQUEST_ERRORS_TOTAL = Counter(
+    "http_request_errors_total",
+    "Total de solicitudes HTTP que terminaron en error (5xx o excepción).",
+    ["method", "route"]
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Solicitudes HTTP en curso.",
+    multiprocess_mode="livesum"
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "mongodb_pool_connections_checked_out",
+    "Conexiones del pool de MongoDB actualmente en uso.",
+    multiprocess_mode="livesum"
+)
+MONGO_POOL_OPEN = Gauge(
+    "mongodb_pool_connections_open",
+    "Conexiones del pool de MongoDB abiertas.",
+    multiprocess_mode="livesum"
+)
+EXECUTOR_THREADS_BUSY = Gauge(
+    "executor_threads_busy",
+    "Hilos del pool de trabajo (rutas síncronas) ocupados.",
+    multiprocess_mode="livesum"
+)
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    "executor_queue_depth",
+    "Tareas esperando un hilo libre en el pool de trabajo.",
+    multiprocess_mode="livesum"
+)
+AUDIT_EVENTS_WRITTEN = Counter(
+    "audit_events_written_total",
+    "Eventos de auditoría guardados en MongoDB."
+)
+AUDIT_EVENTS_DROPPED = Counter(
+    "audit_events_dropped_total",
+    "Eventos de auditoría descartados (búfer lleno o error de escritura).",
+    ["reason"]
+)
+AUDIT_BUFFER_SIZE = Gauge(
+    "audit_buffer_size",
+    "Eventos de auditoría en el búfer en memoria pendientes de escritura.",
+    multiprocess_mode="livesum"
+)
+AVAILABILITY_CHECKS = Counter(
+    "availability_checks_total",
+    "Consultas de disponibilidad por campo y resultado (filtered: resuelta por el filtro de Bloom).",
+    ["field", "result"]
+)
+
+class MongoPoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Listener de eventos del pool de conexiones de PyMongo que actualiza los gauges de uso del pool.
+
+    Se registra en el cliente de Motor (ver 'app/db/mongodb.py').
+    """
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        MONGO_POOL_OPEN.inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        MONGO_POOL_OPEN.dec()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        pass
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CHECKED_OUT.inc()
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_CHECKED_OUT.dec()
+
+def sample_executor_metrics():
+    """
+    Actualiza los gauges del pool de hilos a partir del limitador por defecto de AnyIO.
+
+    Debe llamarse desde el event loop (el limitador pertenece al loop en ejecución).
+    """
+    statistics = to_thread.current_default_thread_limiter().statistics()
+    EXECUTOR_THREADS_BUSY.set(statistics.borrowed_tokens)
+    EXECUTOR_QUEUE_DEPTH.set(statistics.tasks_waiting)
+
+async def run_executor_sampler(interval: float = None):
+    """
+    Tarea en segundo plano que muestrea periódicamente la saturación del pool de hilos.
+
+    Args:
+        interval (float, optional): Segundos entre muestras. Por defecto 'METRICS_SAMPLE_INTERVAL_SECONDS'.
+    """
+    interval = interval or config.METRICS_SAMPLE_INTERVAL_SECONDS
+    while True:
+        sample_executor_metrics()
+        await asyncio.sleep(interval)
+
+def render_metrics() -> tuple:
+    """
+    Genera la exposición de métricas en formato de texto de Prometheus.
+
+    Returns:
+        tuple: (contenido en bytes, content-type).
+    """
+    if MULTIPROCESS_ENABLED:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def mark_process_dead(pid: int):
+    """
+    Descarta los valores "live" de un worker finalizado (solo en modo multiproceso).
+    """
+    if MULTIPROCESS_ENABLED:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,227 @@
+"""
+Perfilador por muestreo bajo demanda para workers en ejecución.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/profiler.py' y es utilizado por 'app/routers/debug_routes.py',
+      'ProfilerMiddleware' ('app/middlewares/profiler_middleware.py') y el manejador de señal instalado en 'app/main.py'.
+
+Responsabilidades:
+    - Muestrear periódicamente, desde un hilo dedicado, las pilas de todos los hilos del worker
+      ('sys._current_frames'), incluido el hilo del event loop con la corrutina en ejecución.
+    - Muestrear, desde el propio event loop, las pilas de las tareas de asyncio que están esperando (await),
+      para ver en qué se quedan bloqueadas las solicitudes.
+    - Exportar el resultado como pilas colapsadas (formato de flamegraph.pl / speedscope) o como JSON de speedscope.
+
+Notas:
+    - Todo está desactivado por defecto: sin perfil activo no hay hilo, tarea ni costo alguno.
+    - Solo se permite un perfil a la vez por worker (`ProfilerBusyError`).
+    - El costo durante el muestreo es proporcional al número de hilos y tareas; con el intervalo por defecto
+      (5 ms) es bajo, pero no nulo, por lo que los perfiles deben ser cortos.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from app import config
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+class ProfilerBusyError(Exception):
+    """Se lanza cuando ya hay un perfil en curso en este worker."""
+
+def _frame_key(frame):
+    code = frame.f_code
+    return (code.co_name, code.co_filename, code.co_firstlineno)
+
+def _stack_from_frame(frame) -> tuple:
+    """Retorna la pila desde la raíz hasta la hoja como tupla de (función, archivo, línea)."""
+    stack = []
+    while frame is not None:
+        stack.append(_frame_key(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+class ProfileResult:
+    """
+    Resultado de un perfil: conteo de muestras por (raíz, pila).
+
+    Args:
+        samples (Counter): (raíz, pila) → número de muestras. La raíz identifica el hilo o la tarea.
+        interval (float): Intervalo de muestreo en segundos.
+        duration (float): Duración real del perfil en segundos.
+    """
+
+    def __init__(self, samples: Counter, interval: float, duration: float):
+        self.samples = samples
+        self.interval = interval
+        self.duration = duration
+
+    def collapsed(self) -> str:
+        """
+        Exporta en formato de pilas colapsadas: 'raíz;archivo:función;... conteo' por línea.
+        """
+        lines = []
+        for (root, stack), count in self.samples.most_common():
+            frames = ";".join(f"{os.path.basename(filename)}:{name}" for name, filename, _ in stack)
+            lines.append(f"{root};{frames} {count}" if frames else f"{root} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str = "user-service-api") -> dict:
+        """
+        Exporta en el formato JSON de speedscope (un perfil "sampled" por hilo/tarea raíz).
+        """
+        frames = []
+        frame_index = {}
+
+        def index_of(frame):
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                function, filename, line = frame
+                frames.append({"name": function, "file": filename, "line": line})
+            return frame_index[frame]
+
+        profiles = {}
+        for (root, stack), count in self.samples.items():
+            profile = profiles.setdefault(root, {"samples": [], "weights": []})
+            profile["samples"].append([index_of(frame) for frame in stack])
+            profile["weights"].append(count * self.interval)
+
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": root,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(profile["weights"]),
+                    "samples": profile["samples"],
+                    "weights": profile["weights"],
+                }
+                for root, profile in profiles.items()
+            ],
+        }
+
+class SamplingProfiler:
+    """
+    Perfilador por muestreo de hilos y tareas de asyncio.
+
+    Uso:
+        >>> profiler = SamplingProfiler(interval=0.005)
+        >>> profiler.start(loop)
+        >>> ...
+        >>> result = profiler.stop()
+    """
+
+    _lock = threading.Lock()
+    _active = False
+
+    def __init__(self, interval: float = None, sample_tasks: bool = True):
+        self.interval = interval or config.PROFILER_INTERVAL_SECONDS
+        self.sample_tasks = sample_tasks
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._task = None
+        self._started_at = None
+
+    def start(self, loop: asyncio.AbstractEventLoop = None):
+        with SamplingProfiler._lock:
+            if SamplingProfiler._active:
+                raise ProfilerBusyError()
+            SamplingProfiler._active = True
+
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_threads, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        if self.sample_tasks and loop is not None:
+            self._task = loop.create_task(self._sample_asyncio_tasks())
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and not self._stop_event.is_set()
+
+    def stop(self) -> ProfileResult:
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._thread is not None:
+            self._thread.join()
+        duration = time.perf_counter() - self._started_at
+        with SamplingProfiler._lock:
+            SamplingProfiler._active = False
+        return ProfileResult(self.samples, self.interval, duration)
+
+    def _sample_threads(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                root = f"thread:{thread_names.get(thread_id, thread_id)}"
+                self.samples[(root, _stack_from_frame(frame))] += 1
+
+    async def _sample_asyncio_tasks(self):
+        current = asyncio.current_task()
+        while not self._stop_event.is_set():
+            for task in asyncio.all_tasks():
+                if task is current or task.done():
+                    continue
+                stack = tuple(_frame_key(frame) for frame in task.get_stack())
+                coro = task.get_coro()
+                root = f"task:{getattr(coro, '__qualname__', task.get_name())}"
+                self.samples[(root, stack)] += 1
+            await asyncio.sleep(self.interval)
+
+async def profile_for(seconds: float, interval: float = None) -> ProfileResult:
+    """
+    Perfila el worker actual durante `seconds` segundos sin bloquear el event loop.
+
+    Raises:
+        ProfilerBusyError: Si ya hay un perfil en curso.
+    """
+    profiler = SamplingProfiler(interval=interval)
+    profiler.start(asyncio.get_running_loop())
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        result = profiler.stop()
+    return result
+
+def write_profile(result: ProfileResult, prefix: str = "profile") -> str:
+    """
+    Escribe el perfil en formato speedscope en 'PROFILER_OUTPUT_DIR' y retorna la ruta del archivo.
+    """
+    os.makedirs(config.PROFILER_OUTPUT_DIR, exist_ok=True)
+    path = os.path.join(config.PROFILER_OUTPUT_DIR, f"{prefix}-{os.getpid()}-{int(time.time() * 1000)}.speedscope.json")
+    with open(path, "w") as profile_file:
+        json.dump(result.speedscope(), profile_file)
+    return path
+
+def install_signal_handler(loop: asyncio.AbstractEventLoop, signum: int = None):
+    """
+    Instala un manejador de señal (por defecto SIGUSR2) que perfila el worker durante
+    'PROFILER_SIGNAL_SECONDS' y guarda el resultado con `write_profile`.
+
+    Uso:
+        >>> kill -USR2 <pid del worker>
+    """
+    signum = signum or signal.SIGUSR2
+
+    async def _profile_and_write():
+        try:
+            result = await profile_for(config.PROFILER_SIGNAL_SECONDS)
+        except ProfilerBusyError:
+            return
+        write_profile(result, prefix="signal")
+
+    loop.add_signal_handler(signum, lambda: loop.create_task(_profile_and_write()))
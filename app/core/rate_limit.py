@@ -0,0 +1,294 @@
+"""
+Subsistema de Limitación de Tasa (rate limiting).
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/rate_limit.py'. Las rutas lo utilizan mediante la dependencia
+      `rate_limit(...)`, que se resuelve antes de ejecutar el endpoint (y por lo tanto antes de cualquier hash
+      bcrypt o consulta a la base de datos).
+
+Algoritmo:
+    - Ventana deslizante aproximada (sliding window counter): para cada clave se guardan los conteos de la
+      ventana actual y de la anterior, y se estima el uso como
+      `anterior * (1 - fracción transcurrida) + actual`. Cada verificación es O(1) en tiempo y memoria.
+
+Backends:
+    - `InMemoryRateLimitBackend` (por defecto): diccionarios particionados (shards) por hash de la clave, con
+      expiración periódica de una partición por ciclo para no recorrer todo el estado de una vez. Los límites
+      son por worker.
+    - `MongoRateLimitBackend`: contadores compartidos en la colección 'rate_limits' (con índice TTL), para
+      despliegues con varias réplicas o workers que deben compartir los límites.
+
+Reglas:
+    - Por IP, por identificador de cuenta (email/username del cuerpo) y global, configurables como
+      "<solicitudes>/<segundos>" (ver 'RATE_LIMIT_*' en 'app/config.py').
+    - Ambos backends aplican la misma semántica: una solicitud se cuenta en todas sus reglas solo si ninguna se
+      excede, y las solicitudes rechazadas no consumen cupo. El backend en memoria evalúa y cuenta sin puntos de
+      suspensión; el de MongoDB incrementa cada contador de forma atómica, decide con el valor resultante y
+      revierte los incrementos si rechaza.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from fastapi import HTTPException, Request
+from pymongo import ReturnDocument
+from app import config
+
+logger = logging.getLogger(__name__)
+
+class RateLimitRule:
+    """
+    Regla de límite: `limit` solicitudes por ventana de `window` segundos.
+    """
+
+    __slots__ = ("limit", "window")
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+
+    @classmethod
+    def parse(cls, value: str):
+        """
+        Interpreta una regla "<solicitudes>/<segundos>" (por ejemplo "10/60"). Retorna None si está vacía u "off".
+        """
+        if not value or value.lower() == "off":
+            return None
+        limit, window = value.split("/")
+        return cls(int(limit), float(window))
+
+def _sliding_count(previous: int, current: int, elapsed_fraction: float) -> float:
+    return previous * (1.0 - elapsed_fraction) + current
+
+class InMemoryRateLimitBackend:
+    """
+    Backend en memoria particionado. Cada entrada es [índice de ventana, conteo actual, conteo anterior, ventana].
+
+    Args:
+        shards (int): Número de particiones.
+    """
+
+    def __init__(self, shards: int = 64):
+        self.shards = [dict() for _ in range(shards)]
+        self._next_shard_to_expire = 0
+
+    def _shard(self, key: str) -> dict:
+        return self.shards[hash(key) % len(self.shards)]
+
+    def _entry(self, key: str, rule: RateLimitRule, now: float) -> list:
+        shard = self._shard(key)
+        window_index = int(now // rule.window)
+        entry = shard.get(key)
+
+        if entry is None:
+            entry = [window_index, 0, 0, rule.window]
+            shard[key] = entry
+        elif entry[0] != window_index:
+            # Avanzar la ventana: la actual pasa a ser la anterior (o se descarta si hubo un salto mayor).
+            entry[2] = entry[1] if entry[0] == window_index - 1 else 0
+            entry[1] = 0
+            entry[0] = window_index
+        return entry
+
+    async def hit(self, checks: list, now: float) -> tuple:
+        """
+        Registra una solicitud en todas las reglas de `checks` [(clave, regla), ...] si ninguna se excede.
+
+        Returns:
+            tuple: (permitido, segundos hasta reintentar).
+        """
+        # Sin puntos de suspensión: la evaluación y el conteo son atómicos dentro del worker.
+        entries = [(self._entry(key, rule, now), rule) for key, rule in checks]
+        for entry, rule in entries:
+            elapsed_fraction = (now % rule.window) / rule.window
+            if _sliding_count(entry[2], entry[1], elapsed_fraction) + 1 > rule.limit:
+                return False, _retry_after(entry[2], entry[1], rule, now)
+
+        for entry, _ in entries:
+            entry[1] += 1
+        return True, 0
+
+    def expire_step(self, now: float = None):
+        """
+        Elimina de una partición las entradas inactivas durante más de dos ventanas.
+        """
+        now = now or time.time()
+        shard = self.shards[self._next_shard_to_expire]
+        self._next_shard_to_expire = (self._next_shard_to_expire + 1) % len(self.shards)
+        expired = [key for key, entry in shard.items() if entry[0] < int(now // entry[3]) - 1]
+        for key in expired:
+            del shard[key]
+
+    async def run_maintenance(self, interval: float = None):
+        """
+        Tarea en segundo plano que expira las particiones de forma incremental.
+        """
+        interval = interval or config.RATE_LIMIT_EXPIRY_INTERVAL_SECONDS
+        while True:
+            self.expire_step()
+            await asyncio.sleep(interval / len(self.shards))
+
+class MongoRateLimitBackend:
+    """
+    Backend compartido en MongoDB: un documento por (clave, ventana) con '$inc' atómico e índice TTL.
+
+    Args:
+        collection: Colección de Motor donde se guardan los contadores.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def run_maintenance(self):
+        """
+        Crea el índice TTL que elimina los contadores vencidos (MongoDB se encarga de la expiración).
+        """
+        try:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        except Exception:
+            logger.exception("No se pudo crear el índice TTL de 'rate_limits'")
+
+    async def hit(self, checks: list, now: float) -> tuple:
+        """
+        Registra una solicitud en todas las reglas de `checks` [(clave, regla), ...] si ninguna se excede.
+
+        Cada contador de la ventana actual se incrementa de forma atómica ('find_one_and_update' con '$inc') y
+        la decisión se toma con el valor posterior al incremento, de modo que solicitudes concurrentes (de este
+        u otros workers) nunca pasan todas con el mismo conteo. Si alguna regla se excede, los incrementos ya
+        aplicados se revierten ('$inc' de -1). Las ventanas anteriores ya no cambian y se leen en una sola
+        consulta.
+
+        Mientras dura una solicitud rechazada, su incremento (aún no revertido) puede hacer que otra concurrente
+        también se rechace: el error es siempre hacia rechazar de más, nunca hacia superar el límite.
+
+        Returns:
+            tuple: (permitido, segundos hasta reintentar).
+        """
+        windows = []
+        for key, rule in checks:
+            window_index = int(now // rule.window)
+            windows.append((f"{key}:{window_index}", f"{key}:{window_index - 1}", window_index, rule))
+
+        previous_counts = {document["_id"]: document["count"] async for document in self.collection.find(
+            {"_id": {"$in": [previous_id for _, previous_id, _, _ in windows]}}, {"count": 1}
+        )}
+
+        incremented = []
+        for current_id, previous_id, window_index, rule in windows:
+            document = await self.collection.find_one_and_update(
+                {"_id": current_id},
+                {"$inc": {"count": 1}, "$setOnInsert": {
+                    "expires_at": datetime.fromtimestamp((window_index + 2) * rule.window, timezone.utc)
+                }},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            incremented.append(current_id)
+            previous, current = previous_counts.get(previous_id, 0), document["count"] - 1
+            elapsed_fraction = (now % rule.window) / rule.window
+            if _sliding_count(previous, current, elapsed_fraction) + 1 > rule.limit:
+                await self.collection.update_many({"_id": {"$in": incremented}}, {"$inc": {"count": -1}})
+                return False, _retry_after(previous, current, rule, now)
+        return True, 0
+
+def _retry_after(previous: int, current: int, rule: RateLimitRule, now: float) -> int:
+    """
+    Estima los segundos hasta que la regla vuelva a admitir una solicitud.
+    """
+    elapsed = now % rule.window
+    if previous > 0 and current + 1 <= rule.limit:
+        # Esperar a que el peso de la ventana anterior decaiga lo suficiente.
+        needed_fraction = 1.0 - (rule.limit - current - 1) / previous
+        return max(1, math.ceil(needed_fraction * rule.window - elapsed))
+    return max(1, math.ceil(rule.window - elapsed))
+
+class RateLimiter:
+    """
+    Aplica varias reglas (por IP, por cuenta y global) sobre un backend.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def check(self, checks: list) -> tuple:
+        """
+        Evalúa una lista de (clave, regla) y, si ninguna regla se excede, cuenta la solicitud en todas.
+
+        Returns:
+            tuple: (permitido, segundos hasta reintentar de la primera regla excedida).
+        """
+        if not checks:
+            return True, 0
+        return await self.backend.hit(checks, time.time())
+
+def _build_backend():
+    if config.RATE_LIMIT_BACKEND == "mongo":
+        from app.db.mongodb import CONSISTENCY_DEFAULT, get_collection
+
+        return MongoRateLimitBackend(get_collection("rate_limits", CONSISTENCY_DEFAULT))
+    return InMemoryRateLimitBackend(config.RATE_LIMIT_SHARDS)
+
+# Limitador compartido por la aplicación (uno por worker).
+limiter = RateLimiter(_build_backend())
+
+async def _account_identifier(request: Request, fields: tuple):
+    try:
+        body = await request.json()
+    except Exception:
+        return None
+    if not isinstance(body, dict):
+        return None
+    for field in fields:
+        value = body.get(field)
+        if isinstance(value, str) and value:
+            return f"{field}:{value.strip().lower()}"
+    return None
+
+def rate_limit(name: str, per_ip: str, per_account: str, global_limit: str, account_fields: tuple = ("email", "username"),
+               exempt=None):
+    """
+    Crea una dependencia de FastAPI que aplica los límites de `name` y responde 429 al excederlos.
+
+    Args:
+        name (str): Nombre del endpoint (prefijo de las claves).
+        per_ip (str): Regla por dirección IP ("<solicitudes>/<segundos>").
+        per_account (str): Regla por identificador de cuenta tomado del cuerpo JSON.
+        global_limit (str): Regla global para el endpoint.
+        account_fields (tuple): Campos del cuerpo que identifican la cuenta, en orden de preferencia.
+        exempt: Función asíncrona opcional `exempt(request) -> bool`; si retorna True la solicitud no se limita
+            ni se cuenta (por ejemplo, la reproducción de una respuesta ya guardada).
+    """
+    ip_rule = RateLimitRule.parse(per_ip)
+    account_rule = RateLimitRule.parse(per_account)
+    global_rule = RateLimitRule.parse(global_limit)
+
+    async def dependency(request: Request):
+        if not config.RATE_LIMIT_ENABLED:
+            return
+        if exempt is not None and await exempt(request):
+            return
+
+        # De lo más específico a lo más general: el 'Retry-After' corresponde a la regla más específica excedida.
+        # Una solicitud rechazada no consume cupo en ninguna regla (tampoco en la global).
+        checks = []
+        if account_rule is not None:
+            account = await _account_identifier(request, account_fields)
+            if account is not None:
+                checks.append((f"{name}:account:{account}", account_rule))
+        if ip_rule is not None:
+            client_host = request.client.host if request.client else "unknown"
+            checks.append((f"{name}:ip:{client_host}", ip_rule))
+        if global_rule is not None:
+            checks.append((f"{name}:global", global_rule))
+
+        allowed, retry_after = await limiter.check(checks)
+        if not allowed:
+            raise HTTPException(
+                status_code=429,
+                detail="Demasiadas solicitudes. Intenta de nuevo más tarde.",
+                headers={"Retry-After": str(retry_after)}
+            )
+
+    return dependency
@@ -0,0 +1,25 @@
+"""
+Contexto por solicitud basado en 'contextvars'.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/request_context.py'.
+
+Responsabilidades:
+    - Mantener el ID de la solicitud en curso ('X-Request-ID') en una variable de contexto, de modo que
+      cualquier función (servicios, logging, métricas) pueda leerlo sin recibirlo como parámetro.
+
+Notas:
+    - Las variables de contexto se copian a cada tarea de asyncio y a los hilos de 'run_in_threadpool',
+      por lo que el valor se propaga a todo el procesamiento de la solicitud.
+"""
+
+from contextvars import ContextVar
+
+# ID de la solicitud en curso; "-" fuera de una solicitud HTTP.
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+def get_request_id() -> str:
+    """
+    Retorna el ID de la solicitud en curso ("-" si no hay ninguna).
+    """
+    return request_id_var.get()
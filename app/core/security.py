@@ -32,6 +32,7 @@ Notas:
 
 import bcrypt
 import base64
+from app.core import server_timing
 
 # Código de prueba para evaluar el número óptimo de rounds (comentado).
 # import time
@@ -44,6 +45,7 @@ import base64
 #     end = time.time()
 #     print(f'Rounds:{i} | Time: {end - start:.4f} s')
 
+@server_timing.timed(server_timing.STAGE_HASH)
 def hash_password(password):
     """
     Hashea una contraseña en texto plano utilizando bcrypt y codifica el resultado en Base64.
@@ -64,6 +66,7 @@ def hash_password(password):
     # Codificar el hash en Base64 antes de retornarlo
     return base64.b64encode(hashed).decode('utf-8')
 
+@server_timing.timed(server_timing.STAGE_HASH)
 def verify_password(password, hashed_base64):
     """
     Verifica que una contraseña en texto plano coincida con un hash previamente generado y codificado en Base64.
@@ -0,0 +1,88 @@
+"""
+Temporizadores de etapas por solicitud para el encabezado 'Server-Timing'.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/core/server_timing.py' y es utilizado por los servicios, 'app/core/auth.py',
+      'app/core/security.py' y por 'ServerTimingMiddleware' ('app/middlewares/main_middleware.py').
+
+Responsabilidades:
+    - Acumular, en una variable de contexto, la duración de las etapas de cada solicitud (validación, base de
+      datos, hashing, JWT, etc.).
+    - Proveer un gestor de contexto (`stage`) y un decorador (`timed`) de bajo costo: fuera de una solicitud
+      (p. ej. en scripts o pruebas) no registran nada.
+
+Notas:
+    - El middleware crea un diccionario nuevo por solicitud y lo publica en `stages_var`. Las etapas mutan
+      ese mismo diccionario, por lo que los tiempos medidos en hilos del threadpool (que reciben una copia
+      del contexto) también se reflejan en la respuesta.
+    - Si una misma etapa se ejecuta varias veces en la solicitud, sus duraciones se suman.
+"""
+
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Duraciones acumuladas (segundos) por etapa para la solicitud en curso; None fuera de una solicitud.
+stages_var: ContextVar = ContextVar("server_timing_stages", default=None)
+
+# Nombres de etapa utilizados por la aplicación.
+STAGE_VALIDATION = "validation"
+STAGE_DB = "db"
+STAGE_HASH = "hash"
+STAGE_JWT = "jwt"
+
+def _record(name: str, duration: float):
+    stages = stages_var.get()
+    if stages is not None:
+        stages[name] = stages.get(name, 0.0) + duration
+
+@contextmanager
+def stage(name: str):
+    """
+    Mide el bloque de código como la etapa `name` de la solicitud en curso.
+
+    Ejemplo:
+        >>> with server_timing.stage(server_timing.STAGE_DB):
+        ...     user = await db["user"].find_one(...)
+    """
+    if stages_var.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+def timed(name: str):
+    """
+    Decorador que mide cada llamada de la función (síncrona o asíncrona) como la etapa `name`.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def format_server_timing(stages: dict, total: float = None) -> str:
+    """
+    Construye el valor del encabezado 'Server-Timing' (duraciones en milisegundos).
+
+    Ejemplo de salida:
+        'validation;dur=0.412, db;dur=3.105, hash;dur=980.220, jwt;dur=1.874, total;dur=986.001'
+    """
+    parts = [f"{name};dur={duration * 1000:.3f}" for name, duration in stages.items()]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.3f}")
+    return ", ".join(parts)
@@ -16,6 +16,15 @@ Estructura:
     - Se obtiene el objeto de la base de datos a partir del nombre definido en la configuración.
     - Se define la colección 'users' para almacenar documentos relacionados con los usuarios.
     - La función 'check_connection' es asíncrona y envía un comando 'ping' a la base de datos para verificar que la conexión esté operativa.
+    - La función 'get_collection' retorna una colección configurada según las necesidades de consistencia de cada
+      operación (preferencia de lectura, 'maxStalenessSeconds' y read/write concern):
+        • CONSISTENCY_STRONG: primario con read/write concern "majority" (registro y verificación de duplicados).
+        • CONSISTENCY_PROFILE y CONSISTENCY_LISTING: lecturas que toleran datos algo antiguos; se dirigen según
+          'MONGO_STALE_READ_PREFERENCE' (por defecto, secundarios) con su propio presupuesto de antigüedad.
+        • CONSISTENCY_DEFAULT: fijo en el primario, con los read/write concern del cliente; no es configurable.
+          Lo usan las colecciones de coordinación entre workers ('job_outbox', 'idempotency_keys', 'rate_limits'),
+          que nunca deben leer de un secundario, el registro de auditoría ('audit_log') y las escrituras de
+          actividad de 'user'. Las lecturas que admiten secundarios usan los perfiles anteriores.
 
 Notas:
     - Es fundamental que el archivo '.env' esté correctamente configurado y que 'app/config.py' contenga los valores necesarios para la conexión a MongoDB.
@@ -23,11 +32,16 @@ Notas:
     - El uso de Motor permite aprovechar el modelo asíncrono de FastAPI para manejar múltiples solicitudes concurrentes de manera eficiente.
 """
 
+from functools import lru_cache
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import WriteConcern, read_preferences
+from pymongo.read_concern import ReadConcern
 from app import config
+from app.core.metrics import MongoPoolMetricsListener
 
 # Crear el cliente asíncrono para MongoDB utilizando la URI definida en la configuración.
-client = AsyncIOMotorClient(config.MONGO_URI)
+# El listener del pool alimenta los gauges de uso de conexiones expuestos en '/metrics'.
+client = AsyncIOMotorClient(config.MONGO_URI, event_listeners=[MongoPoolMetricsListener()])
 
 # Seleccionar la base de datos utilizando el nombre especificado en la configuración.
 db = client[config.MONGO_DB]
@@ -36,6 +50,60 @@ db = client[config.MONGO_DB]
 collection_name = "users"
 collection = db[collection_name]
 
+# Perfiles de consistencia por operación (ver `get_collection`).
+CONSISTENCY_DEFAULT = "default"
+CONSISTENCY_STRONG = "strong"
+CONSISTENCY_PROFILE = "profile"
+CONSISTENCY_LISTING = "listing"
+
+_READ_PREFERENCES = {
+    "primary": read_preferences.Primary,
+    "primarypreferred": read_preferences.PrimaryPreferred,
+    "secondary": read_preferences.Secondary,
+    "secondarypreferred": read_preferences.SecondaryPreferred,
+    "nearest": read_preferences.Nearest,
+}
+
+def _read_preference(mode: str, max_staleness_seconds: int):
+    read_preference = _READ_PREFERENCES[mode.lower()]
+    if read_preference is read_preferences.Primary:
+        # 'maxStalenessSeconds' no aplica al primario.
+        return read_preference()
+    return read_preference(max_staleness=max_staleness_seconds)
+
+def _consistency_options(consistency: str) -> dict:
+    if consistency == CONSISTENCY_STRONG:
+        return {
+            "read_preference": read_preferences.Primary(),
+            "read_concern": ReadConcern("majority"),
+            "write_concern": WriteConcern("majority"),
+        }
+    if consistency == CONSISTENCY_PROFILE:
+        return {"read_preference": _read_preference(
+            config.MONGO_STALE_READ_PREFERENCE, config.MONGO_PROFILE_MAX_STALENESS_SECONDS
+        )}
+    if consistency == CONSISTENCY_LISTING:
+        return {"read_preference": _read_preference(
+            config.MONGO_STALE_READ_PREFERENCE, config.MONGO_LISTING_MAX_STALENESS_SECONDS
+        )}
+    if consistency == CONSISTENCY_DEFAULT:
+        return {"read_preference": read_preferences.Primary()}
+    raise ValueError(f"Perfil de consistencia desconocido: {consistency}")
+
+@lru_cache(maxsize=None)
+def get_collection(name: str, consistency: str = CONSISTENCY_DEFAULT):
+    """
+    Retorna la colección `name` con las opciones del perfil de consistencia indicado (cacheada por perfil).
+
+    Args:
+        name (str): Nombre de la colección.
+        consistency (str): Uno de los perfiles `CONSISTENCY_*`.
+
+    Returns:
+        AsyncIOMotorCollection: Colección con la preferencia de lectura y los read/write concern del perfil.
+    """
+    return db[name].with_options(**_consistency_options(consistency))
+
 async def check_connection():
     """
     Verifica la conexión a MongoDB enviando un comando 'ping'.
@@ -30,26 +30,143 @@ Ejemplo de uso:
 Notas:
     - La configuración de la aplicación (nombre, versión y descripción) se obtiene del módulo 'app/config.py'.
     - El middleware añade el encabezado 'X-Process-Time' en cada respuesta para facilitar la monitorización del rendimiento.
+    - Las métricas Prometheus se exponen en '/metrics' (ver 'app/core/metrics.py').
+    - La clase de respuesta por defecto es 'FastJSONResponse' ('app/utils/responses.py'), que serializa con orjson.
     - Se han importado e incluido routers organizados por funcionalidad, permitiendo una mejor escalabilidad y claridad en la gestión de endpoints.
     - La importación de 'auth_middleware' se ha eliminado en este ejemplo, pero se podrá reintroducir en futuras versiones si se requiere funcionalidad adicional de autenticación a nivel de middleware.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app import config
-from app.routers import main_routes, auth_routes, users_routes
-from app.middlewares import main_middleware  # Se omite 'auth_middleware' por no utilizarse actualmente.
+from app.core import activity, audit, availability, health, idempotency, jobs, metrics, rate_limit
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core import profiler
+from app.services import post_registration_service, user_service
+from app.routers import main_routes, auth_routes, users_routes, debug_routes
+from app.middlewares.main_middleware import ProcessTimeMiddleware, RequestIDMiddleware, ServerTimingMiddleware  # Se omite 'auth_middleware' por no utilizarse actualmente.
+from app.middlewares.compression_middleware import CompressionMiddleware
+from app.middlewares.metrics_middleware import MetricsMiddleware
+from app.middlewares.profiler_middleware import ProfilerMiddleware
+from app.utils.responses import FastJSONResponse
+
+# Configuración del logging estructurado (JSON) con escritura en un hilo en segundo plano.
+setup_logging()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ciclo de vida de la aplicación: inicia y detiene las tareas en segundo plano del worker.
+    """
+    # Reinstala el logging si un ciclo de vida anterior lo detuvo (idempotente).
+    setup_logging()
+
+    background_tasks = []
+    # Prober de readiness: '/readyz' se responde desde su último resultado, sin E/S por sondeo.
+    background_tasks.append(asyncio.create_task(health.run_prober()))
+    if config.RATE_LIMIT_ENABLED:
+        # Expiración incremental de los contadores en memoria (o índice TTL en el backend MongoDB).
+        background_tasks.append(asyncio.create_task(rate_limit.limiter.backend.run_maintenance()))
+    if config.IDEMPOTENCY_ENABLED:
+        # Índice TTL de las respuestas guardadas por 'Idempotency-Key'.
+        background_tasks.append(asyncio.create_task(idempotency.store.ensure_indexes()))
+    # Índices únicos de 'username' y 'email' de la colección 'user'.
+    background_tasks.append(asyncio.create_task(user_service.ensure_indexes()))
+    if config.JOBS_ENABLED:
+        # Consumidor de la cola de trabajos en segundo plano (outbox 'job_outbox').
+        background_tasks.append(asyncio.create_task(jobs.job_queue.run()))
+        # Barrido de usuarios cuyo trabajo 'user.registered' no llegó a guardarse en el outbox.
+        background_tasks.append(asyncio.create_task(post_registration_service.run_sweeper()))
+    if config.AUDIT_ENABLED:
+        # Escritura por lotes del registro de auditoría (colección limitada 'audit_log').
+        background_tasks.append(asyncio.create_task(audit.audit_log.run()))
+    if config.ACTIVITY_TRACKING_ENABLED:
+        # Escritura periódica y coalescida de 'last_login'/'last_activity_at' ('bulk_write').
+        background_tasks.append(asyncio.create_task(activity.activity_tracker.run()))
+    if config.AVAILABILITY_ENABLED:
+        # Filtros de Bloom de usernames y emails para 'GET /auth/availability' (construcción y actualización).
+        background_tasks.append(asyncio.create_task(availability.availability_index.run()))
+    if config.METRICS_ENABLED:
+        # Muestreo periódico de la saturación del pool de hilos para '/metrics'.
+        background_tasks.append(asyncio.create_task(metrics.run_executor_sampler()))
+    if config.PROFILER_SIGNAL_ENABLED:
+        # 'kill -USR2 <pid>' perfila este worker y guarda el resultado en 'PROFILER_OUTPUT_DIR'.
+        profiler.install_signal_handler(asyncio.get_running_loop())
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    # Esperar a que las tareas terminen de cancelarse antes de los vaciados finales, para que ninguna escriba en
+    # paralelo con ellos (por ejemplo, un lote de auditoría a medio escribir).
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
+    # Dar tiempo a los trabajos en ejecución; los no terminados se reclamarán al vencer su arrendamiento.
+    await jobs.job_queue.shutdown()
+
+    # Escribir las marcas de actividad y los eventos de auditoría pendientes.
+    if config.ACTIVITY_TRACKING_ENABLED:
+        await activity.activity_tracker.flush()
+    if config.AUDIT_ENABLED:
+        await audit.audit_log.flush_all()
+
+    # Vaciar la cola de logging antes de terminar el worker.
+    shutdown_logging()
 
 # Inicialización de la instancia de FastAPI con parámetros de configuración.
 app = FastAPI(
+    lifespan=lifespan,
     title=config.APP_NAME,
     version=config.APP_VERSION,
-    description="API para la gestión de usuarios, autenticación y endpoints generales."
+    description="API para la gestión de usuarios, autenticación y endpoints generales.",
+    # Serialización con orjson y codificadores nativos para ObjectId, datetime y AnyUrl.
+    default_response_class=FastJSONResponse
 )
 
 # Configuración del middleware para añadir el tiempo de procesamiento de la solicitud.
 # Este middleware añade un encabezado HTTP 'X-Process-Time' en cada respuesta,
 # facilitando la monitorización y optimización del rendimiento.
-app.middleware("http")(main_middleware.add_process_time_header)
+# Todos los middlewares son ASGI puros (sin 'BaseHTTPMiddleware') para no penalizar cada solicitud.
+app.add_middleware(ProcessTimeMiddleware)
+
+# Configuración del middleware 'Server-Timing' (desglose de validación, base de datos, hashing y JWT).
+# Las duraciones por etapa se exportan al histograma 'http_request_stage_duration_seconds'; la cabecera solo se
+# envía a las redes de 'SERVER_TIMING_TRUSTED_NETWORKS' o con un 'X-Admin-Token' válido.
+if config.SERVER_TIMING_ENABLED:
+    app.add_middleware(
+        ServerTimingMiddleware,
+        stage_histogram=metrics.STAGE_DURATION if config.METRICS_ENABLED else None,
+        trusted_networks=config.SERVER_TIMING_TRUSTED_NETWORKS
+    )
+
+# Configuración del middleware de compresión (gzip, brotli o zstd según 'Accept-Encoding').
+# Solo comprime respuestas textuales a partir de 'COMPRESSION_MIN_SIZE' bytes, incluidas las respuestas en streaming.
+if config.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=config.COMPRESSION_MIN_SIZE,
+        encodings=config.COMPRESSION_ENCODINGS,
+        levels={
+            "gzip": config.COMPRESSION_GZIP_LEVEL,
+            "br": config.COMPRESSION_BROTLI_QUALITY,
+            "zstd": config.COMPRESSION_ZSTD_LEVEL
+        }
+    )
+
+# Configuración del middleware de métricas Prometheus (latencia, solicitudes y errores por ruta y método).
+# Se agrega al final para que sea el más externo y mida la solicitud completa; se exponen en '/metrics'.
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Configuración del middleware de perfilado por solicitud ('X-Profile: 1' + 'X-Admin-Token').
+# Solo se registra si hay un token de administración configurado, por lo que no cuesta nada por defecto.
+if config.PROFILER_ADMIN_TOKEN:
+    app.add_middleware(ProfilerMiddleware)
+
+# Configuración del middleware de ID de solicitud ('X-Request-ID'), el más externo para que el ID
+# esté disponible (vía 'app.core.request_context') durante todo el procesamiento.
+app.add_middleware(RequestIDMiddleware)
 
 # Inclusión del router principal.
 # Este router gestiona los endpoints básicos y generales de la aplicación, ubicados en 'app/routers/main.py'.
@@ -63,3 +180,6 @@ app.include_router(auth_routes.router, prefix="/auth", tags=["Autenticación"])
 # Inclusión del router de gestión de usuarios.
 # Este router proporciona funcionalidades para la administración y gestión de usuarios, ubicado en 'app/routers/users.py'.
 app.include_router(users_routes.router, prefix="/users", tags=["Usuarios"])
+
+# Inclusión del router de diagnóstico (perfilador bajo demanda), protegido con 'X-Admin-Token'.
+app.include_router(debug_routes.router, tags=["Diagnóstico"])
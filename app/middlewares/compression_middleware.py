@@ -0,0 +1,224 @@
+"""
+Middleware ASGI de compresión de respuestas (gzip, brotli y zstd).
+
+Negocia la codificación a partir del encabezado 'Accept-Encoding' y comprime únicamente las respuestas
+de tipos textuales (JSON, NDJSON, texto, etc.) cuyo tamaño alcanza 'COMPRESSION_MIN_SIZE'. Las respuestas
+pequeñas o que ya traen 'Content-Encoding' se envían sin modificar, de modo que no se gasta CPU en ellas.
+
+Las respuestas en streaming se comprimen fragmento a fragmento: se acumulan los primeros fragmentos hasta
+alcanzar el tamaño mínimo y, a partir de ahí, cada fragmento se comprime y se vacía (flush) de inmediato
+para no retrasar su entrega al cliente.
+
+Las dependencias 'brotli' y 'zstandard' son opcionales: si no están instaladas, esas codificaciones
+simplemente no se ofrecen y se usa gzip.
+"""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependencia opcional
+    zstandard = None
+
+# Tipos de contenido que vale la pena comprimir.
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+class _GzipCompressor:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+class _BrotliCompressor:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+class _ZstdCompressor:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+def _available_compressors():
+    compressors = {"gzip": _GzipCompressor}
+    if brotli is not None:
+        compressors["br"] = _BrotliCompressor
+    if zstandard is not None:
+        compressors["zstd"] = _ZstdCompressor
+    return compressors
+
+def parse_accept_encoding(header: str) -> dict:
+    """
+    Interpreta el encabezado 'Accept-Encoding' y retorna un diccionario codificación → peso (q).
+
+    Las codificaciones con q=0 se excluyen.
+    """
+    accepted = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted[token] = q
+    return accepted
+
+def _is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";")[0].strip().lower()
+    return content_type.startswith("text/") or content_type.endswith("+json") or content_type in COMPRESSIBLE_CONTENT_TYPES
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime las respuestas según la codificación negociada con el cliente.
+
+    Args:
+        app: Aplicación ASGI a envolver.
+        minimum_size (int): Tamaño mínimo en bytes para comprimir una respuesta.
+        encodings (list[str]): Codificaciones en orden de preferencia del servidor ("zstd", "br", "gzip").
+        levels (dict): Nivel de compresión por codificación.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, encodings=("zstd", "br", "gzip"), levels: dict = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        available = _available_compressors()
+        self.encodings = [encoding for encoding in encodings if encoding in available]
+        self.compressors = available
+        self.levels = {"gzip": 6, "br": 4, "zstd": 3, **(levels or {})}
+
+    def select_encoding(self, accept_encoding: str):
+        """Selecciona la codificación con mayor peso q; a igual peso, la preferida por el servidor."""
+        accepted = parse_accept_encoding(accept_encoding)
+        if not accepted:
+            return None
+        best, best_q = None, 0.0
+        wildcard_q = accepted.get("*", 0.0)
+        for encoding in self.encodings:
+            q = accepted.get(encoding, wildcard_q)
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        encoding = self.select_encoding(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+class _CompressionResponder:
+    """Estado de compresión de una única respuesta."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream_send = send
+        self.start_message = None
+        self.compressor = None
+        self.passthrough = False
+        self.buffer = []
+        self.buffered_size = 0
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = {name.lower(): value for name, value in message.get("headers", [])}
+            content_type = headers.get(b"content-type", b"").decode("latin-1")
+            if b"content-encoding" in headers or not _is_compressible(content_type):
+                self.passthrough = True
+                await self.downstream_send(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.downstream_send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            # Acumular hasta decidir si la respuesta alcanza el tamaño mínimo.
+            if body:
+                self.buffer.append(body)
+                self.buffered_size += len(body)
+            if self.buffered_size < self.middleware.minimum_size:
+                if more_body:
+                    return
+                # Respuesta completa y pequeña: se envía sin comprimir.
+                await self.downstream_send(self.start_message)
+                await self.downstream_send({"type": "http.response.body", "body": b"".join(self.buffer), "more_body": False})
+                return
+
+            encoding = self.encoding
+            self.compressor = self.middleware.compressors[encoding](self.middleware.levels[encoding])
+            body = b"".join(self.buffer)
+            self.buffer = []
+
+            headers = [
+                (name, value) for name, value in self.start_message.get("headers", [])
+                if name.lower() != b"content-length"
+            ]
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+            headers.append((b"vary", b"Accept-Encoding"))
+
+            if not more_body:
+                # Con el cuerpo completo disponible se envía con la longitud comprimida exacta.
+                data = self.compressor.compress(body) + self.compressor.finish()
+                headers.append((b"content-length", str(len(data)).encode("latin-1")))
+                await self.downstream_send({**self.start_message, "headers": headers})
+                await self.downstream_send({"type": "http.response.body", "body": data, "more_body": False})
+                return
+
+            await self.downstream_send({**self.start_message, "headers": headers})
+
+        data = self.compressor.compress(body) if body else b""
+        if not more_body:
+            data += self.compressor.finish()
+        await self.downstream_send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -1,34 +1,148 @@
 """
-Middleware para medir y añadir el tiempo de procesamiento a cada solicitud HTTP.
+Middlewares ASGI puros de la aplicación.
 
-Este middleware calcula el tiempo que tarda en procesarse una solicitud y
-agrega este valor en la cabecera "X-Process-Time" de la respuesta.
+- `ProcessTimeMiddleware`: mide el tiempo que tarda en procesarse una solicitud y lo agrega en la
+  cabecera "X-Process-Time" de la respuesta.
+- `RequestIDMiddleware`: asigna a cada solicitud un ID (reutilizando 'X-Request-ID' si el cliente lo envía),
+  lo publica en 'app.core.request_context' y lo devuelve en la cabecera "X-Request-ID".
+- `ServerTimingMiddleware`: publica un acumulador de etapas por solicitud ('app.core.server_timing'),
+  lo exporta como métrica por etapa y emite el desglose en la cabecera estándar "Server-Timing" solo para
+  clientes de confianza (las duraciones de hash/JWT/base de datos permitirían enumerar cuentas por tiempos).
+
+Se implementan como middlewares ASGI puros en lugar de '@app.middleware("http")' para evitar el
+'BaseHTTPMiddleware' de Starlette, que crea tareas y flujos intermedios en cada solicitud y rompe
+las respuestas en streaming.
 """
 
+import ipaddress
+import re
 import time
-from fastapi import Request
+import uuid
+from app.core import server_timing
+from app.core.admin import is_valid_admin_token
+from app.core.request_context import request_id_var
+
+# IDs de solicitud aceptados desde el cliente (evita inyectar valores arbitrarios en logs y cabeceras).
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
 
-async def add_process_time_header(request: Request, call_next):
+class ProcessTimeMiddleware:
     """
     Middleware que mide el tiempo de procesamiento de la solicitud.
 
-    Args:
-        request (Request): La solicitud entrante.
-        call_next (Callable): Función que procesa la siguiente etapa del middleware.
+    El tiempo (en segundos) se calcula hasta que la aplicación inicia la respuesta y se añade en la
+    cabecera "X-Process-Time".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Registrar el tiempo inicial antes de procesar la solicitud.
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # Calcular el tiempo de procesamiento y añadirlo en la cabecera de la respuesta.
+                process_time = time.perf_counter() - start_time
+                message["headers"] = [*message.get("headers", []), (b"x-process-time", str(process_time).encode("latin-1"))]
+            await send(message)
 
-    Returns:
-        Response: La respuesta HTTP con una cabecera adicional que indica el tiempo de procesamiento.
+        await self.app(scope, receive, send_wrapper)
+
+class RequestIDMiddleware:
+    """
+    Middleware que asigna y propaga el ID de la solicitud ("X-Request-ID").
     """
-    # Registrar el tiempo inicial antes de procesar la solicitud.
-    start_time = time.perf_counter()
-    
-    # Procesar la solicitud y obtener la respuesta.
-    response = await call_next(request)
-    
-    # Calcular el tiempo de procesamiento.
-    process_time = time.perf_counter() - start_time
-    
-    # Añadir el tiempo de procesamiento en la cabecera de la respuesta.
-    response.headers["X-Process-Time"] = str(process_time)
-    
-    return response
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _REQUEST_ID_PATTERN.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+        token = request_id_var.set(request_id)
+        encoded_request_id = request_id.encode("latin-1")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", encoded_request_id)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
+class ServerTimingMiddleware:
+    """
+    Middleware que mide la duración de cada etapa de la solicitud y la emite en la cabecera "Server-Timing"
+    para los clientes de confianza.
+
+    Un cliente es de confianza si su IP pertenece a `trusted_networks` o si envía un 'X-Admin-Token' válido.
+    Las métricas por etapa se registran para todas las solicitudes.
+
+    Args:
+        app: Aplicación ASGI a envolver.
+        stage_histogram: Histograma Prometheus con etiqueta "stage" donde exportar las duraciones (opcional).
+        trusted_networks (list): IPs o redes CIDR autorizadas a recibir la cabecera (por ejemplo, "10.0.0.0/8").
+    """
+
+    def __init__(self, app, stage_histogram=None, trusted_networks=()):
+        self.app = app
+        self.stage_histogram = stage_histogram
+        self.trusted_networks = tuple(ipaddress.ip_network(network, strict=False) for network in trusted_networks)
+
+    def _is_trusted(self, scope) -> bool:
+        client = scope.get("client")
+        if client and self.trusted_networks:
+            try:
+                address = ipaddress.ip_address(client[0])
+            except ValueError:
+                address = None
+            if address is not None and any(address in network for network in self.trusted_networks):
+                return True
+        for name, value in scope["headers"]:
+            if name == b"x-admin-token":
+                return is_valid_admin_token(value.decode("latin-1"))
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stages = {}
+        token = server_timing.stages_var.set(stages)
+        start_time = time.perf_counter()
+
+        trusted = self._is_trusted(scope)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and trusted:
+                header = server_timing.format_server_timing(stages, time.perf_counter() - start_time)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", header.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            server_timing.stages_var.reset(token)
+            if self.stage_histogram is not None:
+                for name, duration in stages.items():
+                    self.stage_histogram.labels(name).observe(duration)
@@ -0,0 +1,55 @@
+"""
+Middleware ASGI que registra las métricas Prometheus de cada solicitud HTTP.
+
+Mide la latencia y cuenta solicitudes y errores por plantilla de ruta (p. ej. '/users/{id}') y método.
+La plantilla se obtiene de 'scope["route"]', que FastAPI completa al resolver la ruta; las solicitudes
+que no coinciden con ninguna ruta se agrupan bajo '<unmatched>' para acotar la cardinalidad.
+"""
+
+import time
+from app.core import metrics
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI de métricas.
+
+    Args:
+        app: Aplicación ASGI a envolver.
+        excluded_paths (tuple): Rutas que no se miden (por ejemplo, el propio '/metrics').
+    """
+
+    def __init__(self, app, excluded_paths=("/metrics",)):
+        self.app = app
+        self.excluded_paths = frozenset(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.REQUESTS_IN_PROGRESS.inc()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+            metrics.REQUESTS_IN_PROGRESS.dec()
+
+            route = scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+
+            metrics.REQUEST_LATENCY.labels(method, route_path).observe(duration)
+            metrics.REQUESTS_TOTAL.labels(method, route_path, str(status_code)).inc()
+            if status_code >= 500:
+                metrics.REQUEST_ERRORS_TOTAL.labels(method, route_path).inc()
@@ -0,0 +1,63 @@
+"""
+Middleware ASGI de perfilado por solicitud (opt-in).
+
+Si la solicitud incluye 'X-Profile: 1' junto con un 'X-Admin-Token' válido, se perfila el worker mientras
+dura la solicitud y el resultado (JSON de speedscope) se guarda en 'PROFILER_OUTPUT_DIR'. El nombre del
+archivo se devuelve en la cabecera 'X-Profile-File'.
+
+Solo se registra cuando 'PROFILER_ADMIN_TOKEN' está configurado; para el resto de solicitudes el costo es
+una búsqueda de cabecera.
+"""
+
+import asyncio
+import os
+from app.core import profiler
+from app.core.admin import is_valid_admin_token
+
+class ProfilerMiddleware:
+    """
+    Middleware ASGI que perfila las solicitudes marcadas con 'X-Profile: 1' y un token de administración válido.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if headers.get(b"x-profile") != b"1" or not is_valid_admin_token(headers.get(b"x-admin-token", b"").decode("latin-1")):
+            await self.app(scope, receive, send)
+            return
+
+        sampling_profiler = profiler.SamplingProfiler()
+        try:
+            sampling_profiler.start(asyncio.get_running_loop())
+        except profiler.ProfilerBusyError:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            # Retener el inicio de la respuesta para poder añadir 'X-Profile-File' si el cuerpo llega completo.
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is not None:
+                if not message.get("more_body", False) and sampling_profiler.is_running:
+                    path = profiler.write_profile(sampling_profiler.stop(), prefix="request")
+                    start_message["headers"] = [*start_message.get("headers", []), (b"x-profile-file", os.path.basename(path).encode("latin-1"))]
+                await send(start_message)
+                start_message = None
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Respuestas en streaming o con error: el perfil se guarda igualmente, sin cabecera.
+            if sampling_profiler.is_running:
+                profiler.write_profile(sampling_profiler.stop(), prefix="request")
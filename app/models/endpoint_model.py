@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from app.config import TIME_ZONE, PyObjectId
+from app import config
+from app.config import PyObjectId
 
 class Endpoint(BaseModel):
     """
@@ -35,11 +36,11 @@ class Endpoint(BaseModel):
         description="Descripción detallada del propósito y funcionamiento del endpoint."
     )
     created_at: datetime = Field(
-        default_factory=lambda: datetime.now(TIME_ZONE),
+        default_factory=lambda: datetime.now(config.TIME_ZONE),
         description="Fecha y hora en que se creó el endpoint."
     )
     updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(TIME_ZONE),
+        default_factory=lambda: datetime.now(config.TIME_ZONE),
         description="Fecha y hora de la última actualización del endpoint."
     )
     deleted_at: Optional[datetime] = Field(
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from app.config import TIME_ZONE, PyObjectId
+from app import config
+from app.config import PyObjectId
 
 class Role(BaseModel):
     """
@@ -34,11 +35,11 @@ class Role(BaseModel):
         description="Descripción detallada sobre el rol."
     )
     created_at: datetime = Field(
-        default_factory=lambda: datetime.now(TIME_ZONE),
+        default_factory=lambda: datetime.now(config.TIME_ZONE),
         description="Fecha y hora en que se creó el rol."
     )
     updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(TIME_ZONE),
+        default_factory=lambda: datetime.now(config.TIME_ZONE),
         description="Fecha y hora de la última actualización del rol."
     )
     deleted_at: Optional[datetime] = Field(
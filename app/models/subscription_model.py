@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from app.config import TIME_ZONE, PyObjectId
+from app import config
+from app.config import PyObjectId
 
 class Subscription(BaseModel):
     """
@@ -55,11 +56,11 @@ class Subscription(BaseModel):
         description="Fecha en que finaliza el período de vigencia de la suscripción."
     )
     created_at: datetime = Field(
-        default_factory=lambda: datetime.now(TIME_ZONE),
+        default_factory=lambda: datetime.now(config.TIME_ZONE),
         description="Fecha y hora en que se creó el registro."
     )
     updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(TIME_ZONE),
+        default_factory=lambda: datetime.now(config.TIME_ZONE),
         description="Fecha y hora de la última actualización del registro."
     )
     deleted_at: Optional[datetime] = Field(
@@ -0,0 +1,14 @@
+from enum import Enum
+
+class UserRole(str, Enum):
+    """
+    Roles base que puede tener un usuario al registrarse en el sistema.
+
+    El valor (str) es el que se almacena en MongoDB y se incluye en el JWT.
+    'admin' no puede elegirse al registrarse (ver `SELF_REGISTRATION_ROLES`); se asigna directamente en la base de datos.
+    """
+    TECHNICAL = "technical"
+    ADMIN = "admin"
+
+# Roles que un usuario puede elegir al registrarse.
+SELF_REGISTRATION_ROLES = (UserRole.TECHNICAL,)
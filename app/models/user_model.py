@@ -20,10 +20,12 @@ Notas:
       consistencia en el manejo temporal a nivel global en la aplicación.
 """
 
-from pydantic import BaseModel, Field, EmailStr, AnyUrl, PositiveInt, constr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr, AnyUrl, PositiveInt, constr
 from typing import Optional, Literal, Annotated
 from datetime import datetime
-from app.config import TIME_ZONE, PyObjectId  # Importamos PyObjectId desde app.config
+from app import config
+from app.config import PyObjectId  # Importamos PyObjectId desde app.config
+from app.models.userRoles import UserRole
 
 class User(BaseModel):
     """
@@ -60,7 +62,7 @@ class User(BaseModel):
     )
     full_name: Annotated[
         str,
-        constr(min_length=3, max_length=50, regex=r"^[a-zA-ZÀ-ÖØ-öø-ÿ\s]+$")
+        constr(min_length=3, max_length=50, pattern=r"^[a-zA-ZÀ-ÖØ-öø-ÿ\s]+$")
     ] = Field(
         ..., 
         description="Nombre completo, compuesto solo por letras y espacios."
@@ -81,16 +83,24 @@ class User(BaseModel):
         default="active", 
         description="Estado de la cuenta del usuario."
     )
+    user_role: UserRole = Field(
+        default=UserRole.TECHNICAL,
+        description="Rol del usuario en el sistema."
+    )
     last_login: Optional[datetime] = Field(
         None, 
         description="Fecha y hora del último inicio de sesión."
     )
+    last_activity_at: Optional[datetime] = Field(
+        None,
+        description="Fecha y hora del último uso de un token válido (se actualiza por lotes)."
+    )
     created_at: datetime = Field(
-        default_factory=lambda: datetime.now(TIME_ZONE), 
+        default_factory=lambda: datetime.now(config.TIME_ZONE), 
         description="Fecha y hora en que se creó el usuario."
     )
     updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(TIME_ZONE), 
+        default_factory=lambda: datetime.now(config.TIME_ZONE), 
         description="Fecha y hora de la última actualización del registro."
     )
     deleted_at: Optional[datetime] = Field(
@@ -102,8 +112,5 @@ class User(BaseModel):
         description="Indicador de eliminación lógica del usuario."
     )
 
-    class Config:
-        json_encoders = {PyObjectId: str}
-        allow_population_by_field_name = True
-        populate_by_name = True
-        from_attributes = True
+    # Los ObjectId se serializan como 'str' en modo JSON (ver `PyObjectId` en 'app/config.py').
+    model_config = ConfigDict(populate_by_name=True, from_attributes=True)
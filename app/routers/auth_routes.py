@@ -1,50 +1,138 @@
-from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
+import orjson
+from fastapi import APIRouter, Depends, Query, Request
+from app import config
+from app.utils.responses import FastJSONResponse
 from app.schemas import user_schema
-from app.core import auth
-from app.services import user_data_validator_service, user_service
+from app.core import audit, auth, idempotency
+from app.core.activity import activity_tracker
+from app.core.rate_limit import rate_limit
+from app.services import post_registration_service, user_data_validator_service, user_service
 
 router = APIRouter()
 
-@router.post("/auth/register")
+def _register_idempotency_key(request: Request):
+    """
+    Retorna la clave de almacenamiento de la cabecera 'Idempotency-Key' del registro, o None si no aplica.
+    """
+    idempotency_key = request.headers.get(idempotency.IDEMPOTENCY_HEADER)
+    if not config.IDEMPOTENCY_ENABLED or not idempotency_key:
+        return None
+    if len(idempotency_key) > config.IDEMPOTENCY_KEY_MAX_LENGTH:
+        return None
+    return f"register:{idempotency_key}"
+
+async def _is_idempotent_replay(request: Request) -> bool:
+    key = _register_idempotency_key(request)
+    return key is not None and await idempotency.store.is_known(key)
+
+# Los límites se evalúan como dependencia, antes de validar, consultar la base de datos o calcular el hash bcrypt.
+# Los reintentos con una 'Idempotency-Key' ya conocida se excluyen: reciben la respuesta guardada sin repetir el
+# registro, por lo que no deben agotar el cupo por cuenta.
+register_rate_limit = rate_limit(
+    "register",
+    per_ip=config.RATE_LIMIT_REGISTER_PER_IP,
+    per_account=config.RATE_LIMIT_REGISTER_PER_ACCOUNT,
+    global_limit=config.RATE_LIMIT_REGISTER_GLOBAL,
+    exempt=_is_idempotent_replay
+)
+login_rate_limit = rate_limit(
+    "login",
+    per_ip=config.RATE_LIMIT_LOGIN_PER_IP,
+    per_account=config.RATE_LIMIT_LOGIN_PER_ACCOUNT,
+    global_limit=config.RATE_LIMIT_LOGIN_GLOBAL
+)
+# Consulta pensada para cada pulsación del formulario de registro: límite por IP contra la enumeración de cuentas.
+availability_rate_limit = rate_limit(
+    "availability",
+    per_ip=config.RATE_LIMIT_AVAILABILITY_PER_IP,
+    per_account="off",
+    global_limit=config.RATE_LIMIT_AVAILABILITY_GLOBAL
+)
+
+@router.post("/auth/register", dependencies=[Depends(register_rate_limit)])
 async def auth_register(user: user_schema.UserCreate, request: Request):
     """
     Endpoint para registrar un usuario.
 
-    Realiza las siguientes acciones:
-    1. Valida manualmente el objeto recibido mediante `user_data_validator_service`.
+    Si la solicitud incluye la cabecera 'Idempotency-Key', el registro se ejecuta una sola vez por clave: los
+    reintentos (y las solicitudes concurrentes con la misma clave) reciben la respuesta original, con la cabecera
+    'Idempotent-Replayed: true', sin repetir la validación, la consulta de duplicados ni el hash bcrypt. El
+    'access_token' de una respuesta reproducida se emite de nuevo, ya que el original pudo haber vencido.
+
+    Args:
+        user (UserCreate): Datos del usuario a registrar.
+        request (Request): Objeto de la solicitud entrante.
+
+    Returns:
+        FastJSONResponse: Respuesta HTTP con el resultado de la operación.
+    """
+    idempotency_key = request.headers.get(idempotency.IDEMPOTENCY_HEADER)
+    if not config.IDEMPOTENCY_ENABLED or not idempotency_key:
+        return await register_user(user)
+
+    if len(idempotency_key) > config.IDEMPOTENCY_KEY_MAX_LENGTH:
+        return FastJSONResponse(
+            status_code=400,
+            content={"error": f"La cabecera '{idempotency.IDEMPOTENCY_HEADER}' es demasiado larga."}
+        )
+
+    fingerprint = idempotency.request_fingerprint(await request.body())
+    return await idempotency.store.run(
+        _register_idempotency_key(request), fingerprint, lambda: register_user(user), on_replay=_reissue_access_token
+    )
+
+def _reissue_access_token(record: dict) -> bytes:
+    """
+    Reemplaza el 'access_token' de una respuesta de registro reproducida por uno recién emitido.
+    """
+    if record["status_code"] != 201:
+        return record["body"]
+    content = orjson.loads(record["body"])
+    saved_user = content["User"]["user"]
+    content["access_token"] = auth.create_jwt({"user_id": saved_user["_id"], "user_role": saved_user["user_role"]})
+    return orjson.dumps(content)
+
+async def register_user(user: user_schema.UserCreate) -> FastJSONResponse:
+    """
+    Registra un usuario y construye la respuesta HTTP.
+
+    Realiza las siguientes acciones (tras superar los límites de tasa; si se exceden responde 429 con 'Retry-After'):
+    1. Valida los datos y construye el documento del usuario en una sola pasada mediante
+       `user_data_validator_service.validate_user_registration`.
     2. Identifica y retorna los campos inválidos en caso de error.
-    3. Verifica si el usuario ya existe en la base de datos (por email o phone_number).
+    3. Verifica si el usuario ya existe en la base de datos (por email, username o phone_number); los índices
+       únicos de 'username' y 'email' cubren los registros concurrentes con el mismo valor.
     4. Si la validación es exitosa, guarda el usuario en la base de datos.
-    5. Genera un JWT para el usuario recién creado.
-    6. Devuelve una respuesta JSON con el usuario guardado y el token de acceso.
+    5. Encola las tareas posteriores al registro ('post_registration_service').
+    6. Genera un JWT para el usuario recién creado.
+    7. Devuelve una respuesta JSON con el usuario guardado y el token de acceso.
 
     Args:
         user (UserCreate): Datos del usuario a registrar.
-        request (Request): Objeto de la solicitud entrante.
 
     Returns:
-        JSONResponse: Respuesta HTTP con el resultado de la operación.
+        FastJSONResponse: Respuesta HTTP con el resultado de la operación.
     """
-    responseMssg = user_data_validator_service.isValid_user_data(user.model_dump())
+    validation = user_data_validator_service.validate_user_registration(user.model_dump())
 
     # Verificar si hay algún campo inválido
-    invalid_fields = {key: value for key, value in responseMssg.items() if not value["isValid"]}
-    if invalid_fields:
-        # Si hay errores, devuelve un JSONResponse con HTTP 400 (Bad Request)
-        return JSONResponse(
+    if not validation["isValid"]:
+        # Si hay errores, devuelve un FastJSONResponse con HTTP 400 (Bad Request)
+        return FastJSONResponse(
             status_code=400,
             content={
                 "error": "Datos inválidos",
-                "validations": invalid_fields
+                "validations": validation["validations"]
             }
         )
     
-    # Verificar si el usuario ya existe en la base de datos (por email o phone_number)
-    existing_user = await user_service.check_user_exists(user.email, user.phone_number)
+    # Verificar si el usuario ya existe en la base de datos (por email, username o phone_number)
+    user_document = validation["document"]
+    existing_user = await user_service.check_user_exists(
+        user_document["email"], user_document["phone_number"], user_document["username"]
+    )
     if existing_user["exists"]:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=400,
             content={
                 "error": f"El {existing_user['field']} ya está registrado. Por favor, use otro."
@@ -52,30 +140,81 @@ async def auth_register(user: user_schema.UserCreate, request: Request):
         )
     
     # Guardar el usuario en la base de datos
-    saved_user = await user_service.create_user(user.model_dump())
+    saved_user = await user_service.create_user(user_document)
+    if saved_user.get("duplicate_field"):
+        # Otro registro concurrente guardó el mismo valor entre la verificación y la inserción (índice único)
+        return FastJSONResponse(
+            status_code=400,
+            content={
+                "error": f"El {saved_user['duplicate_field']} ya está registrado. Por favor, use otro."
+            }
+        )
+    if not saved_user["success"]:
+        return FastJSONResponse(
+            status_code=500,
+            content={"error": saved_user["error"], "details": saved_user["details"]}
+        )
+
+    # Registrar el evento de auditoría (se escribe en lote, en segundo plano)
+    audit.audit_log.emit(audit.ACTION_REGISTER, actor_id=saved_user["user"]["_id"])
 
-    # Convertir el usuario guardado a un formato compatible con JSON
-    json_compatible_saved_user = jsonable_encoder(saved_user)
+    # Encolar las tareas posteriores al registro (se ejecutan en segundo plano, fuera de esta solicitud)
+    await post_registration_service.enqueue_user_registered(saved_user["user"])
 
     # Generar el JWT con el ID del usuario recién creado
-    access_token = auth.create_jwt({"user_id": json_compatible_saved_user["user"]["_id"], "user_role": json_compatible_saved_user["user"]["user_role"]})
+    access_token = auth.create_jwt({"user_id": saved_user["user"]["_id"], "user_role": saved_user["user"]["user_role"]})
+    # El registro inicia la sesión del usuario: 'last_login' se escribe por lotes en segundo plano
+    activity_tracker.record_login(saved_user["user"]["_id"])
 
     # Devolver una respuesta con HTTP 201 (Created)
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=201,
         content={
             "Mensaje": "Usuario registrado exitosamente.",
-            "User": json_compatible_saved_user,
+            "User": saved_user,
             "access_token": access_token  
         }
     )
 
-@router.post("/auth/login")
+@router.post("/auth/login", dependencies=[Depends(login_rate_limit)])
 def auth_login():
     """
     Endpoint para iniciar sesión.
 
+    Aún no autentica, por lo que no registra el evento de auditoría 'auth.login': debe emitirse solo cuando exista
+    un resultado real de autenticación (éxito o fallo).
+
     Returns:
         dict: Mensaje indicando el propósito del endpoint de login.
     """
     return {"Mensaje": "Esta es el end-point para que un usuario inicie sesión"}
+
+@router.get("/auth/availability", dependencies=[Depends(availability_rate_limit)])
+async def auth_availability(username: str = Query(None), email: str = Query(None)):
+    """
+    Endpoint para verificar si un nombre de usuario y/o un correo electrónico están disponibles.
+
+    La respuesta se obtiene de los filtros de Bloom en memoria ('app/core/availability.py'); MongoDB solo se
+    consulta cuando el filtro indica un posible acierto. El resultado es orientativo: el registro vuelve a
+    verificar los duplicados.
+
+    Args:
+        username (str, optional): Nombre de usuario a verificar.
+        email (str, optional): Correo electrónico a verificar.
+
+    Returns:
+        FastJSONResponse: Por campo, el valor verificado (normalizado) y si está disponible.
+    """
+    values = {field: value for field, value in (("username", username), ("email", email)) if value is not None}
+    if not values:
+        return FastJSONResponse(status_code=400, content={"error": "Indique 'username' y/o 'email'."})
+
+    validations = user_data_validator_service.run_field_validators(values)
+    invalid_fields = {field: result for field, result in validations.items() if not result["isValid"]}
+    if invalid_fields:
+        return FastJSONResponse(status_code=400, content={"error": "Datos inválidos", "validations": invalid_fields})
+
+    availability = await user_service.check_availability(
+        {field: result["value"] for field, result in validations.items()}
+    )
+    return FastJSONResponse(status_code=200, content=availability, headers={"Cache-Control": "no-store"})
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Query, Response
+from app import config
+from app.core import profiler
+from app.core.admin import require_admin_token
+from app.utils.responses import FastJSONResponse
+
+router = APIRouter()
+
+@router.post("/debug/profile", dependencies=[Depends(require_admin_token)], include_in_schema=False)
+async def debug_profile(
+    seconds: float = Query(5, gt=0, description="Duración del perfil en segundos."),
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$", description="Formato de salida.")
+):
+    """
+    Endpoint para perfilar el worker actual durante N segundos con un perfilador por muestreo.
+
+    Incluye las pilas de los hilos y de las tareas de asyncio en espera. Requiere el encabezado
+    'X-Admin-Token' y está desactivado (404) si 'PROFILER_ADMIN_TOKEN' no está configurado.
+
+    Returns:
+        FastJSONResponse | Response: Perfil en JSON de speedscope o en pilas colapsadas (texto).
+    """
+    if seconds > config.PROFILER_MAX_SECONDS:
+        return FastJSONResponse(
+            status_code=400,
+            content={"error": f"La duración máxima del perfil es {config.PROFILER_MAX_SECONDS} segundos."}
+        )
+
+    try:
+        result = await profiler.profile_for(seconds)
+    except profiler.ProfilerBusyError:
+        return FastJSONResponse(status_code=409, content={"error": "Ya hay un perfil en curso en este worker."})
+
+    if format == "collapsed":
+        return Response(content=result.collapsed(), media_type="text/plain")
+    return FastJSONResponse(content=result.speedscope())
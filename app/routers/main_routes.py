@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
-from app.db import mongodb 
+from fastapi import APIRouter, Request, Response
+from app.core import health, metrics
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter()
 
@@ -19,7 +19,49 @@ async def ping():
     """
     Endpoint para verificar la conexión a la base de datos.
 
+    Responde desde el último resultado del prober en segundo plano ('app/core/health.py'), sin consultar
+    MongoDB en cada llamada.
+
+    Returns:
+        FastJSONResponse: Estado de la verificación de MongoDB, con HTTP 200 si es correcta o 503 si no
+        (o si el resultado no existe o está obsoleto).
+    """
+    _, state = health.get_readiness()
+    if "reason" in state:
+        return FastJSONResponse(status_code=503, content={"mongo": None, "reason": state["reason"]})
+    mongo = state["checks"]["mongo"]
+    return FastJSONResponse(status_code=200 if mongo["ok"] else 503, content={"mongo": mongo})
+
+@router.get("/healthz")
+async def healthz():
+    """
+    Endpoint de liveness: confirma que el proceso atiende solicitudes, sin E/S.
+
+    Returns:
+        dict: {"status": "ok"}.
+    """
+    return {"status": "ok"}
+
+@router.get("/readyz")
+async def readyz():
+    """
+    Endpoint de readiness servido desde el estado del prober en segundo plano ('app/core/health.py').
+
+    Returns:
+        FastJSONResponse: Estado de las verificaciones, con HTTP 200 si el worker está listo o 503 si no.
+    """
+    ready, state = health.get_readiness()
+    return FastJSONResponse(status_code=200 if ready else 503, content=state)
+
+@router.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    """
+    Endpoint de métricas en formato Prometheus.
+
+    En modo multiproceso ('PROMETHEUS_MULTIPROC_DIR') agrega los valores de todos los workers.
+
     Returns:
-        JSONResponse: Resultado de la verificación de conexión a MongoDB.
+        Response: Métricas en formato de texto de Prometheus.
     """
-    return await mongodb.check_connection()
+    content, content_type = metrics.render_metrics()
+    return Response(content=content, media_type=content_type)
@@ -1,31 +1,251 @@
-from fastapi import APIRouter, Request, Depends
-from fastapi.responses import JSONResponse
+import codecs
+import json
+from fastapi import APIRouter, Request, Depends, Query, Response
+from app import config
 from app.core import auth
+from app.models.userRoles import UserRole
+from app.schemas import user_schema
+from app.services import user_batch_validation_service, user_service
+from app.utils.etag import etag_matches
+from app.utils.field_selection import InvalidFieldSelectionError
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter()
 
-@router.get("/users/me", dependencies=[Depends(auth.validate_jwt)])
-def users_me():
+# Tipos de contenido aceptados como NDJSON (un objeto JSON por línea).
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+class BatchTooLargeError(Exception):
+    """Se lanza cuando el lote supera `config.USER_VALIDATE_BATCH_MAX_ROWS`."""
+
+# Parámetro 'fields' compartido por las lecturas de usuarios.
+FIELDS_QUERY = Query(
+    None,
+    description="Campos a retornar, separados por comas (por ejemplo 'username,email'). '_id' se incluye siempre."
+)
+
+def _invalid_fields_response(error: InvalidFieldSelectionError) -> FastJSONResponse:
+    return FastJSONResponse(
+        status_code=400,
+        content={"error": "Campos inválidos en 'fields'.", "invalid_fields": error.invalid_fields}
+    )
+
+# Tamaño máximo de un elemento del arreglo JSON pendiente de decodificar (caracteres) o de una línea NDJSON (bytes):
+# protege el búfer de lectura.
+_MAX_JSON_ROW_BYTES = 64 * 1024
+
+async def _iter_ndjson_rows(request: Request):
+    """
+    Lee el cuerpo NDJSON de forma incremental y produce un objeto por línea no vacía.
+
+    Solo se divide cada fragmento recibido (no todo lo acumulado), y la línea en curso no puede superar
+    `_MAX_JSON_ROW_BYTES`.
+
+    Raises:
+        ValueError: Si alguna línea no es JSON válido o supera el tamaño máximo.
+    """
+    partial = []  # fragmentos de la línea en curso
+    partial_size = 0
+    async for chunk in request.stream():
+        *lines, rest = chunk.split(b"\n")
+        if lines:
+            lines[0] = b"".join(partial) + lines[0]
+            partial, partial_size = [], 0
+            for line in lines:
+                if len(line) > _MAX_JSON_ROW_BYTES:
+                    raise ValueError("Línea NDJSON demasiado larga.")
+                if line.strip():
+                    yield json.loads(line)
+        if rest:
+            partial.append(rest)
+            partial_size += len(rest)
+            if partial_size > _MAX_JSON_ROW_BYTES:
+                raise ValueError("Línea NDJSON demasiado larga.")
+    line = b"".join(partial)
+    if line.strip():
+        yield json.loads(line)
+
+async def _iter_json_array_rows(request: Request):
+    """
+    Lee un arreglo JSON de forma incremental y produce cada elemento en cuanto se recibe completo, sin cargar
+    el cuerpo entero en memoria.
+
+    Raises:
+        ValueError: Si el cuerpo no es un arreglo JSON válido.
+    """
+    decoder = json.JSONDecoder()
+    # Decodificador incremental: un carácter UTF-8 puede quedar dividido entre dos fragmentos.
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    started = finished = False
+    # Un elemento solo se acepta cuando ya se recibió el separador siguiente (',' o ']'),
+    # para no decodificar un número truncado entre dos fragmentos.
+    pending = None
+
+    async for chunk in request.stream():
+        buffer = buffer[position:] + text_decoder.decode(chunk)
+        position = 0
+        while not finished:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if not started:
+                if char != "[":
+                    raise ValueError("Se esperaba un arreglo JSON.")
+                started = True
+                position += 1
+            elif pending is not None:
+                if char not in ",]":
+                    raise ValueError("Se esperaba ',' o ']'.")
+                yield pending[0]
+                pending = None
+                finished = char == "]"
+                position += 1
+            elif char == "]":
+                finished = True
+                position += 1
+            else:
+                try:
+                    row, position = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if len(buffer) - position > _MAX_JSON_ROW_BYTES:
+                        raise
+                    break  # Elemento incompleto: esperar más datos.
+                pending = (row,)
+        if finished and buffer[position:].strip():
+            raise ValueError("Contenido después del arreglo JSON.")
+
+    if not finished:
+        raise ValueError("Arreglo JSON incompleto.")
+
+async def _limit_rows(rows):
+    """
+    Produce las filas de `rows` y lanza `BatchTooLargeError` en cuanto se supera el máximo permitido.
+    """
+    count = 0
+    async for row in rows:
+        count += 1
+        if count > config.USER_VALIDATE_BATCH_MAX_ROWS:
+            raise BatchTooLargeError()
+        yield row
+
+@router.get("/users/me")
+async def users_me(request: Request, payload: dict = Depends(auth.validate_jwt), fields: str = FIELDS_QUERY):
     """
     Endpoint para obtener la información del usuario autenticado.
 
+    Soporta solicitudes condicionales: si 'If-None-Match' coincide con el ETag actual del usuario
+    (derivado de 'updated_at'), se responde '304 Not Modified' desde el sello de versión cacheado,
+    sin cargar ni serializar el documento.
+
+    El sello de versión se cachea por proceso ('user_version_cache'): `invalidate_user_version` solo limpia el
+    worker que realizó la modificación, por lo que los demás workers pueden responder 304 con el ETag anterior
+    hasta 'USER_VERSION_CACHE_TTL_SECONDS' segundos después de un cambio.
+
+    Con 'fields' solo se leen de MongoDB (y se retornan) los campos solicitados; cada selección tiene su
+    propia variante del ETag.
+
+    Args:
+        request (Request): Objeto de la solicitud entrante.
+        payload (dict): Datos del JWT validado (incluye "user_id").
+        fields (str): Campos a retornar, separados por comas (opcional).
+
     Returns:
-        dict: Mensaje indicando el propósito del endpoint.
+        FastJSONResponse | Response: Datos del usuario con encabezado 'ETag', o 304 si no cambió.
     """
-    return {"Mensaje": "Esta es el end-point para obtener la data del usuario autenticado"}
+    try:
+        selection = user_service.user_field_selector.parse(fields)
+    except InvalidFieldSelectionError as error:
+        return _invalid_fields_response(error)
+
+    user_id = payload.get("user_id", "")
+    if_none_match = request.headers.get("if-none-match")
+
+    if if_none_match:
+        etag = selection.etag(await user_service.get_user_etag(user_id))
+        if etag is not None and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
 
-@router.get("/users", dependencies=[Depends(auth.validate_jwt)])
-def users_all():
+    user = await user_service.get_user_by_id(user_id, selection.projection)
+    if user is None:
+        return FastJSONResponse(status_code=404, content={"error": "Usuario no encontrado."})
+
+    return FastJSONResponse(
+        content=selection.encode(user),
+        headers={"ETag": selection.etag(user_service.user_etag(user))}
+    )
+
+@router.get("/users", dependencies=[Depends(auth.require_role(UserRole.ADMIN))])
+async def users_all(
+    request: Request,
+    skip: int = Query(0, ge=0, description="Número de usuarios a omitir."),
+    limit: int = Query(50, ge=1, le=config.USER_LIST_MAX_LIMIT, description="Número máximo de usuarios a retornar."),
+    fields: str = FIELDS_QUERY
+):
     """
-    Endpoint para listar todos los usuarios existentes.
+    Endpoint para listar todos los usuarios existentes (paginado).
+
+    La respuesta incluye un ETag débil calculado a partir de los '_id'/'updated_at' de la página; si
+    coincide con 'If-None-Match' se responde '304 Not Modified' sin serializar el cuerpo. Con 'fields' solo
+    se leen y retornan los campos solicitados.
 
     Nota:
-        Este endpoint requiere permisos adecuados para acceder a la información.
+        Requiere el rol 'admin' (403 para el resto de usuarios autenticados): la página expone el email y el
+        teléfono de todos los usuarios.
 
     Returns:
-        dict: Mensaje indicando el propósito del endpoint.
+        FastJSONResponse | Response: Página de usuarios con encabezado 'ETag', o 304 si no cambió.
+    """
+    try:
+        selection = user_service.user_field_selector.parse(fields)
+    except InvalidFieldSelectionError as error:
+        return _invalid_fields_response(error)
+
+    page = await user_service.list_users(skip, limit, selection.projection)
+    etag = selection.etag(page["etag"])
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return FastJSONResponse(
+        content={"users": selection.encode_many(page["users"]), "skip": skip, "limit": limit},
+        headers={"ETag": etag}
+    )
+
+@router.post("/users/batch", dependencies=[Depends(auth.validate_jwt)])
+async def users_batch(lookup: user_schema.UserBatchLookup, fields: str = FIELDS_QUERY):
+    """
+    Endpoint para resolver un lote de IDs de usuario en una sola solicitud (llamadas entre servicios).
+
+    Los IDs se deduplican y se consultan con un único '$in' proyectado a los datos de presentación; la
+    respuesta conserva el orden de la entrada e indica explícitamente los IDs inválidos o inexistentes.
+
+    Como basta con un token válido, 'fields' solo admite los datos de presentación (`USER_DISPLAY_FIELDS`); los
+    datos de contacto (email, teléfono) se obtienen con el listado, restringido al rol 'admin'.
+
+    Args:
+        lookup (UserBatchLookup): Lista de IDs a resolver.
+        fields (str): Subconjunto de los datos de presentación a retornar (por defecto, todos).
+
+    Returns:
+        FastJSONResponse: {"results": [...], "found": int, "missing": int}, o 413 si se supera el máximo de IDs.
     """
-    return {"Mensaje": "Esta es el end-point para listar todos los usuarios existentes (Requiere permisos)"}
+    if len(lookup.ids) > config.USER_BATCH_MAX_IDS:
+        return FastJSONResponse(
+            status_code=413,
+            content={"error": f"El lote supera el máximo de {config.USER_BATCH_MAX_IDS} IDs."}
+        )
+
+    try:
+        selection = user_service.user_display_field_selector.parse(fields, default=user_service.user_display_selection)
+    except InvalidFieldSelectionError as error:
+        return _invalid_fields_response(error)
+
+    result = await user_service.get_users_by_ids(lookup.ids, selection)
+    return FastJSONResponse(status_code=200, content=result)
 
 @router.put("/users/{id}", dependencies=[Depends(auth.validate_jwt)])
 def users_by_id():
@@ -36,3 +256,37 @@ def users_by_id():
         dict: Mensaje indicando el propósito del endpoint.
     """
     return {"Mensaje": "Esta es el end-point para modificar/editar los datos de un usuario"}
+
+@router.post("/users/validate", dependencies=[Depends(auth.validate_jwt)])
+async def users_validate(request: Request):
+    """
+    Endpoint para validar un lote de usuarios sin registrarlos (dry-run).
+
+    Acepta un arreglo JSON o un flujo NDJSON (`Content-Type: application/x-ndjson`) con objetos
+    `UserCreate`, ambos leídos de forma incremental; el límite de filas se aplica mientras se lee el cuerpo. Aplica las reglas de 'app/utils/validations', detecta duplicados dentro del lote y
+    contra la base de datos, y no hashea contraseñas ni escribe en MongoDB.
+
+    Args:
+        request (Request): Objeto de la solicitud entrante.
+
+    Returns:
+        FastJSONResponse: Resumen del lote con códigos de error compactos por fila.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        rows = _iter_ndjson_rows(request)
+    else:
+        rows = _iter_json_array_rows(request)
+
+    try:
+        # Las filas se leen, validan y verifican contra MongoDB por bloques, sin acumular el cuerpo.
+        result = await user_batch_validation_service.validate_users_batch(_limit_rows(rows))
+    except BatchTooLargeError:
+        return FastJSONResponse(
+            status_code=413,
+            content={"error": f"El lote supera el máximo de {config.USER_VALIDATE_BATCH_MAX_ROWS} usuarios."}
+        )
+    except ValueError:
+        return FastJSONResponse(status_code=400, content={"error": "El cuerpo de la solicitud no es JSON/NDJSON válido."})
+
+    return FastJSONResponse(status_code=200, content=result)
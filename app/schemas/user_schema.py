@@ -40,3 +40,17 @@ class UserCreate(BaseModel):
             }
         }
     }
+
+class UserBatchLookup(BaseModel):
+    """
+    Esquema para la consulta de usuarios por lote de IDs ('POST /users/batch').
+    """
+    ids: list[str] = Field(..., description="IDs de los usuarios (ObjectId en formato str); se permiten repetidos.")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "ids": ["67a4d6e241b7de3dc3cfaec7", "67a4d6e241b7de3dc3cfaec8"]
+            }
+        }
+    }
@@ -0,0 +1,96 @@
+"""
+Punto de entrada del servidor de la aplicación User Service API.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/server.py' y se ejecuta con 'python -m app.server' (ver 'Dockerfile').
+
+Modos ('SERVER_MODE'):
+    - "production" (por defecto): gunicorn como gestor de procesos con workers uvicorn sobre uvloop y httptools,
+      configurado en 'gunicorn.conf.py':
+        • Número de workers calculado a partir de las CPUs disponibles (o 'WEB_CONCURRENCY').
+        • Precarga de la aplicación en el proceso maestro ('preload_app'), de modo que el código, las claves y las
+          estructuras compiladas se comparten entre workers mediante copy-on-write.
+        • Reciclaje de workers tras 'SERVER_MAX_REQUESTS' solicitudes (con desfase aleatorio).
+        • Drenaje ordenado ante SIGTERM: se dejan de aceptar conexiones y se esperan las solicitudes en curso
+          hasta 'SERVER_GRACEFUL_TIMEOUT' segundos.
+    - "development": un único proceso uvicorn con recarga automática ('--reload').
+"""
+
+import os
+import sys
+from uvicorn.workers import UvicornWorker
+from app import config
+from app.utils import breached_passwords
+
+class ProductionUvicornWorker(UvicornWorker):
+    """
+    Worker uvicorn para gunicorn que fija uvloop y httptools y el tiempo de drenaje ordenado.
+    """
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "lifespan": "on",
+        "proxy_headers": True,
+        "server_header": False,
+        "timeout_graceful_shutdown": config.SERVER_GRACEFUL_TIMEOUT,
+    }
+
+def _cgroup_cpu_limit():
+    """Límite de CPU del contenedor (cgroup v2 'cpu.max'), o None si no hay límite."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota == "max":
+            return None
+        return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        return None
+
+def available_cpus() -> int:
+    """
+    Número de CPUs utilizables por el proceso: afinidad de CPU y límite del contenedor, si existe.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    return min(cpus, limit) if limit else cpus
+
+def worker_count() -> int:
+    """
+    Número de workers: 'WEB_CONCURRENCY' si está definido; en otro caso, uno por CPU disponible.
+
+    Los workers son asíncronos, por lo que no se necesita la fórmula clásica '2 * CPU + 1'.
+    """
+    return config.WEB_CONCURRENCY or available_cpus()
+
+def warm_up():
+    """
+    Carga en el proceso maestro, antes de crear los workers, lo que conviene compartir por copy-on-write:
+    la configuración, las claves RSA (si están disponibles) y el índice de contraseñas filtradas.
+    """
+    settings = config.get_settings()
+    breached_passwords.get_index()
+    try:
+        settings.private_key
+        settings.public_key
+    except RuntimeError:
+        # Sin claves el worker arranca igualmente; '/readyz' reportará el problema.
+        pass
+
+def run_development():
+    import uvicorn
+
+    uvicorn.run("app.main:app", host=config.SERVER_HOST, port=config.SERVER_PORT, reload=True)
+
+def run_production():
+    # Reemplaza el proceso actual por gunicorn para que reciba directamente las señales (SIGTERM, SIGHUP).
+    gunicorn_conf = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gunicorn.conf.py")
+    os.execvp(sys.executable, [sys.executable, "-m", "gunicorn", "-c", gunicorn_conf, "app.main:app"])
+
+if __name__ == "__main__":
+    if config.SERVER_MODE == "development":
+        run_development()
+    else:
+        run_production()
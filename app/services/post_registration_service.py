@@ -0,0 +1,121 @@
+"""
+Servicio de Tareas Posteriores al Registro.
+
+Todo lo que sigue al registro de un usuario (notificación de bienvenida, registros de auditoría, contadores,
+procesamiento del avatar) se ejecuta fuera de la solicitud, como trabajos de la cola de 'app/core/jobs.py'.
+La ruta de registro solo llama a `enqueue_user_registered`, que guarda el trabajo en el outbox y retorna.
+
+El usuario y su trabajo se guardan en escrituras separadas, así que un fallo entre ambas (error al encolar, worker
+que termina) dejaría al usuario sin sus tareas. Para cubrirlo, 'user_service.create_user' inserta al usuario con la
+marca 'post_registration_pending', que el manejador elimina al terminar, y `run_sweeper` (iniciado por el ciclo de
+vida de la aplicación) vuelve a encolar el trabajo de los usuarios marcados hace más de
+'JOB_REGISTRATION_SWEEP_GRACE_SECONDS' que no tengan uno en 'job_outbox' ni en 'job_dead_letter'.
+
+Los manejadores deben ser idempotentes: la cola garantiza entrega "al menos una vez" (el barrido puede, además,
+encolar un duplicado si coincide con la finalización del trabajo original).
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from app import config
+from app.core.jobs import job_queue
+from app.db.mongodb import CONSISTENCY_STRONG, get_collection
+
+logger = logging.getLogger(__name__)
+
+JOB_USER_REGISTERED = "user.registered"
+
+# Marca del documento del usuario mientras sus tareas posteriores al registro no se hayan ejecutado.
+PENDING_FIELD = "post_registration_pending"
+
+# Usuarios revisados por consulta del barrido.
+_SWEEP_BATCH_SIZE = 500
+
+def _job_payload(user: dict) -> dict:
+    return {"user_id": str(user["_id"]), "email": user.get("email")}
+
+async def enqueue_user_registered(user: dict):
+    """
+    Encola las tareas posteriores al registro de `user` (documento proyectado con "_id").
+
+    Un fallo al encolar no debe hacer fallar el registro ya guardado, por lo que solo se registra el error.
+    """
+    if not config.JOBS_ENABLED:
+        return
+    try:
+        await job_queue.enqueue(JOB_USER_REGISTERED, _job_payload(user))
+    except Exception:
+        logger.exception("No se pudo encolar el trabajo posterior al registro", extra={"user_id": str(user["_id"])})
+
+@job_queue.handler(JOB_USER_REGISTERED)
+async def on_user_registered(payload: dict):
+    """
+    Punto de entrada de las tareas posteriores al registro (por ahora, solo se registra el evento).
+
+    Al terminar elimina la marca 'post_registration_pending' del usuario, para que el barrido no lo vuelva a encolar.
+    """
+    logger.info("Usuario registrado", extra={"user_id": payload["user_id"]})
+    await get_collection("user", CONSISTENCY_STRONG).update_one(
+        {"_id": ObjectId(payload["user_id"])}, {"$unset": {PENDING_FIELD: ""}}
+    )
+
+async def sweep_missing_registrations() -> int:
+    """
+    Encola el trabajo 'user.registered' de los usuarios marcados como pendientes cuyo trabajo no existe.
+
+    Solo considera usuarios creados hace más de 'JOB_REGISTRATION_SWEEP_GRACE_SECONDS' (según su '_id'), para no
+    competir con el encolado normal de la ruta de registro.
+
+    Returns:
+        int: Número de trabajos encolados.
+    """
+    users = get_collection("user", CONSISTENCY_STRONG)
+    cutoff = ObjectId.from_datetime(
+        datetime.now(timezone.utc) - timedelta(seconds=config.JOB_REGISTRATION_SWEEP_GRACE_SECONDS)
+    )
+    enqueued = 0
+    last_id = None
+    while True:
+        id_range = {"$lt": cutoff} if last_id is None else {"$lt": cutoff, "$gt": last_id}
+        batch = await users.find(
+            {PENDING_FIELD: True, "_id": id_range}, {"email": 1}
+        ).sort("_id", 1).limit(_SWEEP_BATCH_SIZE).to_list(length=None)
+        if not batch:
+            return enqueued
+        last_id = batch[-1]["_id"]
+
+        user_ids = [str(user["_id"]) for user in batch]
+        job_query = {"type": JOB_USER_REGISTERED, "payload.user_id": {"$in": user_ids}}
+        known = set()
+        for collection in (job_queue.outbox, job_queue.dead_letter):
+            async for job in collection.find(job_query, {"payload.user_id": 1}):
+                known.add(job["payload"]["user_id"])
+
+        for user in batch:
+            if str(user["_id"]) not in known:
+                await job_queue.enqueue(JOB_USER_REGISTERED, _job_payload(user))
+                enqueued += 1
+
+async def run_sweeper():
+    """
+    Tarea en segundo plano: ejecuta `sweep_missing_registrations` cada 'JOB_REGISTRATION_SWEEP_INTERVAL_SECONDS'.
+    """
+    try:
+        await get_collection("user", CONSISTENCY_STRONG).create_index(
+            [(PENDING_FIELD, 1), ("_id", 1)], partialFilterExpression={PENDING_FIELD: True}
+        )
+    except Exception:
+        logger.exception("No se pudo crear el índice de usuarios con tareas de registro pendientes")
+
+    while True:
+        try:
+            enqueued = await sweep_missing_registrations()
+            if enqueued:
+                logger.warning("Trabajos de registro faltantes encolados de nuevo", extra={"jobs": enqueued})
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error en el barrido de trabajos de registro faltantes")
+        await asyncio.sleep(config.JOB_REGISTRATION_SWEEP_INTERVAL_SECONDS)
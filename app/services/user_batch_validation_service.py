@@ -0,0 +1,152 @@
+"""
+Servicio de Validación por Lotes de Usuarios (dry-run).
+
+Permite a los integradores comprobar listas grandes de usuarios antes de importarlas, sin escribir en la
+base de datos y sin hashear contraseñas. Cada fila se valida con las mismas reglas de 'app/utils/validations'
+que utiliza el registro, y además se detectan duplicados dentro del propio lote y contra MongoDB usando una
+consulta '$in' por campo único y por bloque de filas, a medida que se lee el cuerpo.
+
+Los errores se devuelven como códigos compactos por fila y campo (ver `ERROR_*`) en lugar de los mensajes
+completos del registro, para mantener pequeña la respuesta en lotes de miles de filas.
+"""
+
+from pydantic import ValidationError
+from app import config
+from app.core import server_timing
+from app.db.mongodb import CONSISTENCY_STRONG, get_collection
+from app.models.userRoles import SELF_REGISTRATION_ROLES
+from app.schemas import user_schema
+from app.services import user_data_validator_service
+
+# Códigos de error compactos por campo.
+ERROR_REQUIRED = "required"
+ERROR_INVALID_TYPE = "invalid_type"
+ERROR_INVALID = "invalid"
+ERROR_DUPLICATE_IN_BATCH = "duplicate_in_batch"
+ERROR_ALREADY_REGISTERED = "already_registered"
+
+# Campos que deben ser únicos (los mismos que verifica 'user_service.check_user_exists').
+UNIQUE_FIELDS = ("email", "username", "phone_number")
+
+def validate_row(row) -> tuple:
+    """
+    Valida una fila individual del lote.
+
+    Args:
+        row: Objeto recibido en la fila (se espera un dict con los campos de `UserCreate`).
+
+    Returns:
+        tuple: (errores, valores_unicos) donde errores es un dict campo → código y valores_unicos
+               contiene los valores normalizados de `UNIQUE_FIELDS` que resultaron válidos.
+    """
+    try:
+        user = user_schema.UserCreate.model_validate(row)
+    except ValidationError as e:
+        errors = {}
+        for error in e.errors():
+            field = str(error["loc"][0]) if error["loc"] else "__root__"
+            errors[field] = ERROR_REQUIRED if error["type"] == "missing" else ERROR_INVALID_TYPE
+        return errors, {}
+
+    user_data = user.model_dump()
+    validations = user_data_validator_service.run_field_validators(user_data)
+
+    errors = {field: ERROR_INVALID for field, result in validations.items() if not result["isValid"]}
+    if user_data["state"] not in user_data_validator_service.USER_STATES:
+        errors["state"] = ERROR_INVALID
+    if user_data["user_role"] not in SELF_REGISTRATION_ROLES:
+        errors["user_role"] = ERROR_INVALID
+
+    unique_values = {
+        field: validations[field]["value"]
+        for field in UNIQUE_FIELDS
+        if field in validations and validations[field]["isValid"]
+    }
+    return errors, unique_values
+
+async def _mark_registered(chunk_first_rows: dict, row_errors: dict):
+    """
+    Marca como `already_registered` las filas del bloque cuyo valor único ya existe en MongoDB.
+
+    Args:
+        chunk_first_rows (dict): campo → {valor: fila} con los valores vistos por primera vez en el bloque.
+        row_errors (dict): fila → {campo: código}; se actualiza en el lugar.
+    """
+    # Una sola consulta por campo y bloque, proyectando únicamente ese campo.
+    for field, first_rows in chunk_first_rows.items():
+        if not first_rows:
+            continue
+        cursor = get_collection("user", CONSISTENCY_STRONG).find(
+            {field: {"$in": list(first_rows)}}, {field: 1, "_id": 0}
+        )
+        with server_timing.stage(server_timing.STAGE_DB):
+            documents = await cursor.to_list(length=None)
+        for document in documents:
+            index = first_rows.get(document.get(field))
+            if index is not None:
+                row_errors.setdefault(index, {})[field] = ERROR_ALREADY_REGISTERED
+
+async def validate_users_batch(rows) -> dict:
+    """
+    Valida un lote de usuarios sin escribir en la base de datos.
+
+    Las filas se consumen por bloques de 'USER_VALIDATE_BATCH_CHUNK_SIZE' a medida que llegan, de modo que solo un
+    bloque de filas está en memoria a la vez. Por cada bloque:
+    1. Valida cada fila con `validate_row` (medido como etapa "validation" de 'Server-Timing').
+    2. Marca como `duplicate_in_batch` las filas que repiten un valor único de una fila anterior (de cualquier bloque).
+    3. Ejecuta una consulta '$in' por cada campo de `UNIQUE_FIELDS` con los valores nuevos del bloque y marca como
+       `already_registered` las filas cuyo valor ya existe en MongoDB.
+
+    Args:
+        rows: Filas a validar (iterable o iterable asíncrono de dicts).
+
+    Returns:
+        dict: Diccionario con la siguiente estructura:
+            - "total": Número de filas procesadas.
+            - "valid": Número de filas sin errores.
+            - "invalid": Número de filas con errores.
+            - "errors": Lista de {"row": índice, "fields": {campo: código}} solo para las filas inválidas.
+    """
+    if not hasattr(rows, "__aiter__"):
+        rows = _as_async_iterable(rows)
+
+    row_errors = {}  # fila → {campo: código}, solo filas con errores
+    seen = {field: set() for field in UNIQUE_FIELDS}  # valores únicos ya vistos en el lote
+    chunk_first_rows = {field: {} for field in UNIQUE_FIELDS}  # campo → {valor: fila} del bloque actual
+    chunk_rows = 0
+    total = 0
+
+    async for row in rows:
+        index = total
+        total += 1
+        with server_timing.stage(server_timing.STAGE_VALIDATION):
+            errors, unique_values = validate_row(row)
+            for field, value in unique_values.items():
+                if value in seen[field]:
+                    errors[field] = ERROR_DUPLICATE_IN_BATCH
+                else:
+                    seen[field].add(value)
+                    chunk_first_rows[field][value] = index
+        if errors:
+            row_errors[index] = errors
+
+        chunk_rows += 1
+        if chunk_rows >= config.USER_VALIDATE_BATCH_CHUNK_SIZE:
+            await _mark_registered(chunk_first_rows, row_errors)
+            chunk_first_rows = {field: {} for field in UNIQUE_FIELDS}
+            chunk_rows = 0
+
+    if chunk_rows:
+        await _mark_registered(chunk_first_rows, row_errors)
+
+    errors = [{"row": index, "fields": row_errors[index]} for index in sorted(row_errors)]
+    return {
+        "total": total,
+        "valid": total - len(errors),
+        "invalid": len(errors),
+        "errors": errors
+    }
+
+async def _as_async_iterable(rows):
+    for row in rows:
+        yield row
@@ -6,35 +6,29 @@ from app.utils.validations import (
     phone_number_validator,
     avatar_validator
 )
+import logging
+from datetime import datetime
+from app import config
+from app.models.userRoles import SELF_REGISTRATION_ROLES
+from app.core import server_timing
 
-def isValid_user_data(user_data: dict) -> dict:
-    """
-    Valida los datos de un usuario según el esquema proporcionado.
+logger = logging.getLogger(__name__)
 
-    Para cada campo presente en el diccionario `user_data`, se invoca el validador correspondiente.
-    Cada validador retorna un diccionario con la siguiente estructura:
-        {
-            "isValid": bool,  # Indica si el campo es válido.
-            "message": str    # Mensaje explicativo sobre la validación.
-        }
+# Estados de cuenta permitidos (deben coincidir con el Literal de 'User.state').
+USER_STATES = ("active", "inactive", "banned")
 
-    Ejemplo de salida (cuando todos los campos son válidos):
-        {
-            'username': {'isValid': True, 'message': 'El nombre de usuario es válido.'},
-            'password': {'isValid': True, 'message': 'La contraseña es válida.'},
-            'full_name': {'isValid': True, 'message': 'El nombre completo es válido.'},
-            'email': {'isValid': True, 'message': 'El correo electrónico es válido.'},
-            'phone_number': {'isValid': True, 'message': 'El número de teléfono es válido.'},
-            'avatar_url': {'isValid': True, 'message': 'La URL de la foto de perfil es válida.'}
-        }
+def run_field_validators(user_data: dict) -> dict:
+    """
+    Ejecuta el validador correspondiente a cada campo presente en `user_data`, sin efectos secundarios.
+
+    Es el núcleo compartido por `isValid_user_data` y la validación por lotes
+    (`user_batch_validation_service`), que no debe imprimir nada por cada fila.
 
     Args:
         user_data (dict): Diccionario con los datos del usuario a validar.
 
     Returns:
-        dict: Diccionario donde cada clave corresponde a un campo del usuario y su valor es un
-              diccionario con las claves "isValid" (bool) y "message" (str) que indican el resultado
-              de la validación para ese campo.
+        dict: Resultado por campo con las claves "isValid" y "message" (y "value" si aplica).
     """
     validations = {}
 
@@ -62,7 +56,103 @@ def isValid_user_data(user_data: dict) -> dict:
     if "avatar_url" in user_data:
         validations["avatar_url"] = avatar_validator.isValid_avatar_url(user_data["avatar_url"])
 
-    # Imprimir en consola el resultado de las validaciones para depuración.
-    print("Resultado de validaciones:", validations)
+    return validations
+
+@server_timing.timed(server_timing.STAGE_VALIDATION)
+def isValid_user_data(user_data: dict) -> dict:
+    """
+    Valida los datos de un usuario según el esquema proporcionado.
+
+    Para cada campo presente en el diccionario `user_data`, se invoca el validador correspondiente.
+    Cada validador retorna un diccionario con la siguiente estructura:
+        {
+            "isValid": bool,  # Indica si el campo es válido.
+            "message": str    # Mensaje explicativo sobre la validación.
+        }
+
+    Ejemplo de salida (cuando todos los campos son válidos):
+        {
+            'username': {'isValid': True, 'message': 'El nombre de usuario es válido.'},
+            'password': {'isValid': True, 'message': 'La contraseña es válida.'},
+            'full_name': {'isValid': True, 'message': 'El nombre completo es válido.'},
+            'email': {'isValid': True, 'message': 'El correo electrónico es válido.'},
+            'phone_number': {'isValid': True, 'message': 'El número de teléfono es válido.'},
+            'avatar_url': {'isValid': True, 'message': 'La URL de la foto de perfil es válida.'}
+        }
+
+    Args:
+        user_data (dict): Diccionario con los datos del usuario a validar.
+
+    Returns:
+        dict: Diccionario donde cada clave corresponde a un campo del usuario y su valor es un
+              diccionario con las claves "isValid" (bool) y "message" (str) que indican el resultado
+              de la validación para ese campo.
+    """
+    validations = run_field_validators(user_data)
+
+    # Registrar el resultado de las validaciones para depuración (muestreado; solo "isValid" por campo).
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Resultado de validaciones",
+            extra={"validations": {field: result["isValid"] for field, result in validations.items()}}
+        )
     
     return validations
+
+
+def validate_user_registration(user_data: dict) -> dict:
+    """
+    Valida los datos de registro y construye el documento listo para MongoDB en una sola pasada.
+
+    Reemplaza la secuencia anterior (validadores individuales → modelo `User` → `model_dump`),
+    que validaba los mismos datos varias veces. Cada validador se ejecuta una única vez y su
+    valor normalizado ("value") se usa directamente para construir el documento, conservando
+    los mensajes de error por campo.
+
+    Args:
+        user_data (dict): Datos del usuario (por ejemplo, `UserCreate.model_dump()`).
+
+    Returns:
+        dict: Diccionario con la siguiente estructura:
+            - "isValid": True si todos los campos son válidos.
+            - "validations": Campos inválidos con sus claves "isValid" y "message" (vacío si es válido).
+            - "document": Documento del usuario listo para insertarse (None si hay errores). La
+              contraseña aún está en texto plano; se hashea en `user_service.create_user`.
+    """
+    validations = isValid_user_data(user_data)
+
+    state = user_data.get("state", "active")
+    if state not in USER_STATES:
+        validations["state"] = {"isValid": False, "message": "El estado del usuario debe ser active, inactive o banned."}
+
+    user_role = user_data.get("user_role", SELF_REGISTRATION_ROLES[0])
+    if user_role not in SELF_REGISTRATION_ROLES:
+        validations["user_role"] = {"isValid": False, "message": "El rol indicado no puede asignarse al registrarse."}
+
+    invalid_fields = {key: value for key, value in validations.items() if not value["isValid"]}
+    if invalid_fields:
+        return {"isValid": False, "validations": invalid_fields, "document": None}
+
+    now = datetime.now(config.TIME_ZONE)
+
+    # Construir el documento con los valores ya validados y los valores por defecto del modelo User.
+    document = {
+        "role_id": None,
+        "company_id": None,
+        "username": validations["username"]["value"],
+        "email": validations["email"]["value"],
+        "phone_number": validations["phone_number"]["value"],
+        "full_name": validations["full_name"]["value"],
+        "password": user_data["password"],  # El validador de contraseña no expone "value".
+        "is_temp_password": False,
+        "avatar_url": validations["avatar_url"]["value"],
+        "state": state,
+        "user_role": getattr(user_role, "value", user_role),
+        "last_login": None,
+        "created_at": now,
+        "updated_at": now,
+        "deleted_at": None,
+        "is_deleted": False,
+    }
+
+    return {"isValid": True, "validations": {}, "document": document}
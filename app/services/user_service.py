@@ -1,90 +1,171 @@
-from app.db.mongodb import db  # Importar la conexión a la base de datos
-from app.models.user_model import User  # Importar el modelo de usuario
+import logging
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from app import config
+from app.db.mongodb import (  # Colecciones configuradas por perfil de consistencia
+    CONSISTENCY_LISTING,
+    CONSISTENCY_PROFILE,
+    CONSISTENCY_STRONG,
+    get_collection,
+)
 from app.core import security  # Hashear contraseñas antes de guardar
-from pydantic import ValidationError
+from app.core.activity import FIELD_LAST_ACTIVITY, FIELD_LAST_LOGIN
+from app.core.availability import availability_index
+from app.core import server_timing
+from app.models.user_model import User
+from app.services import post_registration_service
+from app.utils.etag import VersionStampCache, version_from_datetime, weak_etag
+from app.utils.field_selection import FieldSelector
 
-async def create_user(user_data: dict):
+logger = logging.getLogger(__name__)
+
+# Marcas de actividad: 'ActivityTracker' las reescribe sin modificar 'updated_at', del que se derivan los ETags, por
+# lo que no se exponen en las representaciones con ETag (un 304 las serviría desactualizadas).
+USER_ACTIVITY_FIELDS = (FIELD_LAST_LOGIN, FIELD_LAST_ACTIVITY)
+
+# Proyección por defecto para las lecturas de usuarios: nunca se expone el hash de la contraseña (ni la marca
+# interna de tareas de registro pendientes ni las marcas de actividad).
+USER_PUBLIC_PROJECTION = {
+    "password": 0,
+    post_registration_service.PENDING_FIELD: 0,
+    **{field: 0 for field in USER_ACTIVITY_FIELDS}
+}
+
+# Selector de campos ('fields=') de los recursos de usuario, validado contra el modelo `User`.
+# 'password' y las marcas de actividad nunca son seleccionables.
+user_field_selector = FieldSelector(
+    User, forbidden=("password", *USER_ACTIVITY_FIELDS), default_projection=USER_PUBLIC_PROJECTION
+)
+
+# Campos del documento que se devuelven al cliente tras crear un usuario (además de "_id").
+USER_RESPONSE_FIELDS = ("username", "email", "phone_number", "full_name", "avatar_url", "user_role")
+user_response_selection = user_field_selector.select(*USER_RESPONSE_FIELDS)
+
+# Selección por defecto de 'get_users_by_ids': datos de presentación que otros servicios resuelven a partir de un ID.
+USER_DISPLAY_FIELDS = ("username", "full_name", "avatar_url", "user_role", "state")
+user_display_selection = user_field_selector.select(*USER_DISPLAY_FIELDS)
+
+# Selector de 'fields' de 'POST /users/batch', accesible a cualquier usuario autenticado: solo admite los datos de
+# presentación (nunca email ni teléfono de otros usuarios).
+user_display_field_selector = FieldSelector(
+    User,
+    forbidden=(
+        *(field for field in user_field_selector.allowed if field not in USER_DISPLAY_FIELDS),
+        "password",
+        *USER_ACTIVITY_FIELDS
+    ),
+    default_projection=USER_PUBLIC_PROJECTION
+)
+
+# Códigos de los IDs sin resultado en 'get_users_by_ids'.
+LOOKUP_INVALID_ID = "invalid_id"
+LOOKUP_NOT_FOUND = "not_found"
+
+# Caché de ETags por usuario, derivados de 'updated_at'. Es local a cada proceso: tras una escritura, los demás
+# workers pueden servir el ETag anterior hasta 'USER_VERSION_CACHE_TTL_SECONDS' segundos.
+user_version_cache = VersionStampCache(
+    ttl_seconds=config.USER_VERSION_CACHE_TTL_SECONDS,
+    max_entries=config.USER_VERSION_CACHE_MAX_ENTRIES
+)
+
+# Campos con índice único en la colección "user": garantizan la unicidad aun con registros concurrentes.
+USER_UNIQUE_INDEX_FIELDS = ("username", "email")
+
+async def ensure_indexes():
+    """
+    Crea los índices únicos de `USER_UNIQUE_INDEX_FIELDS` (solo sobre documentos donde el campo es un string).
+
+    Si ya existen duplicados en la colección, la creación falla: se registra el error y el registro sigue
+    dependiendo de `check_user_exists`.
+    """
+    collection = get_collection("user", CONSISTENCY_STRONG)
+    for field in USER_UNIQUE_INDEX_FIELDS:
+        try:
+            await collection.create_index(
+                field, unique=True, partialFilterExpression={field: {"$type": "string"}}
+            )
+        except Exception:
+            logger.exception("No se pudo crear el índice único de 'user'", extra={"field": field})
+
+async def create_user(user_document: dict):
     """
-    Recibe un esquema de usuario, lo valida con el modelo User y lo guarda en MongoDB.
+    Recibe el documento de usuario ya validado, hashea la contraseña y lo guarda en MongoDB.
 
     Realiza los siguientes pasos:
-    1. Valida el esquema del usuario utilizando el modelo User de Pydantic.
-    2. Hashea la contraseña del usuario antes de almacenarla.
-    3. Convierte el objeto validado en un diccionario compatible con MongoDB.
-    4. Serializa campos específicos (por ejemplo, avatar_url y user_role) para su almacenamiento.
-    5. Inserta el usuario en la colección "user" de MongoDB.
-    6. Agrega el ID generado por MongoDB al diccionario y filtra los datos para retornar.
+    1. Hashea la contraseña del usuario antes de almacenarla.
+    2. Inserta el documento en la colección "user" de MongoDB, con la marca de tareas de registro pendientes
+       (ver 'post_registration_service') si la cola de trabajos está habilitada.
+    3. Agrega el username y el email a los filtros de disponibilidad ('app/core/availability.py').
+    4. Construye la proyección de respuesta con el ID generado y los campos de `USER_RESPONSE_FIELDS`.
+
+    El documento debe provenir de `user_data_validator_service.validate_user_registration`, que ya
+    validó y normalizó todos los campos, por lo que aquí no se vuelve a validar.
 
     Args:
-        user_data (dict): Datos del usuario ya validados en la capa de validación.
+        user_document (dict): Documento del usuario listo para MongoDB (contraseña en texto plano).
 
     Returns:
         dict: En caso de éxito, retorna un diccionario con la clave "success" en True y los datos del usuario guardado.
-              En caso de error, retorna un diccionario con "success" en False y detalles del error.
+              En caso de error, retorna un diccionario con "success" en False y detalles del error; si el error
+              se debe a un índice único (registro concurrente con el mismo valor), incluye "duplicate_field".
     """
     try:
-        # Validar el esquema del usuario con el modelo User de Pydantic
-        validated_user = User(**user_data)
-
         # Hashear la contraseña antes de guardar
-        validated_user.password = security.hash_password(validated_user.password)
+        user_document["password"] = security.hash_password(user_document["password"])
+        if config.JOBS_ENABLED:
+            user_document[post_registration_service.PENDING_FIELD] = True
 
-        # Convertir el objeto validado en un diccionario para MongoDB
-        user_dict = validated_user.model_dump()
-
-        # Convertir campos a tipos serializables
-        user_dict['avatar_url'] = str(user_dict['avatar_url'])
-        user_dict['user_role'] = user_dict['user_role'].value
-        
         # Insertar en MongoDB
-        new_user = await db["user"].insert_one(user_dict)
-        
-        # Agregar el ID generado por MongoDB al diccionario
-        user_dict["_id"] = str(new_user.inserted_id)
-
-        # Filtrar los datos antes de retornar
-        filtered_user = {
-            "_id": user_dict["_id"],
-            "username": user_dict["username"],
-            "email": user_dict["email"],
-            "phone_number": user_dict["phone_number"],
-            "full_name": user_dict["full_name"],
-            "password": user_dict["password"],
-            "avatar_url": user_dict["avatar_url"],
-            "user_role": user_dict["user_role"]
-        }
+        with server_timing.stage(server_timing.STAGE_DB):
+            new_user = await get_collection("user", CONSISTENCY_STRONG).insert_one(user_document)
+
+        # Los nuevos valores dejan de estar disponibles de inmediato en este worker
+        availability_index.add(user_document)
+
+        # Proyectar los datos a retornar junto con el ID generado por MongoDB
+        filtered_user = user_response_selection.encode({**user_document, "_id": str(new_user.inserted_id)})
 
         return {"success": True, "user": filtered_user}
 
-    except ValidationError as e:
-        return {"success": False, "error": "Error de validación", "details": e.errors()}
+    except DuplicateKeyError as e:
+        # MongoDB informa el índice en 'keyPattern'; si no está, se indican ambos campos con índice único
+        key_pattern = (e.details or {}).get("keyPattern") or {}
+        duplicate_field = next(iter(key_pattern), " o ".join(USER_UNIQUE_INDEX_FIELDS))
+        return {"success": False, "error": "Usuario duplicado", "details": str(e), "duplicate_field": duplicate_field}
 
     except Exception as e:
         return {"success": False, "error": "Error al guardar el usuario", "details": str(e)}
 
-async def check_user_exists(email: str, phone_number: int) -> dict:
+async def check_user_exists(email: str, phone_number: int, username: str = None) -> dict:
     """
-    Verifica si el email o el número de teléfono ya están registrados en la base de datos.
+    Verifica si el email, el nombre de usuario o el número de teléfono ya están registrados en la base de datos.
 
     Args:
         email (str): Correo electrónico a verificar.
         phone_number (int): Número de teléfono a verificar.
+        username (str, optional): Nombre de usuario a verificar.
 
     Returns:
         dict: Diccionario con la siguiente estructura:
             - "exists": True si el usuario ya está registrado, False si no lo está.
-            - "field": Indica cuál campo es duplicado ("email" o "phone_number"), o None si no hay coincidencias.
+            - "field": Indica cuál campo es duplicado ("email", "username" o "phone_number"), o None si no hay
+              coincidencias.
             - "error": (Opcional) Mensaje de error en caso de excepción.
     """
     try:
-        # Buscar en la colección "user" si existe un usuario con el email o el número de teléfono proporcionado
-        existing_user = await db["user"].find_one(
-            {"$or": [{"email": email}, {"phone_number": phone_number}]}
-        )
+        # Buscar en la colección "user" si existe un usuario con el email, el username o el número de teléfono
+        conditions = {"email": email, "username": username, "phone_number": phone_number}
+        conditions = {field: value for field, value in conditions.items() if value is not None}
+        with server_timing.stage(server_timing.STAGE_DB):
+            # Lectura en el primario con read concern "majority" para no aceptar duplicados por un secundario atrasado
+            existing_user = await get_collection("user", CONSISTENCY_STRONG).find_one(
+                {"$or": [{field: value} for field, value in conditions.items()]},
+                {field: 1 for field in conditions}
+            )
 
         if existing_user:
             # Determinar qué campo presenta duplicación
-            duplicated_field = "email" if existing_user["email"] == email else "phone_number"
+            duplicated_field = next(field for field, value in conditions.items() if existing_user.get(field) == value)
             return {"exists": True, "field": duplicated_field}
 
         # Retornar que no existe duplicado
@@ -93,3 +174,152 @@ async def check_user_exists(email: str, phone_number: int) -> dict:
     except Exception as e:
         # En caso de error, se retorna el mensaje de error junto con exists en False
         return {"exists": False, "error": str(e)}
+
+async def check_availability(values: dict) -> dict:
+    """
+    Indica si cada username/email ya está registrado, consultando MongoDB solo ante un posible acierto del
+    filtro de Bloom correspondiente.
+
+    Args:
+        values (dict): Valores ya validados por campo ("username" y/o "email").
+
+    Returns:
+        dict: Por campo, un diccionario con "value" y "available".
+    """
+    return {
+        field: {"value": value, "available": not await availability_index.is_taken(field, value)}
+        for field, value in values.items()
+    }
+
+def user_etag(user_document: dict) -> str:
+    """
+    Calcula el ETag débil de un usuario a partir de su '_id' y su 'updated_at'.
+    """
+    return weak_etag(f"{user_document['_id']}-{version_from_datetime(user_document.get('updated_at'))}")
+
+async def get_user_by_id(user_id: str, projection: dict = None, consistency: str = CONSISTENCY_PROFILE):
+    """
+    Obtiene un usuario (no eliminado) por su ID y actualiza el caché de versiones.
+
+    Si la lectura con un perfil que admite secundarios no encuentra al usuario (por ejemplo, justo después de
+    registrarlo, antes de que el secundario replique la inserción), se repite en el primario.
+
+    El caché de versiones solo se actualiza con documentos leídos del primario: un secundario atrasado podría
+    volver a cachear el ETag anterior justo después de `invalidate_user_version`.
+
+    Args:
+        user_id (str): ID del usuario (ObjectId en formato str).
+        projection (dict, optional): Proyección de MongoDB. Por defecto `USER_PUBLIC_PROJECTION`.
+        consistency (str, optional): Perfil de consistencia; por defecto admite secundarios dentro del presupuesto
+            de antigüedad del perfil ('MONGO_PROFILE_MAX_STALENESS_SECONDS').
+
+    Returns:
+        dict | None: Documento del usuario, o None si el ID no es válido o no existe.
+    """
+    if not ObjectId.is_valid(user_id):
+        return None
+
+    query = {"_id": ObjectId(user_id), "is_deleted": {"$ne": True}}
+    projection = USER_PUBLIC_PROJECTION if projection is None else projection
+    with server_timing.stage(server_timing.STAGE_DB):
+        user = await get_collection("user", consistency).find_one(query, projection)
+        if user is None and consistency != CONSISTENCY_STRONG:
+            consistency = CONSISTENCY_STRONG
+            user = await get_collection("user", consistency).find_one(query, projection)
+    if user is not None and consistency == CONSISTENCY_STRONG and "updated_at" in user:
+        user_version_cache.set(user_id, user_etag(user))
+    return user
+
+async def get_user_etag(user_id: str):
+    """
+    Obtiene el ETag actual de un usuario sin cargar el documento completo.
+
+    Se responde desde `user_version_cache` cuando es posible; en caso contrario se consulta
+    únicamente el campo 'updated_at' en el primario (y el resultado se cachea).
+
+    Returns:
+        str | None: ETag del usuario, o None si no existe.
+    """
+    etag = user_version_cache.get(user_id)
+    if etag is not None:
+        return etag
+
+    user = await get_user_by_id(user_id, {"updated_at": 1}, consistency=CONSISTENCY_STRONG)
+    return user_etag(user) if user is not None else None
+
+async def get_users_by_ids(user_ids: list, selection=None) -> dict:
+    """
+    Obtiene varios usuarios (no eliminados) por sus IDs con una sola consulta '$in'.
+
+    Los IDs se deduplican antes de consultar, y los resultados se retornan en el mismo orden de la entrada
+    (incluidos los repetidos), con una entrada explícita para cada ID sin resultado. La correspondencia con los
+    documentos se hace por la forma canónica del ObjectId, de modo que un ID en hexadecimal con mayúsculas
+    también se encuentra.
+
+    Args:
+        user_ids (list): IDs de los usuarios (ObjectId en formato str).
+        selection (FieldSelection, optional): Campos a retornar. Por defecto `user_display_selection`.
+
+    Returns:
+        dict: {"results": [{"id", "user"} | {"id", "user": None, "error": código}], "found": int, "missing": int}.
+    """
+    unique_ids = {}
+    for user_id in user_ids:
+        if user_id not in unique_ids and ObjectId.is_valid(user_id):
+            unique_ids[user_id] = ObjectId(user_id)
+
+    selection = selection or user_display_selection
+    users_by_id = {}
+    if unique_ids:
+        cursor = get_collection("user", CONSISTENCY_LISTING).find(
+            {"_id": {"$in": list(unique_ids.values())}, "is_deleted": {"$ne": True}},
+            selection.projection
+        )
+        with server_timing.stage(server_timing.STAGE_DB):
+            users = await cursor.to_list(length=None)
+        users_by_id = {str(user["_id"]): selection.encode(user) for user in users}
+
+    results = []
+    found = 0
+    for user_id in user_ids:
+        object_id = unique_ids.get(user_id)
+        user = users_by_id.get(str(object_id)) if object_id is not None else None
+        if user is not None:
+            found += 1
+            results.append({"id": user_id, "user": user})
+        else:
+            error = LOOKUP_NOT_FOUND if user_id in unique_ids else LOOKUP_INVALID_ID
+            results.append({"id": user_id, "user": None, "error": error})
+
+    return {"results": results, "found": found, "missing": len(user_ids) - found}
+
+def invalidate_user_version(user_id: str):
+    """
+    Descarta el ETag cacheado de un usuario. Debe llamarse en cada escritura que modifique 'updated_at'.
+
+    Solo afecta al proceso actual; en los demás workers la entrada expira por TTL.
+    """
+    user_version_cache.invalidate(str(user_id))
+
+async def list_users(skip: int = 0, limit: int = 50, projection: dict = None) -> dict:
+    """
+    Lista una página de usuarios no eliminados, ordenados por '_id', y calcula el ETag de la página.
+
+    El ETag se deriva de los pares ('_id', 'updated_at') de la página, sin serializar los documentos.
+
+    Args:
+        skip (int): Número de usuarios a omitir.
+        limit (int): Número máximo de usuarios a retornar.
+        projection (dict, optional): Proyección de MongoDB. Por defecto `USER_PUBLIC_PROJECTION`.
+
+    Returns:
+        dict: {"users": lista de documentos, "etag": ETag débil de la página}.
+    """
+    cursor = get_collection("user", CONSISTENCY_LISTING).find(
+        {"is_deleted": {"$ne": True}},
+        USER_PUBLIC_PROJECTION if projection is None else projection
+    ).sort("_id", 1).skip(skip).limit(limit)
+    with server_timing.stage(server_timing.STAGE_DB):
+        users = await cursor.to_list(length=limit)
+    etag = weak_etag(skip, limit, *(f"{user['_id']}-{version_from_datetime(user.get('updated_at'))}" for user in users))
+    return {"users": users, "etag": etag}
@@ -0,0 +1,67 @@
+"""
+Filtro de Bloom en memoria.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/utils/bloom_filter.py' y lo utiliza 'app/core/availability.py'.
+
+Responsabilidades:
+    - Responder si un valor "posiblemente" pertenece a un conjunto o "definitivamente no", sin falsos negativos,
+      ocupando ~1,2 bytes por elemento con una tasa de falsos positivos del 1 %.
+    - Dimensionar el arreglo de bits y el número de funciones hash a partir de la capacidad y la tasa de falsos
+      positivos deseadas.
+
+Notas:
+    - Las posiciones se derivan de un único digest BLAKE2b de 128 bits mediante doble hashing
+      (h1 + i·h2), en lugar de calcular k hashes independientes.
+    - No admite eliminaciones. Al superar la capacidad la tasa de falsos positivos aumenta; `saturated` indica
+      cuándo conviene reconstruirlo con una capacidad mayor.
+"""
+
+import hashlib
+import math
+
+class BloomFilter:
+    """
+    Filtro de Bloom de cadenas.
+
+    Args:
+        capacity (int): Número de elementos esperado.
+        error_rate (float): Tasa de falsos positivos deseada al alcanzar la capacidad (por ejemplo, 0.01).
+    """
+
+    __slots__ = ("capacity", "error_rate", "size", "hash_count", "count", "_bits")
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("La capacidad debe ser positiva y la tasa de error estar entre 0 y 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def add(self, value: str):
+        bits = self._bits
+        for position in self._positions(value):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    @property
+    def saturated(self) -> bool:
+        return self.count > self.capacity
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
@@ -0,0 +1,217 @@
+"""
+Verificación local de contraseñas filtradas (breached passwords).
+
+Ubicación:
+    - Este módulo se encuentra en 'app/utils/breached_passwords.py' y lo utiliza
+      'app/utils/validations/password_validator.py'.
+
+Formato del archivo:
+    - Secuencia ordenada y sin duplicados de digests SHA-1 binarios de 20 bytes (sin cabecera ni separadores),
+      generada con la herramienta de este mismo módulo.
+
+Responsabilidades:
+    - Abrir el archivo con 'mmap' (una sola vez, de forma perezosa) y buscar el SHA-1 de la contraseña mediante
+      búsqueda binaria: unas ~30 comparaciones para mil millones de entradas, del orden de microsegundos, sin
+      cargar el archivo en memoria (las páginas las gestiona el sistema operativo y se comparten entre workers).
+    - Construir el archivo a partir de una lista de contraseñas en texto plano o de hashes SHA-1 en hexadecimal
+      (por ejemplo, el formato 'HASH:conteo' de Have I Been Pwned), con ordenamiento externo por bloques para
+      que listas de varios GB no requieran memoria proporcional.
+
+Ejemplo de uso:
+    >>> python -m app.utils.breached_passwords build passwords.txt breached.bin --format plain
+    >>> python -m app.utils.breached_passwords build pwned-passwords-sha1.txt breached.bin --format sha1
+    >>> python -m app.utils.breached_passwords check breached.bin 'P@ssw0rd'
+
+Notas:
+    - La verificación se activa configurando 'BREACHED_PASSWORDS_PATH'; si está vacío no se realiza. Si la ruta
+      está configurada pero el archivo no existe, se registra una advertencia y no se bloquean los registros.
+"""
+
+import argparse
+import bisect
+import hashlib
+import heapq
+import logging
+import mmap
+import os
+import sys
+import tempfile
+import threading
+from app import config
+
+logger = logging.getLogger(__name__)
+
+RECORD_SIZE = 20
+
+class _Records:
+    """
+    Vista de secuencia sobre los registros de 20 bytes del archivo (para `bisect`).
+    """
+
+    __slots__ = ("_buffer", "_count")
+
+    def __init__(self, buffer, count: int):
+        self._buffer = buffer
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index: int) -> bytes:
+        offset = index * RECORD_SIZE
+        return self._buffer[offset:offset + RECORD_SIZE]
+
+class BreachedPasswordIndex:
+    """
+    Índice de digests SHA-1 ordenados sobre un archivo mapeado en memoria.
+
+    Args:
+        path (str): Ruta del archivo generado por `build_index`.
+
+    Raises:
+        ValueError: Si el tamaño del archivo no es múltiplo de 20 bytes.
+    """
+
+    def __init__(self, path: str):
+        size = os.path.getsize(path)
+        if size % RECORD_SIZE:
+            raise ValueError(f"Archivo de contraseñas filtradas inválido: {path}")
+        self.path = path
+        self._mmap = None
+        if size:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._records = _Records(self._mmap, size // RECORD_SIZE)
+
+    def __len__(self):
+        return len(self._records)
+
+    def contains_digest(self, digest: bytes) -> bool:
+        index = bisect.bisect_left(self._records, digest)
+        return index < len(self._records) and self._records[index] == digest
+
+    def contains(self, password: str) -> bool:
+        """
+        Indica si la contraseña aparece en el índice.
+        """
+        return self.contains_digest(hashlib.sha1(password.encode("utf-8")).digest())
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+
+_index = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+def get_index():
+    """
+    Retorna el índice configurado en 'BREACHED_PASSWORDS_PATH' (abierto una sola vez), o None si no hay uno.
+    """
+    global _index, _index_loaded
+    if _index_loaded:
+        return _index
+    with _index_lock:
+        if not _index_loaded:
+            path = config.BREACHED_PASSWORDS_PATH
+            if path:
+                try:
+                    _index = BreachedPasswordIndex(path)
+                except (OSError, ValueError):
+                    logger.warning("No se pudo abrir el archivo de contraseñas filtradas", extra={"path": path})
+            _index_loaded = True
+    return _index
+
+def is_breached(password: str) -> bool:
+    """
+    Indica si la contraseña es una contraseña filtrada conocida (False si no hay índice configurado).
+    """
+    index = get_index()
+    return index is not None and index.contains(password)
+
+def _iter_digests(input_path: str, input_format: str):
+    with open(input_path, "rb") as f:
+        for line in f:
+            line = line.rstrip(b"\r\n")
+            if not line:
+                continue
+            if input_format == "plain":
+                yield hashlib.sha1(line).digest()
+            else:
+                # 'HASH' o 'HASH:conteo' en hexadecimal.
+                yield bytes.fromhex(line.split(b":", 1)[0].decode("ascii"))
+
+def build_index(input_path: str, output_path: str, input_format: str = "plain", chunk_records: int = 5_000_000) -> int:
+    """
+    Construye el archivo ordenado de digests a partir de una lista (una entrada por línea).
+
+    Ordena por bloques de `chunk_records` digests en archivos temporales y luego los combina (merge) eliminando
+    duplicados, de modo que la memoria usada no depende del tamaño de la lista.
+
+    Args:
+        input_path (str): Lista de contraseñas en texto plano (UTF-8) o de hashes SHA-1 en hexadecimal.
+        output_path (str): Archivo binario de salida.
+        input_format (str): "plain" o "sha1".
+        chunk_records (int): Digests por bloque ordenado en memoria.
+
+    Returns:
+        int: Número de digests únicos escritos.
+    """
+    with tempfile.TemporaryDirectory(prefix="breached-passwords-") as work_dir:
+        runs = []
+        chunk = []
+
+        def flush_chunk():
+            chunk.sort()
+            run_path = os.path.join(work_dir, f"run-{len(runs)}.bin")
+            with open(run_path, "wb") as run:
+                run.write(b"".join(chunk))
+            runs.append(run_path)
+            chunk.clear()
+
+        for digest in _iter_digests(input_path, input_format):
+            chunk.append(digest)
+            if len(chunk) >= chunk_records:
+                flush_chunk()
+        if chunk:
+            flush_chunk()
+
+        def read_run(run_path):
+            with open(run_path, "rb") as run:
+                while record := run.read(RECORD_SIZE):
+                    yield record
+
+        written = 0
+        previous = None
+        tmp_output = f"{output_path}.tmp"
+        with open(tmp_output, "wb") as output:
+            for digest in heapq.merge(*(read_run(run_path) for run_path in runs)):
+                if digest != previous:
+                    output.write(digest)
+                    previous = digest
+                    written += 1
+        os.replace(tmp_output, output_path)
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Índice local de contraseñas filtradas (SHA-1 ordenados).")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="Construye el archivo binario a partir de una lista.")
+    build_parser.add_argument("input")
+    build_parser.add_argument("output")
+    build_parser.add_argument("--format", choices=("plain", "sha1"), default="plain")
+    build_parser.add_argument("--chunk-records", type=int, default=5_000_000)
+
+    check_parser = commands.add_parser("check", help="Verifica una contraseña contra un archivo.")
+    check_parser.add_argument("index")
+    check_parser.add_argument("password")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        count = build_index(args.input, args.output, args.format, args.chunk_records)
+        print(f"{count} hashes únicos escritos en {args.output}")
+    else:
+        found = BreachedPasswordIndex(args.index).contains(args.password)
+        print("filtrada" if found else "no encontrada")
+        sys.exit(1 if found else 0)
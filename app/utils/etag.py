@@ -0,0 +1,94 @@
+"""
+Utilidades para ETags débiles y solicitudes GET condicionales.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/utils/etag.py' y es utilizado por los endpoints de lectura de usuarios.
+
+Responsabilidades:
+    - Construir ETags débiles a partir de una versión (por ejemplo, 'updated_at') o de un hash de varias partes.
+    - Evaluar el encabezado 'If-None-Match' (comparación débil, incluido '*').
+    - Mantener un caché acotado en memoria de sellos de versión por recurso con tiempo de expiración,
+      para responder '304 Not Modified' sin cargar el documento completo.
+"""
+
+import hashlib
+import time
+from datetime import datetime, timezone
+
+def version_from_datetime(value) -> str:
+    """
+    Convierte una fecha ('updated_at') en un sello de versión estable (milisegundos desde epoch).
+
+    MongoDB devuelve las fechas sin zona horaria (en UTC), por lo que las fechas "naive" se interpretan como UTC.
+    """
+    if not isinstance(value, datetime):
+        return "0"
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return str(int(value.timestamp() * 1000))
+
+def weak_etag(*parts) -> str:
+    """
+    Construye un ETag débil a partir de una o más partes.
+
+    Con una sola parte corta se usa directamente; en otro caso se usa un hash BLAKE2b de 16 bytes.
+    """
+    if len(parts) == 1 and len(str(parts[0])) <= 64:
+        return f'W/"{parts[0]}"'
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'W/"{digest.hexdigest()}"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Indica si el encabezado 'If-None-Match' coincide con el ETag (comparación débil).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+class VersionStampCache:
+    """
+    Caché acotado de sellos de versión (clave → ETag) con tiempo de expiración.
+
+    Cuando se alcanza `max_entries` se descarta la entrada más antigua (orden de inserción del dict).
+
+    Args:
+        ttl_seconds (float): Tiempo de vida de cada entrada.
+        max_entries (int): Número máximo de entradas.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        etag, expires_at = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return etag
+
+    def set(self, key, etag: str):
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (etag, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
@@ -0,0 +1,131 @@
+"""
+Selección de campos ('fields=') para las lecturas de recursos.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/utils/field_selection.py' y es utilizado por los endpoints de lectura de
+      usuarios (a través de `user_service.user_field_selector`).
+
+Responsabilidades:
+    - Validar el parámetro 'fields' (lista separada por comas) contra los campos del modelo Pydantic del recurso,
+      rechazando campos desconocidos o no expuestos (por ejemplo, 'password').
+    - Traducir la selección a una proyección de MongoDB, para que los campos no solicitados no salgan de la base
+      de datos.
+    - Compilar, una sola vez por conjunto de campos, la función que construye el documento de respuesta, y cachear
+      la selección resultante (LRU) para reutilizarla entre solicitudes.
+
+Notas:
+    - '_id' se incluye siempre (también se acepta 'id' como alias), y 'updated_at' se proyecta siempre para calcular
+      el ETag aunque no se incluya en la respuesta.
+    - Cada selección aporta su propia variante del ETag, de modo que representaciones distintas de un mismo recurso
+      no comparten validadores.
+"""
+
+from functools import lru_cache
+from app.utils.etag import weak_etag
+
+class InvalidFieldSelectionError(ValueError):
+    """Se lanza cuando 'fields' contiene campos desconocidos o no permitidos."""
+
+    def __init__(self, invalid_fields: list):
+        super().__init__(f"Campos inválidos: {', '.join(invalid_fields)}")
+        self.invalid_fields = invalid_fields
+
+class FieldSelection:
+    """
+    Selección de campos compilada: proyección de MongoDB, codificador de documentos y variante de ETag.
+
+    Args:
+        fields (tuple): Campos seleccionados en orden canónico, o None para la representación por defecto.
+        default_projection (dict): Proyección usada cuando `fields` es None.
+        always_projected (tuple): Campos que siempre se leen de la base de datos (por ejemplo, para el ETag).
+    """
+
+    __slots__ = ("fields", "projection", "encode")
+
+    def __init__(self, fields: tuple = None, default_projection: dict = None, always_projected: tuple = ()):
+        self.fields = fields
+        if fields is None:
+            self.projection = default_projection
+            self.encode = _identity
+        else:
+            self.projection = {field: 1 for field in (*fields, *always_projected)}
+            self.encode = _compile_encoder(("_id", *fields))
+
+    def encode_many(self, documents: list) -> list:
+        if self.fields is None:
+            return documents
+        encode = self.encode
+        return [encode(document) for document in documents]
+
+    def etag(self, base_etag: str) -> str:
+        """
+        Variante del ETag para esta selección (el ETag base si es la representación por defecto).
+        """
+        if self.fields is None or base_etag is None:
+            return base_etag
+        return weak_etag(base_etag, *self.fields)
+
+def _identity(document):
+    return document
+
+def _compile_encoder(keys: tuple):
+    # Tupla fija de claves capturada una sola vez por selección.
+    def encode(document: dict) -> dict:
+        return {key: document[key] for key in keys if key in document}
+
+    return encode
+
+class FieldSelector:
+    """
+    Valida y compila selecciones de campos para un modelo Pydantic.
+
+    Args:
+        model: Modelo Pydantic del recurso; los campos se exponen con su alias (por ejemplo, 'id' → '_id').
+        forbidden (tuple): Campos que nunca pueden seleccionarse.
+        default_projection (dict): Proyección de la representación por defecto (sin 'fields').
+        always_projected (tuple): Campos que siempre se leen de la base de datos.
+        cache_size (int): Número máximo de selecciones compiladas en caché.
+    """
+
+    def __init__(self, model, forbidden: tuple = (), default_projection: dict = None,
+                 always_projected: tuple = ("updated_at",), cache_size: int = 256):
+        self.allowed = frozenset(
+            (field.alias or name) for name, field in model.model_fields.items()
+            if (field.alias or name) not in forbidden and name not in forbidden
+        ) - {"_id"}
+        self.default = FieldSelection(None, default_projection)
+        self._always_projected = always_projected
+        self._compile = lru_cache(maxsize=cache_size)(self._compile_uncached)
+        self._parse = lru_cache(maxsize=cache_size)(self._parse_uncached)
+
+    def _compile_uncached(self, fields: tuple) -> FieldSelection:
+        return FieldSelection(fields, always_projected=self._always_projected)
+
+    def _parse_uncached(self, fields_param: str) -> FieldSelection:
+        requested = {field.strip() for field in fields_param.split(",") if field.strip()}
+        requested -= {"id", "_id"}
+        invalid = sorted(requested - self.allowed)
+        if invalid:
+            raise InvalidFieldSelectionError(invalid)
+        return self._compile(tuple(sorted(requested)))
+
+    def parse(self, fields_param: str = None, default: FieldSelection = None) -> FieldSelection:
+        """
+        Convierte el parámetro 'fields' en una selección compilada (cacheada).
+
+        Args:
+            fields_param (str): Campos separados por comas, o None/vacío para la representación por defecto.
+            default (FieldSelection, optional): Representación por defecto del endpoint (por defecto `self.default`).
+
+        Raises:
+            InvalidFieldSelectionError: Si algún campo es desconocido o no está permitido.
+        """
+        if not fields_param or not fields_param.strip():
+            return default or self.default
+        return self._parse(fields_param)
+
+    def select(self, *fields) -> FieldSelection:
+        """
+        Construye una selección fija a partir de campos conocidos (para uso interno de los servicios).
+        """
+        return self._parse(",".join(fields))
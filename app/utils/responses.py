@@ -0,0 +1,69 @@
+"""
+Respuestas JSON rápidas basadas en orjson.
+
+Ubicación:
+    - Este módulo se encuentra en 'app/utils/responses.py' y define la clase de respuesta por defecto de la
+      aplicación (ver 'app/main.py').
+
+Responsabilidades:
+    - Serializar el contenido de las respuestas en una sola pasada con orjson, evitando el paso previo por
+      'jsonable_encoder' y la serialización posterior con el módulo estándar 'json'.
+    - Proveer codificadores nativos para tipos que orjson no conoce: ObjectId/PyObjectId, URLs de Pydantic
+      (AnyUrl), modelos Pydantic, conjuntos y Decimal. Los 'datetime', 'Enum' y 'UUID' los serializa orjson
+      de forma nativa.
+
+Notas:
+    - FastAPI ejecuta 'jsonable_encoder' sobre cualquier valor retornado por una ruta que no sea una
+      instancia de 'Response'. Para aprovechar esta ruta rápida, las rutas deben retornar directamente
+      'FastJSONResponse(content=...)' con modelos o diccionarios.
+"""
+
+from decimal import Decimal
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import AnyUrl, BaseModel
+from pydantic_core import Url
+
+# Tipos de URL de Pydantic: 'AnyUrl' (y derivados) envuelve a 'pydantic_core.Url' sin heredar de ella.
+_URL_TYPES = (AnyUrl, Url)
+
+def orjson_default(obj):
+    """
+    Codificador para los tipos que orjson no serializa de forma nativa.
+
+    Args:
+        obj: Objeto a convertir.
+
+    Returns:
+        Un valor serializable por orjson.
+
+    Raises:
+        TypeError: Si el tipo no está soportado (orjson lo reporta como error de serialización).
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, _URL_TYPES):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(by_alias=True)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Tipo no serializable a JSON: {type(obj).__name__}")
+
+def dumps(content) -> bytes:
+    """
+    Serializa `content` a JSON (bytes) con orjson y los codificadores de `orjson_default`.
+    """
+    return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+class FastJSONResponse(JSONResponse):
+    """
+    Respuesta JSON serializada con orjson y con soporte nativo para ObjectId, AnyUrl y modelos Pydantic.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -1,4 +1,7 @@
-from pydantic import BaseModel, AnyUrl, ValidationError
+from pydantic import TypeAdapter, AnyUrl, ValidationError
+
+# Adaptador construido una sola vez a nivel de módulo para no recompilar el esquema en cada llamada.
+_avatar_url_adapter = TypeAdapter(AnyUrl)
 
 def isValid_avatar_url(avatar_url: str) -> dict:
     """
@@ -15,12 +18,10 @@ def isValid_avatar_url(avatar_url: str) -> dict:
         dict: Con dos propiedades:
               - "isValid": bool que indica si la URL es válida.
               - "message": str con un mensaje descriptivo.
+              Si la URL es válida se incluye además "value" con la URL normalizada (str).
     """
-    class AvatarSchema(BaseModel):
-        url: AnyUrl  # Usa Pydantic para validar la URL
-
     try:
-        AvatarSchema(url=avatar_url)
-        return {"isValid": True, "message": "La URL de la foto de perfil es válida."}
+        value = str(_avatar_url_adapter.validate_python(avatar_url))
+        return {"isValid": True, "message": "La URL de la foto de perfil es válida.", "value": value}
     except ValidationError:
         return {"isValid": False, "message": "La URL de la foto de perfil no es válida. Asegúrate de ingresar una dirección correcta."}
@@ -1,4 +1,8 @@
-from pydantic import BaseModel, EmailStr, ValidationError
+from pydantic import TypeAdapter, EmailStr, ValidationError
+
+# Adaptador construido una sola vez a nivel de módulo; crear un modelo Pydantic en cada
+# llamada obligaba a compilar el esquema de validación en cada registro.
+_email_adapter = TypeAdapter(EmailStr)
 
 def isValid_email(email: str) -> dict:
     """
@@ -15,12 +19,10 @@ def isValid_email(email: str) -> dict:
         dict: Con dos propiedades:
               - "isValid": bool que indica si el email es válido.
               - "message": str con un mensaje descriptivo.
+              Si el email es válido se incluye además "value" con el email normalizado.
     """
-    class EmailSchema(BaseModel):
-        email: EmailStr  # Usa Pydantic para validar el email
-
     try:
-        EmailSchema(email=email)
-        return {"isValid": True, "message": "El correo electrónico es válido."}
+        value = _email_adapter.validate_python(email)
+        return {"isValid": True, "message": "El correo electrónico es válido.", "value": value}
     except ValidationError:
         return {"isValid": False, "message": "El correo electrónico no es válido. Asegúrate de ingresar una dirección correcta."}
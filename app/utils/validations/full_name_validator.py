@@ -1,5 +1,8 @@
 import re
 
+# Expresión regular compilada una sola vez a nivel de módulo.
+_FULL_NAME_PATTERN = re.compile(r'^(?! )(?!.* {2,})[a-zA-ZÀ-ÖØ-öø-ÿ\s]{3,50}(?<! )$')
+
 def isValid_full_name(full_name: str) -> dict:
     """
     Valida un nombre completo siguiendo reglas básicas.
@@ -18,14 +21,14 @@ def isValid_full_name(full_name: str) -> dict:
         dict: Con dos propiedades:
               - "isValid": bool que indica si el nombre es válido.
               - "message": str con un mensaje descriptivo.
+              Si la validación es exitosa se incluye además "value" con el valor validado.
     """
-    pattern = r'^(?! )(?!.* {2,})[a-zA-ZÀ-ÖØ-öø-ÿ\s]{3,50}(?<! )$'
 
     if not full_name:
         return {"isValid": False, "message": "El nombre completo no puede estar vacío."}
 
-    if re.match(pattern, full_name):
-        return {"isValid": True, "message": "El nombre completo es válido."}
+    if _FULL_NAME_PATTERN.match(full_name):
+        return {"isValid": True, "message": "El nombre completo es válido.", "value": full_name}
     else:
         return {
             "isValid": False,
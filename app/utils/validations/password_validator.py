@@ -1,4 +1,8 @@
 import re
+from app.utils.breached_passwords import is_breached
+
+# Expresión regular compilada una sola vez a nivel de módulo.
+_PASSWORD_PATTERN = re.compile(r'^(?=.*[a-záéíóúüñ])(?=.*[A-ZÁÉÍÓÚÜÑ])(?=.*\d)(?=.*[@#$%^&+=!_*])[A-Za-zÁÉÍÓÚÜÑáéíóúüñ\d@#$%^&+=!_*]{8,50}$')
 
 def isValid_password(password: str) -> dict:
     """
@@ -10,6 +14,7 @@ def isValid_password(password: str) -> dict:
       - Debe contener al menos una letra minúscula.
       - Debe contener al menos un número.
       - Debe contener al menos un carácter especial (@#$%^&+=!_*).
+      - No debe aparecer en la lista local de contraseñas filtradas ('BREACHED_PASSWORDS_PATH'), si está configurada.
     
     Args:
         password (str): La contraseña a validar.
@@ -19,12 +24,16 @@ def isValid_password(password: str) -> dict:
               - "isValid": bool que indica si la contraseña es válida.
               - "message": str con un mensaje descriptivo.
     """
-    pattern = r'^(?=.*[a-záéíóúüñ])(?=.*[A-ZÁÉÍÓÚÜÑ])(?=.*\d)(?=.*[@#$%^&+=!_*])[A-Za-zÁÉÍÓÚÜÑáéíóúüñ\d@#$%^&+=!_*]{8,50}$'
 
     if not password:
         return {"isValid": False, "message": "La contraseña no puede estar vacía."}
 
-    if re.match(pattern, password):
+    if _PASSWORD_PATTERN.match(password):
+        if is_breached(password):
+            return {
+                "isValid": False,
+                "message": "Esta contraseña aparece en filtraciones de datos conocidas. Por favor, elija otra."
+            }
         return {"isValid": True, "message": "La contraseña es válida."}
     else:
         return {
@@ -1,4 +1,7 @@
-from pydantic import BaseModel, PositiveInt, ValidationError
+from pydantic import TypeAdapter, PositiveInt, ValidationError
+
+# Adaptador construido una sola vez a nivel de módulo para no recompilar el esquema en cada llamada.
+_phone_number_adapter = TypeAdapter(PositiveInt)
 
 def isValid_phone_number(phone_number: int) -> dict:
     """
@@ -15,12 +18,10 @@ def isValid_phone_number(phone_number: int) -> dict:
         dict: Con dos propiedades:
               - "isValid": bool que indica si el número es válido.
               - "message": str con un mensaje descriptivo.
+              Si el número es válido se incluye además "value" con el entero validado.
     """
-    class PhoneNumberSchema(BaseModel):
-        phone_number: PositiveInt  # Usa Pydantic para validar que sea un número positivo
-
     try:
-        PhoneNumberSchema(phone_number=phone_number)
-        return {"isValid": True, "message": "El número de teléfono es válido."}
+        value = _phone_number_adapter.validate_python(phone_number)
+        return {"isValid": True, "message": "El número de teléfono es válido.", "value": value}
     except ValidationError:
         return {"isValid": False, "message": "El número de teléfono no es válido. Debe ser un número positivo y sin caracteres especiales."}
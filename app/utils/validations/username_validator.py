@@ -1,5 +1,9 @@
 import re
 
+# Patrón para usernames con letras, números, guion bajo (_), guion (-) y punto (.),
+# compilado una sola vez a nivel de módulo.
+_USERNAME_PATTERN = re.compile(r'^(?![-_.])(?!.*[-_.]{2})[a-zA-Z0-9._-]{3,50}(?<![-_.])$')
+
 def isValid_username(username: str) -> dict:
     """
     Valida un nombre de usuario usando una expresión regular.
@@ -17,15 +21,14 @@ def isValid_username(username: str) -> dict:
         dict: Con dos propiedades:
               - "isValid": bool que indica si la validación fue exitosa.
               - "message": str con un mensaje descriptivo.
+              Si la validación es exitosa se incluye además "value" con el valor validado.
     """
-    # Patrón mejorado para usernames con letras, números, guion bajo (_), guion (-) y punto (.)
-    pattern = r'^(?![-_.])(?!.*[-_.]{2})[a-zA-Z0-9._-]{3,50}(?<![-_.])$'
     
     if not username:
         return {"isValid": False, "message": "El nombre de usuario no puede estar vacío."}
     
-    if re.match(pattern, username):
-        return {"isValid": True, "message": "El nombre de usuario es válido."}
+    if _USERNAME_PATTERN.match(username):
+        return {"isValid": True, "message": "El nombre de usuario es válido.", "value": username}
     else:
         return {
             "isValid": False, 
@@ -0,0 +1,96 @@
+"""
+Verificación del presupuesto de tiempo de importación de la aplicación (arranque en frío).
+
+Importa 'app.main' en un proceso nuevo con 'python -X importtime', sin claves RSA disponibles y desde un
+directorio vacío (sin '.env', por lo que se usan los valores por defecto y las variables de entorno), y compara
+el tiempo acumulado con un presupuesto.
+
+Importar 'app.main' sí construye la configuración (`config.get_settings()`): el cliente de MongoDB, los buckets
+de las métricas y los middlewares se configuran al importar. Lo que se difiere hasta el primer uso son los
+archivos de claves y la zona horaria. Sirve para detectar regresiones que encarecen el arranque de los workers
+y el escalado automático (por ejemplo, trabajo pesado al importar un módulo).
+
+Ejemplo de uso:
+    >>> python -m benchmarks.import_time --budget-ms 1500 --top 15
+
+Retorna código de salida 1 si se supera el presupuesto.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+_LINE_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+def measure(module: str = "app.main", runs: int = 3) -> dict:
+    """
+    Mide el tiempo de importación de `module` (mediana de `runs` procesos).
+
+    Returns:
+        dict: {"module", "cumulative_ms", "top": [(módulo, ms propios), ...]}
+    """
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {
+        **os.environ,
+        # Claves inexistentes: la importación no debe leerlas.
+        "PRIVATE_KEY_PATH": "/nonexistent/private.pem",
+        "PUBLIC_KEY_PATH": "/nonexistent/public.pem",
+        "PYTHONPATH": os.pathsep.join(filter(None, [project_dir, os.environ.get("PYTHONPATH")])),
+    }
+    results = []
+    # El '.env' se busca en el directorio de trabajo: un directorio vacío garantiza que no se lea.
+    with tempfile.TemporaryDirectory(prefix="import-time-") as work_dir:
+        for _ in range(runs):
+            results.append(_measure_once(module, env, work_dir))
+
+    results.sort(key=lambda result: result[0])
+    cumulative_ms, self_times = results[len(results) // 2]
+    return {
+        "module": module,
+        "cumulative_ms": cumulative_ms,
+        "top": sorted(self_times, key=lambda item: item[1], reverse=True),
+    }
+
+def _measure_once(module: str, env: dict, work_dir: str) -> tuple:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, cwd=work_dir, check=True
+    )
+    cumulative_us = None
+    self_times = []
+    for line in completed.stderr.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if not match:
+            continue
+        self_us, cumulative, _, name = match.groups()
+        self_times.append((name, int(self_us) / 1000))
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, self_times
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Presupuesto de tiempo de importación.")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_TIME_BUDGET_MS", 1500)))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Imprime el resultado en JSON.")
+    args = parser.parse_args()
+
+    result = measure(args.module, args.runs)
+    result["top"] = result["top"][:args.top]
+    result["budget_ms"] = args.budget_ms
+    result["within_budget"] = result["cumulative_ms"] <= args.budget_ms
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{result['module']}: {result['cumulative_ms']:.1f} ms (presupuesto {args.budget_ms:.0f} ms)")
+        for name, ms in result["top"]:
+            print(f"  {ms:>8.1f} ms  {name}")
+
+    sys.exit(0 if result["within_budget"] else 1)
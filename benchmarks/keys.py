@@ -0,0 +1,32 @@
+"""
+Claves RSA efímeras para los benchmarks.
+
+Si las rutas configuradas ('PRIVATE_KEY_PATH', por defecto 'private.pem') no existen, genera un par de claves en
+un directorio temporal y apunta 'PRIVATE_KEY_PATH' y 'PUBLIC_KEY_PATH' a ellas. Debe invocarse antes de que se
+cargue la configuración de la aplicación.
+"""
+
+import os
+import tempfile
+
+def ensure_rsa_keys():
+    if os.path.exists(os.environ.get("PRIVATE_KEY_PATH", "private.pem")):
+        return
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    key_dir = tempfile.mkdtemp(prefix="benchmark-keys-")
+    private_path = os.path.join(key_dir, "private.pem")
+    public_path = os.path.join(key_dir, "public.pem")
+    with open(private_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ))
+    with open(public_path, "wb") as f:
+        f.write(key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        ))
+    os.environ["PRIVATE_KEY_PATH"] = private_path
+    os.environ["PUBLIC_KEY_PATH"] = public_path
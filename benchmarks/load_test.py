@@ -0,0 +1,278 @@
+"""
+Benchmark de carga de extremo a extremo (registro, login, '/users/me' y listado).
+
+Levanta la aplicación de 'app.main' en el mismo proceso (incluido su ciclo de vida) contra un sustituto local
+de MongoDB y ejecuta cargas concurrentes por escenario:
+    - register: 'POST /auth/auth/register' con usuarios únicos (incluye el hash bcrypt real).
+    - login:    'POST /auth/auth/login'.
+    - me:       'GET /users/users/me' con el JWT de un usuario registrado.
+    - list:     'GET /users/users?limit=50' con un JWT de rol 'admin'.
+
+Para cada escenario se reporta el throughput (solicitudes por segundo), la latencia media y los percentiles
+p50/p95/p99 (en milisegundos), y el número de respuestas inesperadas.
+
+Base de datos:
+    - '--backend mongomock' (por defecto) usa 'mongomock-motor' en memoria ('pip install mongomock-motor').
+    - '--backend mongod --mongo-uri mongodb://localhost:27017' usa un mongod local; la base de datos indicada
+      en '--database' se elimina al comenzar.
+
+Resultados y línea base:
+    - '--output' guarda los resultados en JSON.
+    - '--baseline' compara con un archivo de resultados anterior: se considera regresión una caída del
+      throughput mayor a '--max-throughput-drop' o un aumento de p95/p99 mayor a '--max-latency-increase'
+      (fracciones, por ejemplo 0.15 = 15 %). Con regresiones el proceso termina con código 1.
+    - '--save-baseline' escribe los resultados actuales como nueva línea base.
+
+Las solicitudes se envían como ASGI en el mismo proceso (sin red), por lo que los números miden la aplicación
+y la base de datos, no la pila TCP. Los límites de tasa se desactivan para no medir respuestas 429.
+
+Ejemplo de uso:
+    >>> python -m benchmarks.load_test --requests 500 --concurrency 50 --output results.json \\
+    ...     --baseline benchmarks/baselines/load_test.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from benchmarks.keys import ensure_rsa_keys
+
+SCENARIOS = ("register", "login", "me", "list")
+
+def _prepare_environment(args):
+    # Debe ejecutarse antes de importar 'app.main': la configuración se lee una sola vez.
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["MONGO_INITDB_DATABASE"] = args.database
+
+    # Claves RSA efímeras para firmar los JWT del benchmark si no hay claves configuradas.
+    ensure_rsa_keys()
+
+def _build_client(args):
+    if args.backend == "mongomock":
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("El backend 'mongomock' requiere 'mongomock-motor' (pip install mongomock-motor).")
+        return AsyncMongoMockClient()
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    return AsyncIOMotorClient(args.mongo_uri)
+
+class _OptionlessDatabase:
+    """
+    Base de datos de 'mongomock-motor' para 'get_collection': su 'with_options' retorna una colección síncrona,
+    y en memoria los perfiles de consistencia (preferencia de lectura, read/write concern) no aplican.
+    """
+
+    def __init__(self, database):
+        self._database = database
+
+    def __getitem__(self, name: str):
+        collection = self._database[name]
+        collection.with_options = lambda **options: collection
+        return collection
+
+    def __getattr__(self, name: str):
+        return getattr(self._database, name)
+
+def _install_database(client, database: str, backend: str):
+    """
+    Sustituye el cliente de 'app.db.mongodb' y las colecciones ya resueltas por los componentes de la aplicación.
+    """
+    from app.db import mongodb
+    from app.core import activity, audit, idempotency, jobs
+
+    db = client[database]
+    mongodb.client = client
+    mongodb.db = _OptionlessDatabase(db) if backend == "mongomock" else db
+    mongodb.collection = db["users"]
+    mongodb.get_collection.cache_clear()
+    idempotency.store.collection = db["idempotency_keys"]
+    jobs.job_queue.outbox = db["job_outbox"]
+    jobs.job_queue.dead_letter = db["job_dead_letter"]
+    audit.audit_log.collection = db["audit_log"]
+    activity.activity_tracker.collection = db["user"]
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """
+    Percentil por rango más cercano sobre una lista ya ordenada.
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def summarize(scenario: str, latencies: list, elapsed: float, unexpected: int, concurrency: int) -> dict:
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    count = len(latencies_ms)
+    return {
+        "scenario": scenario,
+        "requests": count,
+        "concurrency": concurrency,
+        "unexpected_responses": unexpected,
+        "throughput_rps": count / elapsed if elapsed else 0.0,
+        "mean_ms": sum(latencies_ms) / count if count else 0.0,
+        "p50_ms": percentile(latencies_ms, 0.50),
+        "p95_ms": percentile(latencies_ms, 0.95),
+        "p99_ms": percentile(latencies_ms, 0.99),
+    }
+
+async def _drive(request_factory, total: int, concurrency: int, expected_status: int):
+    latencies = []
+    unexpected = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal unexpected
+        for index in counter:
+            start = time.perf_counter()
+            response = await request_factory(index)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != expected_status:
+                unexpected += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start, unexpected
+
+def _user_payload(run_id: str, index: int) -> dict:
+    return {
+        "username": f"bench_{run_id}_{index}",
+        "email": f"bench.{run_id}.{index}@example.com",
+        "phone_number": 3000000000 + index,
+        "full_name": "Bench User",
+        "password": "MiContraseñaSegura123!",
+        "avatar_url": "https://example.com/avatar.png",
+    }
+
+async def run(args) -> list:
+    import httpx
+    from app.core import auth
+    from app.main import app
+
+    client = _build_client(args)
+    _install_database(client, args.database, args.backend)
+    if args.backend == "mongod":
+        await client.drop_database(args.database)
+
+    results = []
+    tokens = []
+    run_id = uuid.uuid4().hex[:8]
+    transport = httpx.ASGITransport(app=app)
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            async def register(index):
+                response = await http.post("/auth/auth/register", json=_user_payload(run_id, index))
+                if response.status_code == 201:
+                    tokens.append(response.json()["access_token"])
+                return response
+
+            async def login(index):
+                return await http.post("/auth/auth/login", json={"email": f"bench.{run_id}.{index}@example.com"})
+
+            async def me(index):
+                headers = {"Authorization": f"Bearer {tokens[index % len(tokens)]}"}
+                return await http.get("/users/users/me", headers=headers)
+
+            # El listado requiere el rol 'admin', que no puede obtenerse con el registro.
+            admin_headers = {"Authorization": f"Bearer {auth.create_jwt({'user_id': run_id, 'user_role': 'admin'})}"}
+
+            async def listing(index):
+                return await http.get("/users/users", params={"limit": 50}, headers=admin_headers)
+
+            workloads = {
+                "register": (register, args.register_requests, 201),
+                "login": (login, args.requests, 200),
+                "me": (me, args.requests, 200),
+                "list": (listing, args.requests, 200),
+            }
+            for scenario in args.scenarios:
+                request_factory, total, expected_status = workloads[scenario]
+                if scenario in ("me", "list") and not tokens:
+                    # Los escenarios autenticados necesitan al menos un usuario registrado.
+                    await register(0)
+                # Calentamiento breve (fuera de la medición) salvo para el registro, que crea usuarios.
+                if scenario != "register":
+                    await _drive(request_factory, min(50, total), min(10, args.concurrency), expected_status)
+                latencies, elapsed, unexpected = await _drive(
+                    request_factory, total, args.concurrency, expected_status
+                )
+                results.append(summarize(scenario, latencies, elapsed, unexpected, args.concurrency))
+
+    if args.backend == "mongod":
+        await client.drop_database(args.database)
+    return results
+
+def compare(results: list, baseline: list, max_throughput_drop: float, max_latency_increase: float) -> list:
+    """
+    Compara los resultados con la línea base y retorna la lista de regresiones encontradas.
+    """
+    regressions = []
+    baseline_by_scenario = {entry["scenario"]: entry for entry in baseline}
+    for result in results:
+        reference = baseline_by_scenario.get(result["scenario"])
+        if reference is None:
+            continue
+        if reference["throughput_rps"] and \
+                result["throughput_rps"] < reference["throughput_rps"] * (1 - max_throughput_drop):
+            regressions.append(
+                f"{result['scenario']}: throughput {result['throughput_rps']:.1f} req/s "
+                f"(línea base {reference['throughput_rps']:.1f})"
+            )
+        for key in ("p95_ms", "p99_ms"):
+            if reference[key] and result[key] > reference[key] * (1 + max_latency_increase):
+                regressions.append(
+                    f"{result['scenario']}: {key} {result[key]:.2f} ms (línea base {reference[key]:.2f})"
+                )
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de carga de extremo a extremo.")
+    parser.add_argument("--backend", choices=("mongomock", "mongod"), default="mongomock")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="user_service_load_test")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=2000, help="Solicitudes por escenario de lectura/login.")
+    parser.add_argument(
+        "--register-requests", type=int, default=50,
+        help="Solicitudes de registro (cada una calcula un hash bcrypt completo)."
+    )
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados.")
+    parser.add_argument("--baseline", help="Archivo JSON de línea base con el cual comparar.")
+    parser.add_argument("--save-baseline", action="store_true", help="Escribe los resultados en '--baseline'.")
+    parser.add_argument("--max-throughput-drop", type=float, default=0.15)
+    parser.add_argument("--max-latency-increase", type=float, default=0.25)
+    args = parser.parse_args()
+
+    _prepare_environment(args)
+    results = asyncio.run(run(args))
+
+    for result in results:
+        print(
+            f"{result['scenario']:<10} {result['throughput_rps']:>9.1f} req/s  "
+            f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms  "
+            f"inesperadas {result['unexpected_responses']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline and args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+    elif args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_throughput_drop, args.max_latency_increase)
+        for regression in regressions:
+            print(f"REGRESIÓN {regression}")
+        if regressions:
+            sys.exit(1)
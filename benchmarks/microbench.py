@@ -0,0 +1,190 @@
+"""
+Microbenchmarks de las funciones críticas de la aplicación.
+
+Mide de forma aislada (sin base de datos ni servicios externos):
+    - 'security.hash_password' y 'security.verify_password' (bcrypt).
+    - 'auth.create_jwt' y 'auth.verify_jwt' (RS256).
+    - Cada validador 'isValid_*' de 'app/utils/validations/'.
+    - 'User(**data).model_dump()' ('app/models/user_model.py').
+    - 'jsonable_encoder' sobre un usuario tal como lo retorna MongoDB (ObjectId y datetime).
+
+Metodología:
+    - Calentamiento: se ejecuta cada función durante '--warmup' segundos antes de medir.
+    - Calibración: se elige el número de llamadas por repetición para que cada repetición dure al menos
+      '--min-time' segundos (una sola llamada para funciones lentas como bcrypt).
+    - Repeticiones: se toman '--repetitions' muestras con el recolector de basura desactivado y se reportan la
+      media, la desviación estándar, la mediana y el mínimo por llamada (en microsegundos).
+
+Salida y control de regresiones:
+    - '--json' imprime los resultados en JSON; '--output' los guarda en un archivo (incluye metadatos del entorno).
+    - '--baseline' compara las medianas con un archivo anterior y termina con código 1 si alguna empeora más
+      de '--max-regression' (fracción, por ejemplo 0.10 = 10 %).
+
+Ejemplo de uso:
+    >>> python -m benchmarks.microbench --filter jwt validators --repetitions 20 --output micro.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from benchmarks.keys import ensure_rsa_keys
+
+def build_cases() -> list:
+    """
+    Construye la lista de casos (nombre, grupo, función sin argumentos) con sus datos ya preparados.
+    """
+    from bson import ObjectId
+    from fastapi.encoders import jsonable_encoder
+    from app.core import auth, security
+    from app.models.user_model import User
+    from app.utils.validations.avatar_validator import isValid_avatar_url
+    from app.utils.validations.email_validator import isValid_email
+    from app.utils.validations.full_name_validator import isValid_full_name
+    from app.utils.validations.password_validator import isValid_password
+    from app.utils.validations.phone_number_validator import isValid_phone_number
+    from app.utils.validations.username_validator import isValid_username
+
+    password = "MiContraseñaSegura123!"
+    hashed_password = security.hash_password(password)
+    token = auth.create_jwt({"user_id": str(ObjectId()), "user_role": "technical"})
+    now = datetime.now(timezone.utc)
+    user_data = {
+        "_id": str(ObjectId()),
+        "username": "test_user",
+        "email": "testuser@example.com",
+        "phone_number": 3213908337,
+        "full_name": "Test User",
+        "password": hashed_password,
+        "avatar_url": "https://example.com/avatar.png",
+        "state": "active",
+        "created_at": now,
+        "updated_at": now,
+    }
+    # Usuario tal como lo retorna MongoDB con la proyección pública.
+    user_result = {**user_data, "_id": ObjectId(user_data["_id"]), "user_role": "technical", "is_deleted": False}
+    del user_result["password"]
+
+    return [
+        ("hash_password", "security", lambda: security.hash_password(password)),
+        ("verify_password", "security", lambda: security.verify_password(password, hashed_password)),
+        ("create_jwt", "jwt", lambda: auth.create_jwt({"user_id": user_data["_id"], "user_role": "technical"})),
+        ("verify_jwt", "jwt", lambda: auth.verify_jwt(token)),
+        ("isValid_username", "validators", lambda: isValid_username(user_data["username"])),
+        ("isValid_email", "validators", lambda: isValid_email(user_data["email"])),
+        ("isValid_phone_number", "validators", lambda: isValid_phone_number(user_data["phone_number"])),
+        ("isValid_full_name", "validators", lambda: isValid_full_name(user_data["full_name"])),
+        ("isValid_password", "validators", lambda: isValid_password(password)),
+        ("isValid_avatar_url", "validators", lambda: isValid_avatar_url(user_data["avatar_url"])),
+        ("user_model_dump", "serialization", lambda: User(**user_data).model_dump()),
+        ("jsonable_encoder_user", "serialization", lambda: jsonable_encoder(
+            user_result, custom_encoder={ObjectId: str}
+        )),
+    ]
+
+def _time_loops(function, loops: int) -> float:
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+def measure(function, warmup: float, min_time: float, repetitions: int) -> dict:
+    """
+    Mide `function` y retorna estadísticas por llamada en microsegundos.
+    """
+    deadline = time.perf_counter() + warmup
+    function()
+    while time.perf_counter() < deadline:
+        function()
+
+    # Calibración: duplicar el número de llamadas hasta alcanzar `min_time` por repetición.
+    loops = 1
+    while _time_loops(function, loops) < min_time:
+        loops *= 2
+
+    samples = [_time_loops(function, loops) / loops * 1e6 for _ in range(repetitions)]
+    return {
+        "loops": loops,
+        "repetitions": repetitions,
+        "mean_us": statistics.fmean(samples),
+        "stddev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "median_us": statistics.median(samples),
+        "min_us": min(samples),
+        "ops_per_second": 1e6 / statistics.median(samples),
+    }
+
+def compare(results: list, baseline: dict, max_regression: float) -> list:
+    """
+    Compara las medianas con la línea base y retorna la lista de regresiones encontradas.
+    """
+    reference_by_name = {entry["name"]: entry for entry in baseline["results"]}
+    regressions = []
+    for result in results:
+        reference = reference_by_name.get(result["name"])
+        if reference and result["median_us"] > reference["median_us"] * (1 + max_regression):
+            regressions.append(
+                f"{result['name']}: mediana {result['median_us']:.2f} µs (línea base {reference['median_us']:.2f})"
+            )
+    return regressions
+
+def main(args) -> dict:
+    ensure_rsa_keys()
+    results = []
+    for name, group, function in build_cases():
+        if args.filter and name not in args.filter and group not in args.filter:
+            continue
+        results.append({"name": name, "group": group, **measure(function, args.warmup, args.min_time, args.repetitions)})
+    return {
+        "metadata": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmarks de las funciones críticas.")
+    parser.add_argument("--filter", nargs="+", help="Nombres o grupos a ejecutar (security, jwt, validators, serialization).")
+    parser.add_argument("--warmup", type=float, default=0.2, help="Segundos de calentamiento por caso.")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Duración mínima (s) de cada repetición.")
+    parser.add_argument("--repetitions", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Imprime los resultados en JSON.")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados.")
+    parser.add_argument("--baseline", help="Archivo JSON de línea base con el cual comparar.")
+    parser.add_argument("--max-regression", type=float, default=0.10)
+    args = parser.parse_args()
+
+    report = main(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for result in report["results"]:
+            print(
+                f"{result['name']:<24} {result['median_us']:>12.2f} µs  "
+                f"± {result['stddev_us']:>9.2f}  (min {result['min_us']:.2f}, {result['loops']} x {result['repetitions']})"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report["results"], json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESIÓN {regression}")
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,116 @@
+"""
+Benchmark del costo por solicitud de la pila de middlewares.
+
+Compara, sobre una aplicación mínima con una única ruta, el costo de:
+    - Sin middlewares (línea base).
+    - El middleware anterior '@app.middleware("http")' (BaseHTTPMiddleware de Starlette) para 'X-Process-Time'.
+    - Los middlewares ASGI puros actuales ('ProcessTimeMiddleware' + 'RequestIDMiddleware').
+
+La aplicación se invoca directamente como ASGI (sin red ni cliente HTTP), de modo que la diferencia entre
+escenarios corresponde únicamente al costo de los middlewares.
+
+Ejemplo de uso:
+    >>> python -m benchmarks.middleware_overhead --requests 20000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from fastapi import FastAPI, Request
+from app.middlewares.main_middleware import ProcessTimeMiddleware, RequestIDMiddleware
+
+async def _legacy_add_process_time_header(request: Request, call_next):
+    # Réplica del middleware anterior basado en BaseHTTPMiddleware.
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    response.headers["X-Process-Time"] = str(time.perf_counter() - start_time)
+    return response
+
+def build_app(scenario: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    async def root():
+        return {"ok": True}
+
+    if scenario == "base_http_middleware":
+        app.middleware("http")(_legacy_add_process_time_header)
+    elif scenario == "pure_asgi":
+        app.add_middleware(ProcessTimeMiddleware)
+        app.add_middleware(RequestIDMiddleware)
+    return app
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/",
+    "raw_path": b"/",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"bench")],
+    "client": ("127.0.0.1", 1234),
+    "server": ("bench", 80),
+}
+
+async def _one_request(app):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(dict(SCOPE), receive, send)
+
+async def run_scenario(scenario: str, requests: int, concurrency: int) -> dict:
+    app = build_app(scenario)
+    # Calentamiento: construye la pila de middlewares y estabiliza cachés.
+    for _ in range(200):
+        await _one_request(app)
+
+    per_worker = requests // concurrency
+
+    async def worker():
+        for _ in range(per_worker):
+            await _one_request(app)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    total = per_worker * concurrency
+    return {
+        "scenario": scenario,
+        "requests": total,
+        "concurrency": concurrency,
+        "rps": total / elapsed,
+        "us_per_request": elapsed / total * 1e6,
+    }
+
+async def main(requests: int, concurrency: int) -> list:
+    results = []
+    for scenario in ("no_middleware", "base_http_middleware", "pure_asgi"):
+        results.append(await run_scenario(scenario, requests, concurrency))
+    baseline = results[0]["us_per_request"]
+    for result in results:
+        result["overhead_us"] = result["us_per_request"] - baseline
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Costo por solicitud de la pila de middlewares.")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="Imprime los resultados en JSON.")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args.requests, args.concurrency))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print(
+                f"{result['scenario']:<22} {result['rps']:>10.0f} req/s "
+                f"{result['us_per_request']:>8.1f} µs/req  (+{result['overhead_us']:.1f} µs)"
+            )
@@ -0,0 +1,64 @@
+"""
+Configuración de gunicorn para el modo de producción (ver 'app/server.py').
+
+Todos los valores se obtienen de 'app/config.py' (variables de entorno 'SERVER_*' y 'WEB_CONCURRENCY').
+"""
+
+import gc
+import glob
+import os
+
+# El directorio de métricas multiproceso debe existir antes de importar 'prometheus_client', es decir,
+# antes de precargar la aplicación. Este archivo se vuelve a leer en cada recarga (SIGHUP), por lo que aquí no
+# se borra nada: los archivos de procesos anteriores se eliminan en `on_starting`, solo en el arranque en frío.
+_prometheus_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/user-service-prometheus")
+os.makedirs(_prometheus_dir, exist_ok=True)
+
+# Alias con guion bajo: gunicorn interpreta los nombres públicos de este archivo como opciones.
+from app import config as _config, server as _server  # noqa: E402
+
+bind = f"{_config.SERVER_HOST}:{_config.SERVER_PORT}"
+workers = _server.worker_count()
+worker_class = "app.server.ProductionUvicornWorker"
+
+# Precargar la aplicación en el maestro para compartir memoria entre workers (copy-on-write).
+preload_app = True
+
+# Reciclaje de workers.
+max_requests = _config.SERVER_MAX_REQUESTS
+max_requests_jitter = _config.SERVER_MAX_REQUESTS_JITTER
+
+# Drenaje ordenado: tras SIGTERM los workers dejan de aceptar conexiones y terminan las solicitudes en curso.
+graceful_timeout = _config.SERVER_GRACEFUL_TIMEOUT
+timeout = max(60, _config.SERVER_GRACEFUL_TIMEOUT * 2)
+keepalive = _config.SERVER_KEEPALIVE
+
+# El logging de la aplicación es JSON por stdout; gunicorn solo registra errores del maestro.
+accesslog = None
+errorlog = "-"
+
+def _clear_stale_metrics():
+    """
+    Elimina los archivos de métricas de ejecuciones anteriores ('<tipo>_<pid>.db'), conservando los del maestro
+    (creados al precargar la aplicación).
+    """
+    master_suffix = f"_{os.getpid()}.db"
+    for path in glob.glob(os.path.join(_prometheus_dir, "*.db")):
+        if not path.endswith(master_suffix):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+def on_starting(arbiter):
+    # Solo se ejecuta en el maestro al arrancar (no en las recargas por SIGHUP).
+    _clear_stale_metrics()
+    _server.warm_up()
+    # Mover los objetos ya creados a la generación permanente para que el GC de los workers no los toque
+    # (y así no se copien las páginas compartidas).
+    gc.freeze()
+
+def child_exit(arbiter, worker):
+    from app.core import metrics
+
+    metrics.mark_process_dead(worker.pid)